@@ -0,0 +1,2 @@
+from .generator import JunkDocumentSpec, generate_document
+from .suite import JunkBenchmarkResult, JunkBenchmarkRegression, run_suite, compare, load_results, save_results
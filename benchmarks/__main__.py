@@ -0,0 +1,47 @@
+from .suite import compare, format_results, load_results, run_suite, save_results
+import argparse
+import sys
+
+
+
+def main(argv=None) -> int:
+	argument_parser = argparse.ArgumentParser(prog="benchmarks", description="junkpy benchmark suite.")
+	subparsers = argument_parser.add_subparsers(dest="command", required=True)
+
+	run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+	run_parser.add_argument("-o", "--output", help="JSON file where results are written.")
+	run_parser.add_argument("-g", "--group", action="append", choices=["parse", "type_processing", "validation", "concurrency"], help="Benchmark group to run, may be repeated. Defaults to all of them.")
+	run_parser.add_argument("-q", "--quick", action="store_true", help="Use small documents and short timings.")
+	run_parser.add_argument("-b", "--baseline", help="JSON results file to compare against.")
+	run_parser.add_argument("-t", "--threshold", type=float, default=0.1, help="Maximum allowed relative slowdown. Defaults to 0.1.")
+
+	compare_parser = subparsers.add_parser("compare", help="Compare two results files.")
+	compare_parser.add_argument("results", help="JSON results file.")
+	compare_parser.add_argument("baseline", help="JSON results file to compare against.")
+	compare_parser.add_argument("-t", "--threshold", type=float, default=0.1, help="Maximum allowed relative slowdown. Defaults to 0.1.")
+
+	arguments = argument_parser.parse_args(argv)
+
+	if arguments.command == "run":
+		results = run_suite(arguments.quick, arguments.group)
+		print(format_results(results))
+
+		if arguments.output is not None:
+			save_results(results, arguments.output)
+
+	else:
+		results = load_results(arguments.results)
+
+	if arguments.baseline is None:
+		return 0
+
+	regressions = compare(results, load_results(arguments.baseline), arguments.threshold)
+	for regression in regressions:
+		print(f"Regression in {regression.name}: {regression.baseline:.1f} -> {regression.current:.1f} ops/s ({regression.change:+.1%})")
+
+	return 1 if(regressions) else 0
+
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from typing import List
+import random
+import string
+
+
+
+# Typed values written by the generator, by keyword of the built-in type processors and extensions
+TYPED_VALUE_SAMPLES = {
+	"bool": "1",
+	"int": '"123"',
+	"hex": '"ff"',
+	"octal": '"17"',
+	"bin": '"101"',
+	"complex": '"1+2j"',
+	"float": '"3.14"',
+	"decimal": '"1.10"',
+	"set": "[1, 2, 3]",
+	"string": "123",
+	"regex": '"^a+b[0-9]*$"',
+	"timedelta": "[1, 2]",
+	"timestamp": "1700000000",
+	"time": '"12:30:00"',
+	"date": '"2024-01-01"',
+	"datetime": '"2024-01-01T12:00:00"',
+	"env": '"$HOME"',
+	"path": '"/tmp/$USER/file"',
+	"mass": '(mass, input="kg", output="lb") 10',
+	"distance": '(distance, input="ft") 10',
+	"volume": '(volume, input="gal", output="ml") 2.5',
+	"speed": '(speed, input="km/h") 120',
+}
+
+
+
+@dataclass
+class JunkDocumentSpec:
+	"""
+	Shape of a synthetic Junk document.
+
+	Attributes:
+		size (int): Number of elements of the top-level list.
+		depth (int): Nesting depth of every element.
+		keys (int): Number of keys of every dict.
+		typed_density (float): Probability of a scalar being a typed value.
+		comment_density (float): Probability of a line being followed by a comment.
+		string_length (int): Length of string values.
+		typed_keywords (List[str]): Keywords of the typed values, all the built-in ones if empty.
+		seed (int): Seed of the random generator, making documents reproducible.
+	"""
+	size: int = 100
+	depth: int = 2
+	keys: int = 8
+	typed_density: float = 0.1
+	comment_density: float = 0.1
+	string_length: int = 16
+	typed_keywords: List[str] = None
+	seed: int = 0
+
+
+
+class JunkDocumentGenerator:
+	"""
+	Generates reproducible synthetic Junk documents made of a top-level list of nested dicts and lists.
+	"""
+
+	def __init__(self, spec: JunkDocumentSpec):
+		self._spec = spec
+		self._random = random.Random(spec.seed)
+		self._typed_keywords = spec.typed_keywords or list(TYPED_VALUE_SAMPLES)
+
+
+	def generate(self) -> str:
+		"""
+		Generates the document.
+
+		Returns:
+			str: The Junk document.
+		"""
+		lines = ["# Synthetic Junk document", "["]
+		for _ in range(self._spec.size):
+			lines.append("\t" + self._value(self._spec.depth, 1) + ",")
+			self._comment(lines)
+
+		lines.append("]")
+		return "\n".join(lines) + "\n"
+
+
+	def _comment(self, lines: List[str]):
+		if self._random.random() < self._spec.comment_density:
+			lines.append("\t# " + self._string())
+
+
+	def _string(self) -> str:
+		return "".join(self._random.choices(string.ascii_letters + string.digits + " ", k=self._spec.string_length))
+
+
+	def _scalar(self) -> str:
+		if self._random.random() < self._spec.typed_density:
+			keyword = self._random.choice(self._typed_keywords)
+			sample = TYPED_VALUE_SAMPLES[keyword]
+			return sample if(sample.startswith("(")) else f"({keyword}) {sample}"
+
+		kind = self._random.randrange(5)
+		if kind == 0:
+			return str(self._random.randrange(-1000000, 1000000))
+
+		elif kind == 1:
+			return repr(self._random.uniform(-1000, 1000))
+
+		elif kind == 2:
+			return self._random.choice(["true", "false", "null"])
+
+		return '"' + self._string() + '"'
+
+
+	def _value(self, depth: int, level: int) -> str:
+		if depth <= 0:
+			return self._scalar()
+
+		indent = "\t" * (level + 1)
+
+		if self._random.random() < 0.25:
+			items = [self._value(depth - 1, level + 1) for _ in range(max(1, self._spec.keys // 2))]
+			return "[\n" + "".join(f"{indent}{item},\n" for item in items) + "\t" * level + "]"
+
+		items = []
+		for index in range(self._spec.keys):
+			# Mix quoted and unquoted keys
+			key = f"key_{index}" if(index % 2) else f'"key {index}"'
+			items.append(f"{indent}{key}: {self._value(depth - 1 if(self._random.random() < 0.3) else 0, level + 1)},\n")
+
+		return "{\n" + "".join(items) + "\t" * level + "}"
+
+
+
+def generate_document(spec: JunkDocumentSpec) -> str:
+	"""
+	Generates a synthetic Junk document.
+
+	Args:
+		spec (JunkDocumentSpec): The shape of the document.
+
+	Returns:
+		str: The Junk document.
+	"""
+	return JunkDocumentGenerator(spec).generate()
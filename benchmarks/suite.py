@@ -0,0 +1,329 @@
+from .generator import TYPED_VALUE_SAMPLES, JunkDocumentSpec, generate_document
+from junkpy import JunkParser
+from junkpy.extensions import JunkDistanceTypeProcessor, JunkMassTypeProcessor, JunkSpeedTypeProcessor, JunkVolumeTypeProcessor
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from pydantic import BaseModel
+from typing import Callable, Dict, List, Optional, Union
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+
+RESULTS_FORMAT_VERSION = 1
+
+# Type processors of extensions.py, which parsers do not register by default
+EXTENSION_TYPE_PROCESSORS = [JunkMassTypeProcessor, JunkDistanceTypeProcessor, JunkVolumeTypeProcessor, JunkSpeedTypeProcessor]
+
+# Keywords of the element-wise typed arrays, loaded with (each, type=...)
+EACH_KEYWORDS = ["int", "float", "decimal", "hex", "date", "datetime", "timestamp"]
+
+# Chained annotations, loaded through a single compiled chain
+TYPED_CHAIN_SAMPLES = {
+	"string,int": "(string) (int) 99.99",
+	"int,float,string": '(int) (float) (string) "12.5"',
+}
+
+# Unit conversion modes of the magnitude type processors
+MAGNITUDE_MODES = ["decimal", "float"]
+
+
+
+@dataclass
+class JunkBenchmarkResult:
+	"""
+	Measurements of a single benchmark.
+
+	Attributes:
+		name (str): Unique name of the benchmark, used to match baselines.
+		group (str): Benchmark group, either "parse", "type_processing", "validation" or "concurrency".
+		ops (int): Number of operations timed.
+		seconds (float): Total time of the timed operations.
+		ops_per_second (float): Operations per second.
+		mb_per_second (Optional[float]): Megabytes of Junk input per second, None when the input size is not meaningful.
+		peak_memory (int): Peak memory allocated by a single operation, in bytes.
+	"""
+	name: str
+	group: str
+	ops: int
+	seconds: float
+	ops_per_second: float
+	mb_per_second: Optional[float]
+	peak_memory: int
+
+
+
+@dataclass
+class JunkBenchmarkRegression:
+	"""
+	Benchmark slower than its baseline by more than the allowed threshold.
+
+	Attributes:
+		name (str): Name of the benchmark.
+		baseline (float): Operations per second of the baseline.
+		current (float): Operations per second of the current run.
+		change (float): Relative change, negative when slower.
+	"""
+	name: str
+	baseline: float
+	current: float
+	change: float
+
+
+
+class ValidationRecord(BaseModel):
+	name: str
+	count: int
+	ratio: float
+	enabled: bool
+	tags: List[str]
+
+
+
+class ValidationDocument(BaseModel):
+	records: List[ValidationRecord]
+
+
+
+def measure(name: str, group: str, operation: Callable[[], object], input_size: Optional[int] = None, min_time: float = 0.5, ops_per_call: int = 1) -> JunkBenchmarkResult:
+	"""
+	Times an operation, calling it repeatedly until the minimum time is reached, then measures its peak memory in a separate call so tracing does not skew the timings.
+
+	Args:
+		name (str): Name of the benchmark.
+		group (str): Group of the benchmark.
+		operation (Callable[[], object]): The operation to benchmark.
+		input_size (Optional[int]): Bytes of Junk input processed per call.
+		min_time (float): Minimum total time of the timed calls, in seconds.
+		ops_per_call (int): Operations performed by each call.
+
+	Returns:
+		JunkBenchmarkResult: The measurements.
+	"""
+	# Warm up caches (grammar tables, memos, imports)
+	operation()
+
+	calls = 0
+	start = time.perf_counter()
+	while True:
+		operation()
+		calls += 1
+		seconds = time.perf_counter() - start
+		if seconds >= min_time:
+			break
+
+	tracemalloc.start()
+	try:
+		operation()
+		_, peak_memory = tracemalloc.get_traced_memory()
+
+	finally:
+		tracemalloc.stop()
+
+	return JunkBenchmarkResult(
+		name=name,
+		group=group,
+		ops=calls * ops_per_call,
+		seconds=seconds,
+		ops_per_second=calls * ops_per_call / seconds,
+		mb_per_second=(calls * input_size / seconds / 1e6) if(input_size is not None) else None,
+		peak_memory=peak_memory
+	)
+
+
+
+def _encoded_size(string: str) -> int:
+	return len(string.encode("utf-8"))
+
+
+def _parser(**kwargs) -> JunkParser:
+	return JunkParser(EXTENSION_TYPE_PROCESSORS, **kwargs)
+
+
+def _parse_benchmarks(document: str, json_document: str, min_time: float) -> List[JunkBenchmarkResult]:
+	results = []
+	size = _encoded_size(document)
+
+	for backend in JunkParser.BACKENDS:
+		parser = _parser(backend=backend)
+		results.append(measure(f"loads[{backend}]", "parse", lambda: parser.loads(document), size, min_time))
+
+	for json_fast_path in (True, False):
+		parser = _parser(json_fast_path=json_fast_path)
+		results.append(measure(f"loads[json,fast_path={json_fast_path}]", "parse", lambda: parser.loads(json_document), _encoded_size(json_document), min_time))
+
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		file_path = Path(tmp_dir) / "benchmark.junk"
+		file_path.write_text(document, encoding="utf-8")
+
+		parser = _parser()
+		results.append(measure("load_file", "parse", lambda: parser.load_file(file_path), size, min_time))
+
+	return results
+
+
+def _type_processing_benchmarks(values: int, min_time: float) -> List[JunkBenchmarkResult]:
+	results = []
+	parser = _parser()
+
+	for keyword, sample in TYPED_VALUE_SAMPLES.items():
+		typed_value = sample if(sample.startswith("(")) else f"({keyword}) {sample}"
+		document = "[" + ", ".join([typed_value] * values) + "]"
+		results.append(measure(f"type[{keyword}]", "type_processing", lambda: parser.loads(document), _encoded_size(document), min_time, values))
+
+	for keywords, sample in TYPED_CHAIN_SAMPLES.items():
+		document = "[" + ", ".join([sample] * values) + "]"
+		results.append(measure(f"chain[{keywords}]", "type_processing", lambda: parser.loads(document), _encoded_size(document), min_time, values))
+
+	# Whole lists handed to load_many, compared with the type[...] benchmarks
+	for keyword in EACH_KEYWORDS:
+		document = f'[(each, type="{keyword}") [' + ", ".join([TYPED_VALUE_SAMPLES[keyword]] * values) + "]]"
+		results.append(measure(f"each[{keyword}]", "type_processing", lambda: parser.loads(document), _encoded_size(document), min_time, values))
+
+	# Unit conversions of single values and of whole lists
+	for mode in MAGNITUDE_MODES:
+		document = "[" + ", ".join([f'(distance, input="ft", output="km", mode="{mode}") 10.5'] * values) + "]"
+		results.append(measure(f"magnitude[{mode}]", "type_processing", lambda: parser.loads(document), _encoded_size(document), min_time, values))
+
+		document = f'[(distance, input="ft", output="km", mode="{mode}") [' + ", ".join(["10.5"] * values) + "]]"
+		results.append(measure(f"magnitude[{mode},list]", "type_processing", lambda: parser.loads(document), _encoded_size(document), min_time, values))
+
+	# Documents made of typed values only, with and without output type checks
+	document = generate_document(JunkDocumentSpec(size=max(1, values // 20), typed_density=1))
+	size = _encoded_size(document)
+
+	for backend in JunkParser.BACKENDS:
+		for check_output_types in (True, False):
+			typed_parser = _parser(backend=backend, check_output_types=check_output_types)
+			name = f"typed_document[{backend}]" if(check_output_types) else f"typed_document[{backend},unchecked]"
+			results.append(measure(name, "type_processing", lambda: typed_parser.loads(document), size, min_time))
+
+	return results
+
+
+def _validation_benchmarks(records: int, min_time: float) -> List[JunkBenchmarkResult]:
+	document = "{\n\trecords: [\n" + "".join(
+		f'\t\t{{name: "record {index}", count: {index}, ratio: {index / 7}, enabled: {"true" if(index % 2) else "false"}, tags: ["a", "b"]}}, # Record {index}\n'
+		for index in range(records)
+	) + "\t]\n}\n"
+	size = _encoded_size(document)
+	parser = _parser()
+
+	return [
+		measure("validate_to[none]", "validation", lambda: parser.loads(document), size, min_time),
+		measure("validate_to[model]", "validation", lambda: parser.loads(document, validate_to=ValidationDocument), size, min_time),
+	]
+
+
+def _concurrency_benchmarks(document: str, documents: int, min_time: float, thread_counts: List[int]) -> List[JunkBenchmarkResult]:
+	results = []
+	size = _encoded_size(document)
+	parser = _parser()
+
+	for threads in thread_counts:
+		with ThreadPoolExecutor(threads) as executor:
+			def operation():
+				for future in [executor.submit(parser.loads, document) for _ in range(documents)]:
+					future.result()
+
+			results.append(measure(f"threads[{threads}]", "concurrency", operation, size * documents, min_time, documents))
+
+	return results
+
+
+def run_suite(quick: bool = False, groups: Optional[List[str]] = None) -> dict:
+	"""
+	Runs the benchmark suite.
+
+	Args:
+		quick (bool): Whether to use smaller documents and shorter timings, for smoke runs.
+		groups (Optional[List[str]]): Groups to run, all of them if None.
+
+	Returns:
+		dict: The results, serializable to JSON.
+	"""
+	min_time = 0.05 if(quick) else 0.5
+	spec = JunkDocumentSpec(size=20 if(quick) else 500)
+	document = generate_document(spec)
+	# Same shape without Junk-only syntax, exercising the JSON fast path
+	json_document = json.dumps(_parser().loads(generate_document(replace(spec, typed_density=0, comment_density=0))))
+
+	benchmarks = {
+		"parse": lambda: _parse_benchmarks(document, json_document, min_time),
+		"type_processing": lambda: _type_processing_benchmarks(10 if(quick) else 1000, min_time),
+		"validation": lambda: _validation_benchmarks(20 if(quick) else 1000, min_time),
+		"concurrency": lambda: _concurrency_benchmarks(document, 4 if(quick) else 16, min_time, [1, 2, 4]),
+	}
+
+	results = []
+	for group, benchmark in benchmarks.items():
+		if groups is None or group in groups:
+			results.extend(benchmark())
+
+	return {
+		"version": RESULTS_FORMAT_VERSION,
+		"meta": {
+			"python": sys.version.split()[0],
+			"implementation": platform.python_implementation(),
+			"platform": platform.platform(),
+			"quick": quick,
+			"document": asdict(spec),
+		},
+		"results": [asdict(result) for result in results]
+	}
+
+
+def save_results(results: dict, file_path: Union[str, Path]):
+	with open(file_path, "w", encoding="utf-8") as opened_fp:
+		json.dump(results, opened_fp, indent=2)
+
+
+def load_results(file_path: Union[str, Path]) -> dict:
+	with open(file_path, "r", encoding="utf-8") as opened_fp:
+		results = json.load(opened_fp)
+
+	if results.get("version") != RESULTS_FORMAT_VERSION:
+		raise ValueError(f"Unsupported benchmark results version <{results.get('version')}>")
+
+	return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1) -> List[JunkBenchmarkRegression]:
+	"""
+	Compares benchmark results against a baseline. Benchmarks missing from either side are ignored.
+
+	Args:
+		results (dict): The current results.
+		baseline (dict): The baseline results.
+		threshold (float): Maximum allowed relative slowdown in operations per second.
+
+	Returns:
+		List[JunkBenchmarkRegression]: The benchmarks slower than their baseline by more than the threshold.
+	"""
+	baseline_results: Dict[str, dict] = {result["name"]: result for result in baseline["results"]}
+	regressions = []
+
+	for result in results["results"]:
+		baseline_result = baseline_results.get(result["name"])
+		if baseline_result is None or baseline_result["ops_per_second"] <= 0:
+			continue
+
+		change = result["ops_per_second"] / baseline_result["ops_per_second"] - 1
+		if change < -threshold:
+			regressions.append(JunkBenchmarkRegression(result["name"], baseline_result["ops_per_second"], result["ops_per_second"], change))
+
+	return regressions
+
+
+def format_results(results: dict) -> str:
+	lines = [f"{'benchmark':<36} {'ops/s':>14} {'MB/s':>10} {'peak memory':>14}"]
+	for result in results["results"]:
+		mb_per_second = f"{result['mb_per_second']:.2f}" if(result["mb_per_second"] is not None) else "-"
+		lines.append(f"{result['name']:<36} {result['ops_per_second']:>14.1f} {mb_per_second:>10} {result['peak_memory'] / 1024:>11.1f} KB")
+
+	return "\n".join(lines)
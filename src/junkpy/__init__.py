@@ -1,3 +1,11 @@
-from .base import JunkParser, JunkMetadata
+from .base import JunkParser, JunkMetadata, loads, load, load_file, load_file_from_env, aloads, aload, aload_file, dumps, dump, compile_file, load_snapshot, profile
 from .type_processors import JunkTypeProcessor
+from .registry import JunkTypeProcessorRegistry
+from .cache import JunkResultCache
+from .metrics import JunkMetrics
+from .batch import JunkParallelStats
+from .profiling import JunkProfileReport, JunkProcessorProfile
+from .lazy import JunkLazyValue, JunkLazyDict, JunkLazyList, resolve_all
+from .watch import JunkWatcher
+from .incremental import JunkIncrementalResult
 from . import extensions
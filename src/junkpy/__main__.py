@@ -0,0 +1,38 @@
+from .base import JunkParser
+from importlib import import_module
+import argparse
+import sys
+
+
+
+def _import_parser(path: str) -> JunkParser:
+	module_name, _, attribute = path.partition(":")
+	parser = getattr(import_module(module_name), attribute)
+
+	return parser() if(isinstance(parser, type)) else parser
+
+
+def main(argv=None) -> int:
+	argument_parser = argparse.ArgumentParser(prog="junkpy", description="Junk configuration files tools.")
+	subparsers = argument_parser.add_subparsers(dest="command", required=True)
+
+	compile_parser = subparsers.add_parser("compile", help="Compile Junk files into binary snapshots.")
+	compile_parser.add_argument("files", nargs="+", help="Junk files to compile.")
+	compile_parser.add_argument("-o", "--output", help="Snapshot path, only with a single file. Defaults to the file path followed by .junkc.")
+	compile_parser.add_argument("-p", "--parser", help="Parser used to compile, as module:name of a JunkParser subclass or instance.")
+
+	arguments = argument_parser.parse_args(argv)
+
+	if arguments.output is not None and len(arguments.files) > 1:
+		argument_parser.error("--output requires a single file")
+
+	parser = _import_parser(arguments.parser) if(arguments.parser is not None) else JunkParser()
+	for file_path in arguments.files:
+		print(parser.compile_file(file_path, arguments.output))
+
+	return 0
+
+
+
+if __name__ == "__main__":
+	sys.exit(main())
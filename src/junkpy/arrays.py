@@ -0,0 +1,112 @@
+from array import array
+from typing import Any, Dict, List, Optional, Union
+
+
+
+def _dtype_typecodes() -> Dict[str, str]:
+	# Item sizes of C types depend on the platform, the first typecode of each size is used
+	typecodes = {}
+	for kind, name, kind_typecodes in (("i", "int", "bhilq"), ("u", "uint", "BHILQ"), ("f", "float", "fd")):
+		for typecode in kind_typecodes:
+			itemsize = array(typecode).itemsize
+			typecodes.setdefault(f"{kind}{itemsize}", typecode)
+			typecodes.setdefault(f"{name}{itemsize * 8}", typecode)
+			typecodes[typecode] = typecode
+
+	return typecodes
+
+
+
+# Typecodes of array.array by NumPy-style dtype name or by typecode
+DTYPE_TYPECODES: Dict[str, str] = _dtype_typecodes()
+
+
+
+def dtype_typecode(dtype: str) -> str:
+	"""
+	Returns the array.array typecode of a dtype.
+
+	Args:
+		dtype (str): A NumPy-style dtype like "f4", "int64" or "u1", or an array.array typecode like "d".
+
+	Returns:
+		str: The typecode.
+	"""
+	typecode = DTYPE_TYPECODES.get(dtype) if(isinstance(dtype, str)) else None
+	if typecode is None:
+		raise ValueError(f"Unsupported dtype <{dtype}>")
+
+	return typecode
+
+
+def numeric_typecode(values: List[Any], mixed: bool = True) -> Optional[str]:
+	"""
+	Returns the typecode of a list of numbers: "q" for integers, "d" for floats.
+
+	Args:
+		values (List[Any]): The values.
+		mixed (bool): Whether integers and floats can be mixed, stored as floats.
+
+	Returns:
+		Optional[str]: The typecode, None if some values are not ints or floats (booleans included), or are mixed when not allowed.
+	"""
+	value_types = set(map(type, values))
+
+	if value_types == {int}:
+		return "q"
+
+	if value_types == {float} or (mixed and value_types == {int, float}):
+		return "d"
+
+	return None
+
+
+def to_numeric_array(values: List[Any], min_length: int = 1) -> Union[List[Any], array]:
+	"""
+	Converts a list of integers, or a list of floats, to an array.array, as the scanner backend does while scanning.
+
+	Args:
+		values (List[Any]): The list.
+		min_length (int): Minimum length of the converted lists.
+
+	Returns:
+		Union[List[Any], array]: The array, or the list itself if it is shorter than min_length, holds other values or integers out of the 64-bit range.
+	"""
+	if len(values) < min_length or not values:
+		return values
+
+	typecode = numeric_typecode(values, False)
+	if typecode is None:
+		return values
+
+	try:
+		return array(typecode, values)
+
+	except OverflowError:
+		return values
+
+
+def convert_numeric_lists(data: Any, min_length: int) -> Any:
+	"""
+	Converts the homogeneous lists of numbers nested in parsed data to array.array, for the data decoded without a backend.
+
+	Args:
+		data (Any): The parsed data.
+		min_length (int): Minimum length of the converted lists.
+
+	Returns:
+		Any: The data, with its lists and dicts changed in place.
+	"""
+	if isinstance(data, dict):
+		for key, value in data.items():
+			if isinstance(value, (dict, list)):
+				data[key] = convert_numeric_lists(value, min_length)
+
+	elif isinstance(data, list):
+		for index, value in enumerate(data):
+			if isinstance(value, (dict, list)):
+				data[index] = convert_numeric_lists(value, min_length)
+
+		return to_numeric_array(data, min_length)
+
+	return data
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional, Tuple, Union
+if TYPE_CHECKING:
+	from .base import JunkParser
+	from .type_processors import JunkTypeProcessor
+
+from concurrent.futures import Executor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from .type_processors import check_output_type
+import asyncio
+import contextvars
+import functools
+
+
+
+# Typed values deferred to the event loop by the parsing running in the current context, None when parsing synchronously
+DEFERRED_VALUES: ContextVar[Optional[List[JunkDeferredValue]]] = ContextVar("junk_deferred_values", default=None)
+
+
+
+@dataclass
+class JunkDeferredValue:
+	"""
+	Placeholder for a typed value left in the parsed data by the async methods of JunkParser, replaced once its type processor has been awaited.
+
+	Attributes:
+		type_processor (JunkTypeProcessor): The type processor loading the value.
+		type_cls (str): The type keyword.
+		type_kwargs (dict): The type modifiers, which may contain deferred values.
+		value (Any): The parsed value, which may contain deferred values.
+	"""
+	type_processor: JunkTypeProcessor
+	type_cls: str
+	type_kwargs: dict
+	value: Any
+
+
+	async def resolve(self) -> Any:
+		"""
+		Resolves the deferred values nested in the value and the modifiers, then awaits the type processor.
+
+		Returns:
+			Any: The loaded value.
+		"""
+		value, type_kwargs = await asyncio.gather(resolve(self.value), resolve(self.type_kwargs))
+
+		loaded_value = await self.type_processor.aload(value, **type_kwargs)
+		if self.type_processor.parser._check_output_types:
+			check_output_type(self.type_processor, self.type_cls, loaded_value, value, type_kwargs)
+
+		return loaded_value
+
+
+
+def find_deferred(data: Union[list, dict]) -> List[Tuple[Union[list, dict], Any, JunkDeferredValue]]:
+	"""
+	Finds the outermost deferred values of parsed data.
+
+	Args:
+		data (Union[list, dict]): The parsed data.
+
+	Returns:
+		List[Tuple[Union[list, dict], Any, JunkDeferredValue]]: The container, key or index, and deferred value of every outermost deferred value.
+	"""
+	positions = []
+	stack = [data]
+
+	while stack:
+		container = stack.pop()
+
+		for key, value in (container.items() if(isinstance(container, dict)) else enumerate(container)):
+			if isinstance(value, JunkDeferredValue):
+				positions.append((container, key, value))
+
+			elif isinstance(value, (list, dict)):
+				stack.append(value)
+
+	return positions
+
+
+async def resolve_positions(positions: List[Tuple[Union[list, dict], Any, JunkDeferredValue]]):
+	"""
+	Concurrently resolves deferred values found by find_deferred, replacing them in their containers.
+
+	Args:
+		positions (List[Tuple[Union[list, dict], Any, JunkDeferredValue]]): The deferred values and their positions.
+	"""
+	loaded_values = await asyncio.gather(*(deferred_value.resolve() for _, _, deferred_value in positions))
+
+	for (container, key, _), loaded_value in zip(positions, loaded_values):
+		container[key] = loaded_value
+
+
+async def resolve(data: Any) -> Any:
+	"""
+	Resolves every deferred value of parsed data, in place for containers.
+
+	Args:
+		data (Any): The parsed data.
+
+	Returns:
+		Any: The resolved data.
+	"""
+	if isinstance(data, JunkDeferredValue):
+		return await data.resolve()
+
+	if isinstance(data, (list, dict)):
+		await resolve_positions(find_deferred(data))
+
+	return data
+
+
+def parse_deferred(parser: JunkParser, string: str) -> Tuple[Any, List[Tuple[Union[list, dict], Any, JunkDeferredValue]]]:
+	"""
+	Parses a Junk string, deferring the typed values that need to be awaited. Must run in a copied context.
+
+	Args:
+		parser (JunkParser): The parser.
+		string (str): The Junk string to parse.
+
+	Returns:
+		Tuple[Any, List[Tuple[Union[list, dict], Any, JunkDeferredValue]]]: The parsed data and the positions of its outermost deferred values.
+	"""
+	deferred_values = []
+	DEFERRED_VALUES.set(deferred_values)
+
+	return_data = parser._parse(string)
+
+	if not deferred_values:
+		return return_data, []
+
+	return return_data, find_deferred(return_data)
+
+
+def run_in_executor(executor: Optional[Executor], func: Callable, *args) -> Awaitable:
+	"""
+	Runs a function in an executor of the running event loop, within a copy of the current context so that the parsing metadata of the calling task is visible.
+
+	Args:
+		executor (Optional[Executor]): The executor, the default executor of the event loop if None.
+		func (Callable): The function to run.
+		*args: The arguments of the function.
+
+	Returns:
+		Awaitable: The result of the function.
+	"""
+	context = contextvars.copy_context()
+	return asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, func, *args))
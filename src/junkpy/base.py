@@ -1,30 +1,97 @@
 import os
-from typing import Any, List, Optional, Type, IO, Union
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, IO, Union
 from lark import Lark, Transformer
-from .type_processors import JunkTypeProcessor, JunkBaseTypeProcessorMeta
+from lark.exceptions import UnexpectedInput
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
+from .type_processors import JunkTypeProcessor, check_output_type
+from .scanner import JunkScanner
+from .registry import JunkTypeProcessorRegistry, resolve_registry
+from .cache import JunkResultCache, JunkTypeMemo, typed_key
+from .metrics import DEFAULT_METRICS, JunkMetrics, instrumented
+from .stream import JunkStreamSplitter
+from . import arrays, asynchronous, batch, chains, include, incremental, lazy, profiling, schema, serializer, snapshot, validation, watch
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from array import array
+from contextvars import ContextVar
+from contextlib import contextmanager
+import asyncio
+import functools
 import threading
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pydantic import BaseModel
+import json
 
 
 @dataclass
 class JunkMetadata:
 	file_path : Path
+	parsing_path : Optional[str] = None
+	cacheable : bool = True
+	parallel_stats : Optional[batch.JunkParallelStats] = None
+	includes : Optional[include.JunkIncludeGraph] = None
+	# Files the data depends on besides the loaded file, added by type processors reading other files
+	dependencies : Set[Path] = field(default_factory=set)
+	# Text being parsed, only set while parsing, read by type processors instead of reading the file again
+	text : Optional[str] = field(default=None, repr=False, compare=False)
 
 
-class JunkParserThreadingLocalStorage(threading.local):
+class JunkParserContextLocalStorage:
+	# Metadata stack local to the current thread and asyncio task, as every task runs in its own copy of the context
 	def __init__(self):
-		self.storage = []
+		self.storage = ContextVar(f"junk_metadata_{id(self)}", default=())
 
 	def push(self, data):
-		self.storage.append(data)
+		self.storage.set(self.storage.get() + (data,))
 
 	def get(self):
-		return self.storage[-1]
+		return self.storage.get()[-1]
 	
 	def pop(self):
-		return self.storage.pop()
+		storage = self.storage.get()
+		self.storage.set(storage[:-1])
+		return storage[-1]
+
+
+
+def _reject_json_constant(constant: str):
+	raise ValueError(f"Unsupported constant <{constant}>")
+
+
+_JSON_DECODER = json.JSONDecoder(parse_constant=_reject_json_constant)
+
+
+
+_COMPILED_GRAMMARS = {}
+_COMPILED_GRAMMARS_LOCK = threading.Lock()
+
+
+def _compile_grammar(grammar: str, cache: Union[bool, str] = False) -> dict:
+	"""
+	Builds the LALR tables for a grammar once per process and returns them serialized, so that every parser sharing the grammar can bind its own transformer without recomputing them.
+
+	Args:
+		grammar (str): The Lark grammar to compile.
+		cache (Union[bool, str]): Lark on-disk cache option. True uses a temporary file keyed by grammar hash and Lark version, a string sets the cache file path.
+
+	Returns:
+		dict: The serialized parser data and memo.
+	"""
+	key = (grammar, cache)
+	compiled_grammar = _COMPILED_GRAMMARS.get(key)
+	
+	if compiled_grammar is None:
+		with _COMPILED_GRAMMARS_LOCK:
+			compiled_grammar = _COMPILED_GRAMMARS.get(key)
+			
+			if compiled_grammar is None:
+				lark_parser = Lark(grammar, start='value', parser='lalr', cache=cache)
+				data, memo = lark_parser.memo_serialize([TerminalDef, Rule])
+				compiled_grammar = _COMPILED_GRAMMARS[key] = {"data": data, "memo": memo}
+	
+	return compiled_grammar
 	
 
 
@@ -74,33 +141,303 @@ class JunkParser:
 		%ignore WS
 		%ignore SH_COMMENT
 	"""
+	GRAMMAR_CACHE: Union[bool, str] = False
+	BACKENDS = ("lark", "scanner")
 	
 
-	def __init__(self, type_processors: Optional[List[Type[JunkTypeProcessor]]] = None):
+	def __init__(
+		self,
+		type_processors: Optional[Union[List[Type[JunkTypeProcessor]], JunkTypeProcessorRegistry]] = None,
+		backend: str = "lark",
+		json_fast_path: bool = True,
+		result_cache: Optional[JunkResultCache] = None,
+		lazy: bool = False,
+		type_memo_size: int = 0,
+		type_memo_keywords: Iterable[str] = (),
+		metrics: Union[bool, JunkMetrics] = False,
+		trusted_validation: bool = False,
+		schema_parsing: bool = False,
+		check_output_types: bool = True,
+		numeric_arrays: int = 0
+	):
 		"""
 		Initializes the Junk parser.
 
 		Args:
-			type_processors (Optional[List[JunkTypeProcessor]]): List of type processors to be used for typed value conversion.
+			type_processors (Optional[Union[List[JunkTypeProcessor], JunkTypeProcessorRegistry]]): List of type processors to be used for typed value conversion, added to the built-in ones, or a registry used as it is.
+			backend (str): Parsing engine, either "lark" (reference LALR parser) or "scanner" (hand-written single-pass parser).
+			json_fast_path (bool): Whether to try the standard library JSON decoder first, falling back to the backend when the data uses Junk-only syntax.
+			result_cache (Optional[JunkResultCache]): Cache for the results of load_file, which may be shared between parsers.
+			lazy (bool): Whether to defer type processors until typed values are accessed, returning JunkLazyValue placeholders held by JunkLazyDict and JunkLazyList containers.
+			type_memo_size (int): Maximum number of type processor results memoized by the parser, disabled if 0. Only pure type processors are memoized.
+			type_memo_keywords (Iterable[str]): Keywords of type processors to memoize even though they are not pure.
+			metrics (Union[bool, JunkMetrics]): Metrics recording the loads of the parser, which may be shared between parsers. True uses the process-wide default metrics.
+			trusted_validation (bool): Whether to construct pydantic models directly, without running validators and constraints, when the parsed values already have the annotated types. Other data is validated as usual.
+			schema_parsing (bool): Whether to build pydantic models while parsing, directed by their annotations, instead of validating the parsed data afterwards. Keys unknown to the models are skipped, and validation errors point to their line and column.
+			check_output_types (bool): Whether to check that type processors return instances of their CLASS. Disabling it skips an isinstance call per typed value for trusted type processors.
+			numeric_arrays (int): Minimum length of the lists made only of integers, or only of floats, returned as compact array.array instead, disabled if 0. Lists held directly by typed values stay lists.
 		"""
+		if backend not in self.BACKENDS:
+			raise ValueError(f"Unsupported backend <{backend}>")
+		
+		self._backend = backend
+		self._json_fast_path = json_fast_path
+		self._result_cache = result_cache
+		self._lazy = lazy
+		self._type_memo_size = type_memo_size
+		self._type_memo_keywords = frozenset(type_memo_keywords)
+		self._metrics = DEFAULT_METRICS if(metrics is True) else (metrics or None)
+		self._trusted_validation = trusted_validation
+		self._schema_parsing = schema_parsing
+		self._check_output_types = check_output_types
+		self._numeric_arrays = numeric_arrays
 
-		self._local_storage = JunkParserThreadingLocalStorage()
+		self._registry = resolve_registry(type_processors)
+		self._init_runtime()
 
-		self._type_processors_keyword_dict = {}
-		init_type_processors = JunkBaseTypeProcessorMeta.BASE_TYPE_PROCESSOR_CLASSES
 
-		if type_processors is not None:
-			init_type_processors += type_processors if(isinstance(type_processors, list)) else [type_processors]
-	
-		for type_processor in init_type_processors:
-			if issubclass(type_processor, JunkTypeProcessor):
-				self._type_processors_keyword_dict[type_processor.KEYWORD] = type_processor(self)
-				
+	def _init_runtime(self):
+		self._local_storage = JunkParserContextLocalStorage()
+
+		# Everything derived from the type processor classes is computed once per registry
+		self._type_processors_keyword_dict = self._registry.instantiate(self)
+		self._type_processors_fingerprint = self._registry.fingerprint
+		self._async_type_processors_keywords = self._registry.async_keywords
+
+		self._dump_type_processors = serializer.dump_type_processors(self._type_processors_keyword_dict)
+
+		self._type_memo = JunkTypeMemo(self._type_memo_size) if(self._type_memo_size > 0) else None
+		self._memoized_type_processors_keywords = self._registry.pure_keywords | self._type_memo_keywords.intersection(self._registry.classes)
+
+		# Type processors by keyword along with the bound method loading their values, skipping the memo when it is not used
+		self._type_dispatch = {}
+		for keyword, type_processor in self._type_processors_keyword_dict.items():
+			if self._type_memo is not None and keyword in self._memoized_type_processors_keywords:
+				self._type_dispatch[keyword] = (type_processor, functools.partial(self._load_typed_value, type_processor, keyword))
+
 			else:
-				raise TypeError(f"Unsupported class type <{type_processor}>'")
-			
+				self._type_dispatch[keyword] = (type_processor, functools.partial(self._run_type_processor, type_processor, keyword))
+
+		# Annotation chains compiled into a single callable by chain key, unless type processors run through lazy values or instrumentation
+		self._compiled_chains = {}
+		self._compiles_chains = not self._lazy and self._metrics is None
+
+		if self._metrics is not None:
+			if self._result_cache is not None:
+				self._metrics.register_cache("result", self._result_cache)
+
+			if self._type_memo is not None:
+				self._metrics.register_cache("type_memo", self._type_memo)
+
+		# JSON strings are validated straight from their text, unless after_parsing may change the parsed data
+		self._validates_json = self._json_fast_path and not self._lazy and type(self).after_parsing is JunkParser.after_parsing
+		self._parses_schema = self._schema_parsing and not self._lazy and type(self).after_parsing is JunkParser.after_parsing
+
+		self.__parser = None
+		self.__profiled_parser = None
+		transformer = JunkTransformer(self)
+		array_keywords = self._registry.array_keywords
+		self.__scanner = JunkScanner(transformer.typed_value_parser, transformer.typed_chain_parser, array_keywords, self._numeric_arrays) if(self._backend == "scanner") else None
+		self.__schema_scanner = schema.JunkSchemaScanner(transformer.typed_value_parser, transformer.typed_chain_parser, array_keywords) if(self._parses_schema) else None
+
+
+	def __getstate__(self) -> dict:
+		# Parsers, context-local storage and type processor instances are rebuilt on unpickling, so a parser can be recreated in child processes
+		state = self.__dict__.copy()
+		for attribute in ("_local_storage", "_type_processors_keyword_dict", "_type_processors_fingerprint", "_async_type_processors_keywords", "_dump_type_processors", "_type_memo", "_memoized_type_processors_keywords", "_type_dispatch", "_compiled_chains", "_JunkParser__parser", "_JunkParser__profiled_parser", "_JunkParser__scanner", "_JunkParser__schema_scanner"):
+			state.pop(attribute, None)
+		
+		return state
+
+
+	def __setstate__(self, state: dict):
+		self.__dict__.update(state)
+		self._init_runtime()
+
+
+	@property
+	def type_memo(self) -> Optional[JunkTypeMemo]:
+		return self._type_memo
+
+
+	@property
+	def metrics(self) -> Optional[JunkMetrics]:
+		return self._metrics
+
+
+	@property
+	def registry(self) -> JunkTypeProcessorRegistry:
+		return self._registry
+
+
+	def overlay(self, type_processors: List[Type[JunkTypeProcessor]]) -> "JunkParser":
+		"""
+		Returns a parser with the same options and type processors, along with the given ones replacing those with the same keywords.
+		The parser shares the result cache and metrics of this one, and is cheap to create, e.g. for type processors parsing nested strings with additional types.
+
+		Args:
+			type_processors (List[Type[JunkTypeProcessor]]): The type processors to add.
+
+		Returns:
+			JunkParser: The new parser.
+		"""
+		parser = type(self).__new__(type(self))
+		parser.__setstate__({**self.__getstate__(), "_registry": self._registry.overlay(type_processors)})
+		return parser
+
+
+	def _get_parser(self) -> Union[Lark, JunkScanner]:
+		if self.__scanner is not None:
+			return self.__scanner
+		
+		if profiling.PROFILE_REPORT.get() is not None:
+			return self._get_profiled_lark_parser()
+
+		return self._get_lark_parser()
+
+
+	def _get_lark_parser(self) -> Lark:
+		if self.__parser is None:
+			compiled_grammar = _compile_grammar(self.__JUNK_GRAMMAR, self.GRAMMAR_CACHE)
+			self.__parser = Lark._load_from_dict(compiled_grammar["data"], compiled_grammar["memo"], transformer=JunkTransformer(self))
+		
+		return self.__parser
+
+
+	def _get_profiled_lark_parser(self) -> Lark:
+		if self.__profiled_parser is None:
+			self.__profiled_parser = profiling.profiled_lark_parser(
+				self._get_lark_parser(),
+				_compile_grammar(self.__JUNK_GRAMMAR, self.GRAMMAR_CACHE),
+				JunkTransformer(self)
+			)
+
+		return self.__profiled_parser
+
 
-		self.__parser = Lark(self.__JUNK_GRAMMAR, start='value', parser='lalr', transformer=JunkTransformer(self))
+	def _parse(self, string: str, validate_to: Optional[Type[BaseModel]] = None) -> Any:
+		if self._metrics is not None:
+			self._metrics.count_bytes(string)
+
+		metadata = self._local_storage.get()
+		metadata.text = string
+
+		try:
+			report = profiling.PROFILE_REPORT.get()
+			if report is not None:
+				return_data = report.timed("parse", self._parse_string, string, validate_to)
+				report.count_input(string, metadata.parsing_path)
+				return return_data
+
+			return self._parse_string(string, validate_to)
+
+		finally:
+			metadata.text = None
+
+
+	def _parse_string(self, string: str, validate_to: Optional[Type[BaseModel]] = None) -> Any:
+		metadata = self._local_storage.get()
+
+		# Junk strings keep escape sequences as written, so only backslash-free data decodes identically as JSON
+		if self._json_fast_path and "\\" not in string:
+			if validate_to is not None and self._validates_json and validation.validates_json(validate_to):
+				return_data = validation.validate_json(validate_to, string)
+				if return_data is not None:
+					metadata.parsing_path = "json"
+					return return_data
+
+			else:
+				try:
+					return_data = _JSON_DECODER.decode(string)
+					metadata.parsing_path = "json"
+
+					if self._numeric_arrays:
+						return arrays.convert_numeric_lists(return_data, self._numeric_arrays)
+
+					return return_data
+				
+				except ValueError:
+					pass
+		
+		if validate_to is not None and self._parses_schema:
+			metadata.parsing_path = "schema"
+			return validation.JunkValidatedValue(self.__schema_scanner.parse_to(string, validate_to))
+
+		metadata.parsing_path = self._backend
+		return_data = self._get_parser().parse(string)
+
+		if self._lazy:
+			return lazy.wrap_lazy_containers(return_data)
+
+		return return_data
+
+
+	def _load_typed_value(self, type_processor: JunkTypeProcessor, type_cls: str, type_kwargs: dict, value: Any) -> Any:
+		if self._type_memo is not None and type_cls in self._memoized_type_processors_keywords:
+			key = (type_cls, typed_key(value), tuple((name, typed_key(kwarg)) for name, kwarg in type_kwargs.items()))
+			return self._type_memo.get_or_load(key, lambda: self._run_type_processor(type_processor, type_cls, type_kwargs, value))
+
+		return self._run_type_processor(type_processor, type_cls, type_kwargs, value)
+
+
+	def _run_type_processor(self, type_processor: JunkTypeProcessor, type_cls: str, type_kwargs: dict, value: Any) -> Any:
+		report = profiling.PROFILE_REPORT.get()
+		if report is None and self._metrics is None:
+			loaded_value = type_processor.load(value, **type_kwargs)
+
+		else:
+			loaded_value = self._run_instrumented_type_processor(report, type_processor, type_cls, type_kwargs, value)
+
+		if self._check_output_types:
+			check_output_type(type_processor, type_cls, loaded_value, value, type_kwargs)
+
+		return loaded_value
+
+
+	def _compiled_chain(self, chain: Tuple[Tuple[str, dict], ...]) -> Optional[Callable[[Any], Any]]:
+		try:
+			key = chains.chain_key(chain)
+
+		except TypeError:
+			# Chains with unhashable modifiers are loaded link by link
+			return None
+
+		load_chain = self._compiled_chains.get(key)
+		if load_chain is None:
+			steps = []
+			for type_cls, type_kwargs in reversed(chain):
+				dispatch = self._type_dispatch.get(type_cls, None)
+				if dispatch is None:
+					raise ValueError(f"Unsupported type <{type_cls}>")
+
+				type_processor, load_typed_value = dispatch
+				if self._type_memo is not None and type_cls in self._memoized_type_processors_keywords:
+					# Memoized results are checked once, when loaded
+					steps.append((type_cls, type_processor, type_kwargs, functools.partial(load_typed_value, type_kwargs), False))
+
+				else:
+					load = functools.partial(type_processor.load, **type_kwargs) if(type_kwargs) else type_processor.load
+					steps.append((type_cls, type_processor, type_kwargs, load, self._check_output_types))
+
+			load_chain = chains.compile_chain(steps, self._registry.array_keywords)
+
+			if len(self._compiled_chains) >= chains.COMPILED_CHAINS_SIZE:
+				self._compiled_chains.clear()
+
+			self._compiled_chains[key] = load_chain
+
+		return load_chain
+
+
+	def _run_instrumented_type_processor(self, report: Optional[profiling.JunkProfileReport], type_processor: JunkTypeProcessor, type_cls: str, type_kwargs: dict, value: Any) -> Any:
+		load = type_processor.load
+		if self._metrics is not None:
+			load = functools.partial(self._metrics.timed_type_processor, type_cls, load)
+
+		if report is not None:
+			return report.timed_type_processor(type_cls, load, value, **type_kwargs)
+
+		return load(value, **type_kwargs)
 
 
 	def _validate_to_model[T: BaseModel](
@@ -109,12 +446,32 @@ class JunkParser:
 		validate_to: Optional[Type[T]]
 	) -> Union[T, Any]:
 	
+		if type(data) is validation.JunkValidatedValue:
+			return data.value
+
 		if validate_to is not None:
-			return validate_to.model_validate(data)
+			report = profiling.PROFILE_REPORT.get()
+			if report is not None:
+				return report.timed("validation", self._validate_data, data, validate_to)
+
+			return self._validate_data(data, validate_to)
 		
 		return data
+
+
+	def _validate_data[T: BaseModel](self, data: Any, validate_to: Type[T]) -> T:
+		if self._lazy:
+			lazy.resolve_all(data)
+
+		if self._trusted_validation:
+			model = validation.construct(validate_to, data)
+			if model is not validation.MISMATCH:
+				return model
+
+		return validation.validate(validate_to, data)
 	
 
+	@instrumented("loads")
 	def loads[T: BaseModel](
 		self,
 		string: str, 
@@ -137,11 +494,11 @@ class JunkParser:
 				)
 			)
 			
-			self.before_parsing(self._local_storage.get())
+			self._before_parsing(self._local_storage.get())
 
-			return_data = self.__parser.parse(string)
+			return_data = self._parse(string, validate_to)
 			
-			return_data =self.after_parsing(self._local_storage.get(), return_data)
+			return_data = self._after_parsing(self._local_storage.get(), return_data)
 		
 		finally:
 			self._local_storage.pop()
@@ -149,6 +506,7 @@ class JunkParser:
 		return self._validate_to_model(return_data, validate_to)
 		
 	
+	@instrumented("load")
 	def load[T: BaseModel](
 		self, 
 		fp: IO, 
@@ -171,12 +529,12 @@ class JunkParser:
 				)
 			)
 			
-			self.before_parsing(self._local_storage.get())
+			self._before_parsing(self._local_storage.get())
 
 			with fp as opened_fp:
-				return_data = self.__parser.parse(opened_fp.read())
+				return_data = self._parse(profiling.read(opened_fp), validate_to)
 
-			return_data = self.after_parsing(self._local_storage.get(), return_data)
+			return_data = self._after_parsing(self._local_storage.get(), return_data)
 		
 		finally:
 			self._local_storage.pop()
@@ -184,6 +542,7 @@ class JunkParser:
 		return self._validate_to_model(return_data, validate_to)
 		
 		
+	@instrumented("load_file")
 	def load_file[T: BaseModel](
 		self,
 		file_path: Union[str, Path], 
@@ -199,26 +558,158 @@ class JunkParser:
 		Returns:
 			Union[T, Any]: The parsed Python object.
 		"""
+		if self._result_cache is not None:
+			return_data = self._result_cache.get_or_load(self, file_path)
+
+		else:
+			return_data, _ = self._load_file_data(file_path, validate_to=validate_to)
+
+		return self._validate_to_model(return_data, validate_to)
+
+
+	def _load_file_data(self, file_path: Union[str, Path], string: Optional[str] = None, validate_to: Optional[Type[BaseModel]] = None) -> Tuple[Any, JunkMetadata]:
 		try:
-			self._local_storage.push(
-				JunkMetadata(
-					file_path = Path(file_path)
-				)
+			metadata = JunkMetadata(
+				file_path = Path(file_path)
 			)
+			self._local_storage.push(metadata)
 			
-			self.before_parsing(self._local_storage.get())
+			self._before_parsing(metadata)
 
-			with open(file_path, "rt") as opened_fp:
-				return_data = self.__parser.parse(opened_fp.read())
-		
-			return_data = self.after_parsing(self._local_storage.get(), return_data)
+			if string is None:
+				with open(file_path, "rt") as opened_fp:
+					string = profiling.read(opened_fp)
+			
+			return_data = self._parse(string, validate_to)
+			return_data = self._after_parsing(metadata, return_data)
 
 		finally:
 			self._local_storage.pop()
 
-		return self._validate_to_model(return_data, validate_to)
+		return return_data, metadata
 
 
+	@instrumented("loads_incremental")
+	def loads_incremental[T: BaseModel](
+		self,
+		string: str,
+		previous: Optional[incremental.JunkIncrementalResult] = None,
+		validate_to: Optional[Type[T]] = None
+	) -> incremental.JunkIncrementalResult:
+		"""
+		Parses a Junk string, reusing the values of the previous result whose text did not change.
+		Only the smallest container enclosing the edited region is parsed again, and the unchanged values it holds are reused along with the results of their type processors.
+		Type processors that are neither pure nor memoized (see type_memo_keywords) run on every load instead, the whole string being scanned again to reach them while still reusing the other unchanged values.
+
+		Incremental loads always use the scanner grammar and never the JSON fast path. Values shared with the previous result must not be modified in place, by after_parsing included.
+
+		Args:
+			string (str): The Junk string to parse.
+			previous (Optional[JunkIncrementalResult]): The result of the previous incremental load of this parser, the string is parsed entirely if None.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+
+		Returns:
+			JunkIncrementalResult: The parsed Python object, along with the changed key paths.
+		"""
+		try:
+			metadata = JunkMetadata(
+				file_path = None
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			result = self._parse_incremental(string, previous)
+			result.data = self._after_parsing(metadata, result.data)
+
+		finally:
+			self._local_storage.pop()
+
+		result.data = self._validate_to_model(result.data, validate_to)
+		return result
+
+
+	@instrumented("load_file_incremental")
+	def load_file_incremental[T: BaseModel](
+		self,
+		file_path: Union[str, Path],
+		previous: Optional[incremental.JunkIncrementalResult] = None,
+		validate_to: Optional[Type[T]] = None
+	) -> incremental.JunkIncrementalResult:
+		"""
+		Parses a Junk file, reusing the values of the previous result whose text did not change. See loads_incremental.
+
+		Args:
+			file_path Union[str, Path]: The path to the Junk file.
+			previous (Optional[JunkIncrementalResult]): The result of the previous incremental load of this parser, the file is parsed entirely if None.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+
+		Returns:
+			JunkIncrementalResult: The parsed Python object, along with the changed key paths.
+		"""
+		result, _ = self._load_file_data_incremental(file_path, previous)
+		result.data = self._validate_to_model(result.data, validate_to)
+		return result
+
+
+	def _load_file_data_incremental(
+		self,
+		file_path: Union[str, Path],
+		previous: Optional[incremental.JunkIncrementalResult],
+		string: Optional[str] = None
+	) -> Tuple[incremental.JunkIncrementalResult, JunkMetadata]:
+		try:
+			metadata = JunkMetadata(
+				file_path = Path(file_path)
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			if string is None:
+				with open(file_path, "rt") as opened_fp:
+					string = profiling.read(opened_fp)
+
+			result = self._parse_incremental(string, previous)
+			result.data = self._after_parsing(metadata, result.data)
+
+		finally:
+			self._local_storage.pop()
+
+		return result, metadata
+
+
+	def _parse_incremental(self, string: str, previous: Optional[incremental.JunkIncrementalResult]) -> incremental.JunkIncrementalResult:
+		if self._lazy:
+			raise ValueError("Incremental loads are not supported by lazy parsers")
+
+		if self._numeric_arrays:
+			raise ValueError("Incremental loads are not supported by parsers returning numeric arrays")
+
+		# Results of other type processors cannot be reused
+		if previous is not None and previous.type_processors != self._type_processors_fingerprint:
+			previous = None
+
+		if self._metrics is not None:
+			self._metrics.count_bytes(string)
+
+		metadata = self._local_storage.get()
+		metadata.parsing_path = "incremental"
+
+		scanner = incremental.JunkIncrementalScanner(JunkTransformer(self).typed_value_parser, self._memoized_type_processors_keywords)
+
+		report = profiling.PROFILE_REPORT.get()
+		if report is not None:
+			root_offset, root, changed, reparsed = report.timed("parse", scanner.parse_incremental, string, previous)
+			report.count_input(string, metadata.parsing_path)
+
+		else:
+			root_offset, root, changed, reparsed = scanner.parse_incremental(string, previous)
+
+		return incremental.JunkIncrementalResult(string, root.value, changed, reparsed, root_offset, root, self._type_processors_fingerprint)
+
+
+	@instrumented("load_file_from_env")
 	def load_file_from_env[T: BaseModel](self, env_var: str, validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
 		"""
 		Parses a Junk file from an environment variable and returns the corresponding Python object.
@@ -237,6 +728,516 @@ class JunkParser:
 		return self.load_file(file_path, validate_to)
 
 
+	async def aloads[T: BaseModel](
+		self,
+		string: str,
+		validate_to: Optional[Type[T]] = None,
+		executor: Optional[Executor] = None
+	) -> Union[T, Any]:
+		"""
+		Parses a Junk string without blocking the event loop and returns the corresponding Python object.
+		Parsing runs in a thread executor, while the aload coroutines of type processors are awaited concurrently on the event loop.
+
+		Args:
+			string (str): The Junk string to parse.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			executor (Optional[Executor]): The thread executor parsing the data, the default executor of the event loop if None.
+
+		Returns:
+			Union[T, Any]: The parsed Python object.
+		"""
+		try:
+			metadata = JunkMetadata(
+				file_path = None
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			return_data = await self._aparse(string, executor)
+
+			return_data = self._after_parsing(metadata, return_data)
+
+		finally:
+			self._local_storage.pop()
+
+		return self._validate_to_model(return_data, validate_to)
+
+
+	async def aload[T: BaseModel](
+		self,
+		fp: IO,
+		validate_to: Optional[Type[T]] = None,
+		executor: Optional[Executor] = None
+	) -> Union[T, Any]:
+		"""
+		Parses a Junk file-like object without blocking the event loop and returns the corresponding Python object. See aloads.
+
+		Args:
+			fp (file-like): The file-like object containing the Junk data.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			executor (Optional[Executor]): The thread executor reading and parsing the data, the default executor of the event loop if None.
+
+		Returns:
+			Union[T, Any]: The parsed Python object.
+		"""
+		try:
+			metadata = JunkMetadata(
+				file_path = Path(fp.name)
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			with fp as opened_fp:
+				string = await asynchronous.run_in_executor(executor, opened_fp.read)
+
+			return_data = await self._aparse(string, executor)
+
+			return_data = self._after_parsing(metadata, return_data)
+
+		finally:
+			self._local_storage.pop()
+
+		return self._validate_to_model(return_data, validate_to)
+
+
+	async def aload_file[T: BaseModel](
+		self,
+		file_path: Union[str, Path],
+		validate_to: Optional[Type[T]] = None,
+		executor: Optional[Executor] = None
+	) -> Union[T, Any]:
+		"""
+		Parses a Junk file without blocking the event loop and returns the corresponding Python object. See aloads.
+
+		Args:
+			file_path Union[str, Path]: The path to the Junk file.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			executor (Optional[Executor]): The thread executor reading and parsing the file, the default executor of the event loop if None.
+
+		Returns:
+			Union[T, Any]: The parsed Python object.
+		"""
+		if self._result_cache is not None:
+			return_data = await self._result_cache.aget_or_load(self, file_path, executor)
+
+		else:
+			return_data, _ = await self._aload_file_data(file_path, executor=executor)
+
+		return self._validate_to_model(return_data, validate_to)
+
+
+	async def _aload_file_data(
+		self,
+		file_path: Union[str, Path],
+		string: Optional[str] = None,
+		executor: Optional[Executor] = None
+	) -> Tuple[Any, JunkMetadata]:
+		try:
+			metadata = JunkMetadata(
+				file_path = Path(file_path)
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			if string is None:
+				string = await asynchronous.run_in_executor(executor, Path(file_path).read_text)
+
+			return_data = await self._aparse(string, executor)
+			return_data = self._after_parsing(metadata, return_data)
+
+		finally:
+			self._local_storage.pop()
+
+		return return_data, metadata
+
+
+	async def _aparse(self, string: str, executor: Optional[Executor]) -> Any:
+		return_data, deferred_positions = await asynchronous.run_in_executor(executor, asynchronous.parse_deferred, self, string)
+
+		if deferred_positions:
+			await asynchronous.resolve_positions(deferred_positions)
+
+		return return_data
+
+
+	def load_files[T: BaseModel](
+		self,
+		file_paths: Iterable[Union[str, Path]],
+		validate_to: Optional[Type[T]] = None,
+		workers: Optional[int] = None,
+		executor: str = "process",
+		raise_errors: bool = False
+	) -> Dict[Union[str, Path], Union[T, Any, Exception]]:
+		"""
+		Parses several Junk files concurrently and returns the corresponding Python objects keyed by path, in the same order as given.
+
+		With the process executor, the parser is pickled and recreated in every worker process, along with its type processors. Parser subclasses, custom type processors and validation models must be importable by the workers.
+
+		Args:
+			file_paths (Iterable[Union[str, Path]]): The paths to the Junk files.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			workers (Optional[int]): Number of workers, defaults to the number of CPUs.
+			executor (str): Either "process" or "thread".
+			raise_errors (bool): Whether to raise the error of the first failed file instead of returning it as its result.
+
+		Returns:
+			Dict[Union[str, Path], Union[T, Any, Exception]]: The parsed Python objects, or the raised error for files that failed to load.
+		"""
+		file_paths = list(dict.fromkeys(file_paths))
+
+		if executor == "process":
+			chunk_size = max(1, len(file_paths) // ((workers or os.cpu_count() or 1) * 4))
+
+			with ProcessPoolExecutor(workers, initializer=batch.init_worker, initargs=(self,)) as pool_executor:
+				results = list(pool_executor.map(batch.load_file_in_worker, file_paths, repeat(validate_to), chunksize=chunk_size))
+		
+		elif executor == "thread":
+			with ThreadPoolExecutor(workers) as pool_executor:
+				results = list(pool_executor.map(batch.load_file, repeat(self), file_paths, repeat(validate_to)))
+		
+		else:
+			raise ValueError(f"Unsupported executor <{executor}>")
+
+		if raise_errors:
+			for loaded, data in results:
+				if not loaded:
+					raise data
+
+		return {file_path: data for file_path, (_, data) in zip(file_paths, results)}
+
+
+	def load_file_parallel[T: BaseModel](
+		self,
+		file_path: Union[str, Path],
+		validate_to: Optional[Type[T]] = None,
+		workers: Optional[int] = None,
+		batch_size: int = 1 << 20,
+		stats: Optional[batch.JunkParallelStats] = None
+	) -> Union[T, Any]:
+		"""
+		Parses a Junk file containing a top-level list or dict in parallel and returns the corresponding Python object.
+		The document is split at top-level element boundaries into batches of consecutive elements, which are parsed in a process pool, type processors included, then merged in order.
+
+		The before_parsing and after_parsing methods run in the calling process, with metadata.parallel_stats holding the split, wait and merge costs. The parser is pickled and recreated in every worker process, see load_files.
+
+		Args:
+			file_path Union[str, Path]: The path to the Junk file.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+			batch_size (int): Minimum number of characters sent to a worker at once.
+			stats (Optional[JunkParallelStats]): Statistics to fill while loading, created if None.
+
+		Returns:
+			Union[T, Any]: The parsed Python object.
+		"""
+		try:
+			metadata = JunkMetadata(
+				file_path = Path(file_path),
+				parallel_stats = stats if(stats is not None) else batch.JunkParallelStats()
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			with open(file_path, "rt") as opened_fp:
+				return_data = batch.parse_parallel(self, opened_fp, metadata, metadata.parallel_stats, workers, batch_size)
+
+			return_data = self._after_parsing(metadata, return_data)
+
+		finally:
+			self._local_storage.pop()
+
+		return self._validate_to_model(return_data, validate_to)
+
+
+	def iter_load[T: BaseModel](
+		self,
+		fp: IO,
+		validate_to: Optional[Type[T]] = None,
+		chunk_size: int = 65536
+	) -> Iterator[Union[T, Any, Tuple[str, Union[T, Any]]]]:
+		"""
+		Parses a Junk file-like object incrementally, yielding each element of a top-level list, or each (key, value) pair of a top-level dict, as soon as it is complete.
+		The file is read in chunks, so memory usage is bounded by the largest element rather than the whole document.
+
+		The before_parsing method is called once before the first element, while after_parsing is not called since the whole document is never built.
+
+		Args:
+			fp (file-like): The file-like object containing the Junk data.
+			validate_to (Optional[Type[T]]): The pydantic model to validate each element or pair value to.
+			chunk_size (int): Number of characters read at once.
+
+		Returns:
+			Iterator[Union[T, Any, Tuple[str, Union[T, Any]]]]: The parsed elements or (key, value) pairs.
+		"""
+		metadata = JunkMetadata(
+			file_path = Path(fp.name) if(hasattr(fp, "name")) else None
+		)
+
+		try:
+			self._local_storage.push(metadata)
+			self._before_parsing(metadata)
+
+		finally:
+			self._local_storage.pop()
+
+		with fp as opened_fp:
+			for item in JunkStreamSplitter(opened_fp, chunk_size):
+				try:
+					self._local_storage.push(metadata)
+					parsed_data = self._parse(item.text)
+
+				except UnexpectedInput as error:
+					item.relocate_error(error)
+					raise
+
+				finally:
+					self._local_storage.pop()
+
+				if item.container == "dict":
+					for key, value in parsed_data.items():
+						yield key, self._validate_to_model(value, validate_to)
+
+				elif item.container == "list":
+					for value in parsed_data:
+						yield self._validate_to_model(value, validate_to)
+
+				else:
+					raise ValueError(f"Unsupported top-level value for iterative loading, expected a list or a dict: {type(parsed_data)}")
+
+
+	def iter_load_file[T: BaseModel](
+		self,
+		file_path: Union[str, Path],
+		validate_to: Optional[Type[T]] = None,
+		chunk_size: int = 65536
+	) -> Iterator[Union[T, Any, Tuple[str, Union[T, Any]]]]:
+		"""
+		Parses a Junk file incrementally, yielding each element of a top-level list, or each (key, value) pair of a top-level dict. See iter_load.
+
+		Args:
+			file_path Union[str, Path]: The path to the Junk file.
+			validate_to (Optional[Type[T]]): The pydantic model to validate each element or pair value to.
+			chunk_size (int): Number of characters read at once.
+
+		Returns:
+			Iterator[Union[T, Any, Tuple[str, Union[T, Any]]]]: The parsed elements or (key, value) pairs.
+		"""
+		yield from self.iter_load(open(file_path, "rt"), validate_to, chunk_size)
+
+
+	def compile_file(self, file_path: Union[str, Path], snapshot_path: Optional[Union[str, Path]] = None) -> Path:
+		"""
+		Compiles a Junk file into a binary snapshot, loaded by load_snapshot much faster than parsing the file.
+		Typed values are stored processed when their type processors are snapshot-safe, and processed when the snapshot is loaded otherwise.
+
+		The before_parsing method is called while compiling and after_parsing is not, both being called when the snapshot is loaded.
+
+		Args:
+			file_path Union[str, Path]: The path to the Junk file.
+			snapshot_path (Optional[Union[str, Path]]): The path to the snapshot, the file path followed by ".junkc" if None.
+
+		Returns:
+			Path: The path to the snapshot.
+		"""
+		snapshot_path = Path(snapshot_path) if(snapshot_path is not None) else snapshot.default_snapshot_path(file_path)
+		fingerprint = snapshot.source_fingerprint(file_path)
+
+		try:
+			metadata = JunkMetadata(
+				file_path = Path(file_path)
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			with open(file_path, "rt") as opened_fp:
+				string = profiling.read(opened_fp)
+
+			snapshot_values_token = snapshot.SNAPSHOT_VALUES.set([])
+			try:
+				return_data = self._parse(string)
+
+			finally:
+				snapshot.SNAPSHOT_VALUES.reset(snapshot_values_token)
+
+		finally:
+			self._local_storage.pop()
+
+		snapshot.write_snapshot(self, file_path, snapshot_path, fingerprint, return_data)
+		return snapshot_path
+
+
+	def load_snapshot[T: BaseModel](
+		self,
+		file_path: Union[str, Path],
+		validate_to: Optional[Type[T]] = None,
+		snapshot_path: Optional[Union[str, Path]] = None,
+		update: bool = False
+	) -> Union[T, Any]:
+		"""
+		Loads a Junk file from its binary snapshot when it matches the file modification time and size and the registered type processors, falling back to load_file otherwise.
+		Snapshots are unpickled, so they must come from a trusted source.
+
+		Args:
+			file_path Union[str, Path]: The path to the Junk file.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			snapshot_path (Optional[Union[str, Path]]): The path to the snapshot, the file path followed by ".junkc" if None.
+			update (bool): Whether to compile the snapshot again when it is missing or outdated.
+
+		Returns:
+			Union[T, Any]: The parsed Python object.
+		"""
+		snapshot_path = Path(snapshot_path) if(snapshot_path is not None) else snapshot.default_snapshot_path(file_path)
+		valid, return_data, has_snapshot_values = snapshot.read_snapshot(self, file_path, snapshot_path)
+
+		if not valid and update:
+			try:
+				self.compile_file(file_path, snapshot_path)
+
+			except OSError:
+				pass
+
+			else:
+				valid, return_data, has_snapshot_values = snapshot.read_snapshot(self, file_path, snapshot_path)
+
+		if not valid:
+			return self.load_file(file_path, validate_to)
+
+		try:
+			metadata = JunkMetadata(
+				file_path = Path(file_path),
+				parsing_path = "snapshot"
+			)
+			self._local_storage.push(metadata)
+
+			self._before_parsing(metadata)
+
+			if has_snapshot_values:
+				return_data = snapshot.process_snapshot_values(self, return_data)
+
+			return_data = self._after_parsing(metadata, return_data)
+
+		finally:
+			self._local_storage.pop()
+
+		return self._validate_to_model(return_data, validate_to)
+
+
+	def watch[T: BaseModel](
+		self,
+		file_path: Union[str, Path],
+		callback: Callable[[Union[T, Any]], Any],
+		validate_to: Optional[Type[T]] = None,
+		interval: float = 1.0,
+		debounce: float = 0.1,
+		error_callback: Optional[Callable[[Exception], Any]] = None,
+		loop: Optional[asyncio.AbstractEventLoop] = None,
+		use_inotify: bool = True,
+		incremental: bool = False
+	) -> watch.JunkWatcher:
+		"""
+		Loads a Junk file, then watches it along with the files its data depends on (see JunkMetadata.dependencies), reloading it in a background thread when their contents change.
+		Files are compared by stat every interval, or as soon as their directories change when inotify is available. Bursts of writes are debounced, and touched files whose contents are unchanged are not parsed again.
+
+		Args:
+			file_path (Union[str, Path]): The path to the Junk file.
+			callback (Callable[[Union[T, Any]], Any]): Called with the reloaded object, which may be a coroutine function when a loop is given.
+			validate_to (Optional[Type[T]]): The pydantic model to validate the parsed data to.
+			interval (float): Seconds between stat checks.
+			debounce (float): Seconds the files must stay unchanged before being reloaded.
+			error_callback (Optional[Callable[[Exception], Any]]): Called with the errors of failed reloads, after which the last loaded object is kept, and with the errors raised by callback. Errors left without an error callback are logged, and watching goes on.
+			loop (Optional[asyncio.AbstractEventLoop]): Event loop running the callbacks, the watcher thread if None.
+			use_inotify (bool): Whether to use inotify where available.
+			incremental (bool): Whether to reload incrementally, reparsing only the edited containers of the file (see loads_incremental).
+
+		Returns:
+			JunkWatcher: The running watcher, holding the last loaded object in its data attribute. Errors of the initial load are raised.
+		"""
+		watcher = watch.JunkWatcher(self, file_path, callback, validate_to, interval, debounce, error_callback, loop, use_inotify, incremental)
+		watcher.start()
+		return watcher
+
+
+	def dumps(self, obj: Any, indent: Optional[Union[int, str]] = None) -> str:
+		"""
+		Serializes a Python object to a Junk string.
+		Objects matching the CLASS of a type processor defining dump are written as typed values, so that loading the string returns an equal object.
+
+		Args:
+			obj (Any): The object to serialize.
+			indent (Optional[Union[int, str]]): Indentation of nested values, either a number of spaces or a string. Values are written on a single line if None.
+
+		Returns:
+			str: The Junk string.
+		"""
+		if isinstance(obj, BaseModel):
+			obj = obj.model_dump()
+
+		return serializer.JunkEncoder(self._dump_type_processors, indent).encode(obj)
+
+
+	def dump(self, obj: Any, fp: IO, indent: Optional[Union[int, str]] = None):
+		"""
+		Serializes a Python object to a Junk file-like object, writing it in chunks instead of building the whole string. See dumps.
+
+		Args:
+			obj (Any): The object to serialize.
+			fp (file-like): The file-like object to write to.
+			indent (Optional[Union[int, str]]): Indentation of nested values, either a number of spaces or a string. Values are written on a single line if None.
+		"""
+		if isinstance(obj, BaseModel):
+			obj = obj.model_dump()
+
+		serializer.JunkEncoder(self._dump_type_processors, indent).dump(obj, fp)
+
+
+	@contextmanager
+	def profile(self) -> Iterator[profiling.JunkProfileReport]:
+		"""
+		Profiles the loads run within the block, in the current thread or asyncio task, by any parser.
+		Profiling is disabled outside of the block, where it only costs a context variable lookup per phase.
+
+		Type processors awaited by the async methods and loads running in worker processes are not profiled.
+
+		Returns:
+			Iterator[JunkProfileReport]: The report, filled as loads run.
+		"""
+		if self._backend == "lark":
+			# Built beforehand so that its cost does not show up in the first load
+			self._get_profiled_lark_parser()
+
+		report = profiling.JunkProfileReport()
+		token = profiling.PROFILE_REPORT.set(report)
+
+		try:
+			yield report
+
+		finally:
+			profiling.PROFILE_REPORT.reset(token)
+
+
+	def _before_parsing(self, metadata: JunkMetadata):
+		report = profiling.PROFILE_REPORT.get()
+		if report is not None:
+			report.count_load()
+			report.timed("before_parsing", self.before_parsing, metadata)
+
+		else:
+			self.before_parsing(metadata)
+
+
+	def _after_parsing(self, metadata: JunkMetadata, parsed_data: Any) -> Any:
+		report = profiling.PROFILE_REPORT.get()
+		if report is not None:
+			return report.timed("after_parsing", self.after_parsing, metadata, parsed_data)
+
+		return self.after_parsing(metadata, parsed_data)
+
+
 	def before_parsing(self, metadata: JunkMetadata):
 		pass
 
@@ -250,10 +1251,18 @@ class JunkTransformer(Transformer):
 	def __init__(self, parser_instance):
 		super().__init__()
 		self._parser_instance = parser_instance
+
+		if parser_instance._numeric_arrays:
+			self.list = functools.partial(arrays.to_numeric_array, min_length=parser_instance._numeric_arrays)
 	
 
 	def typed_value(self, value):
-		return self.typed_value_parser(value[0], {} if(len(value) == 2) else value[1], value[-1])
+		typed_value = value[-1]
+		if type(typed_value) is array and value[0] not in self._parser_instance._registry.array_keywords:
+			# Other type processors receive lists, as with the scanner backend
+			typed_value = typed_value.tolist()
+
+		return self.typed_value_parser(value[0], {} if(len(value) == 2) else value[1], typed_value)
 		
 		
 	def typed_null_value(self, value):
@@ -261,15 +1270,76 @@ class JunkTransformer(Transformer):
 		
 		
 	def typed_value_parser(self, type_cls, type_kwargs, value):
-		type_processor = self._parser_instance._type_processors_keyword_dict.get(type_cls, None)
-		if type_processor is None:
+		if self._compiles_chains():
+			load_chain = None if(type_kwargs) else self._parser_instance._compiled_chains.get(type_cls, None)
+			if load_chain is None:
+				load_chain = self._parser_instance._compiled_chain(((type_cls, type_kwargs),))
+
+			if load_chain is not None:
+				return load_chain(value)
+
+		return self.typed_link_parser(type_cls, type_kwargs, value)
+
+
+	def typed_chain_parser(self, chain, value):
+		# Chained annotations like (string) (int) 1, outermost first
+		if self._compiles_chains():
+			load_chain = self._parser_instance._compiled_chain(chain)
+			if load_chain is not None:
+				return load_chain(value)
+
+		array_keywords = self._parser_instance._registry.array_keywords
+		for type_cls, type_kwargs in reversed(chain):
+			if type(value) is array and type_cls not in array_keywords:
+				# Arrays loaded by inner annotations reach other type processors as lists, as with nested typed values
+				value = value.tolist()
+
+			value = self.typed_link_parser(type_cls, type_kwargs, value)
+
+		return value
+
+
+	def _compiles_chains(self):
+		# Compiled chains run type processors directly, so typed values deferred, stored in snapshots or profiled go through typed_link_parser
+		return (
+			self._parser_instance._compiles_chains
+			and asynchronous.DEFERRED_VALUES.get() is None
+			and snapshot.SNAPSHOT_VALUES.get() is None
+			and profiling.PROFILE_REPORT.get() is None
+		)
+
+
+	def typed_link_parser(self, type_cls, type_kwargs, value):
+		dispatch = self._parser_instance._type_dispatch.get(type_cls, None)
+		if dispatch is None:
 			raise ValueError(f"Unsupported type <{type_cls}>")
+
+		type_processor, load_typed_value = dispatch
 		
-		loaded_value = type_processor.load(value, **type_kwargs)
-		if not isinstance(loaded_value, type_processor.CLASS):
-			raise TypeError(f"Unexpected output type for type processor ({type_cls}). Expected {type_processor.CLASS}, got {type(loaded_value)}")
-			
-		return loaded_value
+		# Coroutine type processors, and typed values wrapping their results, are awaited by the async methods once parsed
+		deferred_values = asynchronous.DEFERRED_VALUES.get()
+		if deferred_values is not None and (
+			type_cls in self._parser_instance._async_type_processors_keywords
+			or (deferred_values and asynchronous.find_deferred([type_kwargs, value]))
+		):
+			deferred_value = asynchronous.JunkDeferredValue(type_processor, type_cls, type_kwargs, value)
+			deferred_values.append(deferred_value)
+			return deferred_value
+
+		# Typed values whose type processors are not snapshot-safe, or wrapping them, are stored unprocessed by compile_file
+		snapshot_values = snapshot.SNAPSHOT_VALUES.get()
+		if snapshot_values is not None and (
+			not snapshot.is_snapshot_safe(type_processor)
+			or (snapshot_values and snapshot.contains_snapshot_values([type_kwargs, value]))
+		):
+			snapshot_value = snapshot.JunkSnapshotValue(type_cls, type_kwargs, value)
+			snapshot_values.append(snapshot_value)
+			return snapshot_value
+
+		if self._parser_instance._lazy:
+			return lazy.JunkLazyValue(type_processor, type_cls, type_kwargs, value, self._parser_instance._local_storage.get())
+
+		return load_typed_value(type_kwargs, value)
 	
 	
 	list = list
@@ -287,3 +1357,105 @@ class JunkTransformer(Transformer):
 	null = lambda self, _: None
 	true = lambda self, _: True
 	false = lambda self, _: False
+
+
+
+_DEFAULT_PARSER = None
+
+
+def _get_default_parser() -> JunkParser:
+	global _DEFAULT_PARSER
+	
+	if _DEFAULT_PARSER is None:
+		_DEFAULT_PARSER = JunkParser()
+	
+	return _DEFAULT_PARSER
+
+
+def loads[T: BaseModel](string: str, validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk string with the default parser. See JunkParser.loads.
+	"""
+	return _get_default_parser().loads(string, validate_to)
+
+
+def load[T: BaseModel](fp: IO, validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk file-like object with the default parser. See JunkParser.load.
+	"""
+	return _get_default_parser().load(fp, validate_to)
+
+
+def load_file[T: BaseModel](file_path: Union[str, Path], validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk file with the default parser. See JunkParser.load_file.
+	"""
+	return _get_default_parser().load_file(file_path, validate_to)
+
+
+def load_file_from_env[T: BaseModel](env_var: str, validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk file specified in an environment variable with the default parser. See JunkParser.load_file_from_env.
+	"""
+	return _get_default_parser().load_file_from_env(env_var, validate_to)
+
+
+async def aloads[T: BaseModel](string: str, validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk string asynchronously with the default parser. See JunkParser.aloads.
+	"""
+	return await _get_default_parser().aloads(string, validate_to)
+
+
+async def aload[T: BaseModel](fp: IO, validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk file-like object asynchronously with the default parser. See JunkParser.aload.
+	"""
+	return await _get_default_parser().aload(fp, validate_to)
+
+
+async def aload_file[T: BaseModel](file_path: Union[str, Path], validate_to: Optional[Type[T]] = None) -> Union[T, Any]:
+	"""
+	Parses a Junk file asynchronously with the default parser. See JunkParser.aload_file.
+	"""
+	return await _get_default_parser().aload_file(file_path, validate_to)
+
+
+def compile_file(file_path: Union[str, Path], snapshot_path: Optional[Union[str, Path]] = None) -> Path:
+	"""
+	Compiles a Junk file into a binary snapshot with the default parser. See JunkParser.compile_file.
+	"""
+	return _get_default_parser().compile_file(file_path, snapshot_path)
+
+
+def load_snapshot[T: BaseModel](
+	file_path: Union[str, Path],
+	validate_to: Optional[Type[T]] = None,
+	snapshot_path: Optional[Union[str, Path]] = None,
+	update: bool = False
+) -> Union[T, Any]:
+	"""
+	Loads a Junk file from its binary snapshot with the default parser. See JunkParser.load_snapshot.
+	"""
+	return _get_default_parser().load_snapshot(file_path, validate_to, snapshot_path, update)
+
+
+def dumps(obj: Any, indent: Optional[Union[int, str]] = None) -> str:
+	"""
+	Serializes a Python object to a Junk string with the default parser. See JunkParser.dumps.
+	"""
+	return _get_default_parser().dumps(obj, indent)
+
+
+def dump(obj: Any, fp: IO, indent: Optional[Union[int, str]] = None):
+	"""
+	Serializes a Python object to a Junk file-like object with the default parser. See JunkParser.dump.
+	"""
+	_get_default_parser().dump(obj, fp, indent)
+
+
+def profile() -> ContextManager[profiling.JunkProfileReport]:
+	"""
+	Profiles the loads run within the block by any parser. See JunkParser.profile.
+	"""
+	return _get_default_parser().profile()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, IO, Any, Optional, Tuple, Type, Union
+if TYPE_CHECKING:
+	from .base import JunkMetadata, JunkParser
+
+from lark.exceptions import UnexpectedInput
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from pydantic import BaseModel
+from .scanner import JunkSyntaxError
+from .stream import JunkStreamItem, JunkStreamSplitter
+from . import arrays
+import os
+import pickle
+import time
+
+
+
+@dataclass
+class JunkParallelStats:
+	"""
+	Costs of a parallel load, to be compared with the serial parsing time.
+
+	Attributes:
+		batches (int): Number of snippets parsed by the workers.
+		characters (int): Number of characters sent to the workers.
+		split_time (float): Seconds spent reading the file and finding element boundaries.
+		wait_time (float): Seconds spent waiting for worker results.
+		merge_time (float): Seconds spent stitching worker results together.
+		worker_time (float): Seconds spent parsing by all workers, summed.
+		total_time (float): Wall-clock seconds of the whole load.
+	"""
+	batches: int = 0
+	characters: int = 0
+	split_time: float = 0.0
+	wait_time: float = 0.0
+	merge_time: float = 0.0
+	worker_time: float = 0.0
+	total_time: float = 0.0
+
+
+
+_WORKER_PARSER = None
+
+
+def init_worker(parser: JunkParser):
+	"""
+	Initializes a worker process with its own copy of the parser, rebuilt on unpickling.
+
+	Args:
+		parser (JunkParser): The parser used by the worker.
+	"""
+	global _WORKER_PARSER
+	_WORKER_PARSER = parser
+
+
+def load_file(parser: JunkParser, file_path: Union[str, Path], validate_to: Optional[Type[BaseModel]] = None) -> Tuple[bool, Any]:
+	"""
+	Loads a file capturing any raised error.
+
+	Args:
+		parser (JunkParser): The parser loading the file.
+		file_path (Union[str, Path]): The path to the Junk file.
+		validate_to (Optional[Type[BaseModel]]): The pydantic model to validate the parsed data to.
+
+	Returns:
+		Tuple[bool, Any]: Whether the file was loaded, and the parsed data or the raised error.
+	"""
+	try:
+		return True, parser.load_file(file_path, validate_to)
+
+	except Exception as error:
+		return False, error
+
+
+def load_file_in_worker(file_path: Union[str, Path], validate_to: Optional[Type[BaseModel]] = None) -> Tuple[bool, Any]:
+	"""
+	Loads a file with the parser of the current worker process. See load_file.
+	"""
+	loaded, data = load_file(_WORKER_PARSER, file_path, validate_to)
+	return loaded, data if(loaded) else picklable_error(data)
+
+
+def picklable_error(error: Exception) -> Exception:
+	"""
+	Returns an error that can be sent back from a worker process. Syntax errors that can't be pickled are copied as JunkSyntaxError keeping their position, other errors as RuntimeError keeping their message.
+
+	Args:
+		error (Exception): The raised error.
+
+	Returns:
+		Exception: The error itself or a picklable copy.
+	"""
+	try:
+		pickle.loads(pickle.dumps(error))
+		return error
+
+	except Exception:
+		pass
+
+	if isinstance(error, UnexpectedInput):
+		return JunkSyntaxError.from_error(error)
+
+	return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def parse_item_in_worker(item: JunkStreamItem, metadata: JunkMetadata) -> Tuple[bool, Any, float]:
+	"""
+	Parses a snippet of a split document with the parser of the current worker process.
+
+	Args:
+		item (JunkStreamItem): The snippet to parse.
+		metadata (JunkMetadata): Copy of the metadata of the whole document, used by type processors.
+
+	Returns:
+		Tuple[bool, Any, float]: Whether the snippet was parsed, the parsed container or the raised error, and the parsing time.
+	"""
+	start_time = time.perf_counter()
+
+	try:
+		_WORKER_PARSER._local_storage.push(metadata)
+		return True, _WORKER_PARSER._parse(item.text), time.perf_counter() - start_time
+
+	except UnexpectedInput as error:
+		item.relocate_error(error)
+		return False, picklable_error(error), time.perf_counter() - start_time
+
+	except Exception as error:
+		return False, picklable_error(error), time.perf_counter() - start_time
+
+	finally:
+		_WORKER_PARSER._local_storage.pop()
+
+
+def parse_parallel(
+	parser: JunkParser,
+	fp: IO,
+	metadata: JunkMetadata,
+	stats: JunkParallelStats,
+	workers: Optional[int] = None,
+	batch_size: int = 1 << 20
+) -> Any:
+	"""
+	Parses a Junk document containing a top-level list or dict by splitting it into batches of consecutive elements, parsed in a process pool and merged in order.
+
+	Args:
+		parser (JunkParser): The parser, recreated in every worker process.
+		fp (file-like): The file-like object containing the Junk data.
+		metadata (JunkMetadata): The metadata of the document, copied to the workers.
+		stats (JunkParallelStats): Statistics filled while loading.
+		workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+		batch_size (int): Minimum number of characters of each batch.
+
+	Returns:
+		Any: The parsed Python object.
+	"""
+	start_time = time.perf_counter()
+	workers = workers or os.cpu_count() or 1
+	return_data = None
+	pending = deque()
+
+	def merge_next():
+		nonlocal return_data
+
+		wait_start_time = time.perf_counter()
+		parsed, data, worker_time = pending.popleft().result()
+		merge_start_time = time.perf_counter()
+		stats.wait_time += merge_start_time - wait_start_time
+		stats.worker_time += worker_time
+
+		if not parsed:
+			raise data
+
+		# Batches of a top-level list may hold different numbers, so it is converted to an array once merged
+		if isinstance(data, array):
+			data = data.tolist()
+
+		if return_data is None:
+			return_data = data
+
+		elif isinstance(return_data, dict):
+			return_data.update(data)
+
+		else:
+			return_data.extend(data)
+
+		stats.merge_time += time.perf_counter() - merge_start_time
+
+	with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(parser,)) as pool_executor:
+		try:
+			splitter = iter(JunkStreamSplitter(fp, batch_size=batch_size))
+
+			while True:
+				split_start_time = time.perf_counter()
+				item = next(splitter, None)
+				stats.split_time += time.perf_counter() - split_start_time
+
+				if item is None:
+					break
+
+				if item.container == "value":
+					raise ValueError(f"Unsupported top-level value for parallel loading, expected a list or a dict")
+
+				stats.batches += 1
+				stats.characters += len(item.text)
+				pending.append(pool_executor.submit(parse_item_in_worker, item, metadata))
+
+				# Bound the number of batches held in memory
+				if len(pending) > workers * 2:
+					merge_next()
+
+			while pending:
+				merge_next()
+
+			if parser._numeric_arrays and isinstance(return_data, list):
+				return_data = arrays.to_numeric_array(return_data, parser._numeric_arrays)
+
+		finally:
+			for future in pending:
+				future.cancel()
+
+	stats.total_time = time.perf_counter() - start_time
+	return return_data
@@ -0,0 +1,390 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Optional, Tuple, Union
+if TYPE_CHECKING:
+	from .base import JunkMetadata, JunkParser
+
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from . import asynchronous
+import copy
+import hashlib
+import io
+import math
+import os
+import threading
+import time
+
+
+
+_MISSING = object()
+
+
+
+def _stat_fingerprint(file_path: Path) -> tuple:
+	file_stat = os.stat(file_path)
+	return (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+
+
+def _dependencies_fingerprint(dependencies: Iterable[Path]) -> Optional[Tuple[Tuple[Path, tuple], ...]]:
+	# Stat fingerprints of the files a result depends on, None if one of them cannot be read
+	try:
+		return tuple((file_path, _stat_fingerprint(file_path)) for file_path in sorted(set(dependencies)))
+
+	except OSError:
+		return None
+
+
+def _dependencies_unchanged(dependencies: Tuple[Tuple[Path, tuple], ...]) -> bool:
+	try:
+		return all(_stat_fingerprint(file_path) == fingerprint for file_path, fingerprint in dependencies)
+
+	except OSError:
+		return False
+
+
+
+def freeze(data: Any) -> Any:
+	"""
+	Returns an immutable version of the given parsed data. Dicts become read-only mappings, lists become tuples and sets become frozensets, recursively.
+
+	Args:
+		data (Any): The parsed data to freeze.
+
+	Returns:
+		Any: The frozen data.
+	"""
+	if isinstance(data, dict):
+		return MappingProxyType({key: freeze(value) for key, value in data.items()})
+
+	elif isinstance(data, (list, tuple)):
+		return tuple(freeze(value) for value in data)
+
+	elif isinstance(data, (set, frozenset)):
+		return frozenset(freeze(value) for value in data)
+
+	return data
+
+
+
+@dataclass
+class JunkResultCacheEntry:
+	data: Any
+	stat_fingerprint: tuple
+	content_hash: Optional[bytes]
+	size: int
+	timestamp: float
+	lazy: bool = False
+	# Stat fingerprints of the included files and other files the data depends on
+	dependencies: Tuple[Tuple[Path, tuple], ...] = ()
+
+
+
+@dataclass
+class JunkResultCacheMiss:
+	key: Hashable
+	stat_fingerprint: tuple
+	content_hash: Optional[bytes]
+	size: int
+	string: Optional[str]
+	lazy: bool = False
+
+
+
+class JunkResultCache:
+	"""
+	Bounded LRU cache for the results of JunkParser.load_file.
+
+	Entries are keyed on the resolved file path, the parser class, its registered type processors and the options changing the type of results (lazy, numeric_arrays), and are only reused while the file stat fingerprint (and optionally its content hash) is unchanged.
+	Results depending on other files, like included ones (see JunkMetadata.dependencies), are only reused while the stat fingerprints of these files are unchanged as well.
+	The cached value is the output of after_parsing, so parsing hooks only run on cache misses. Hooks and type processors can set metadata.cacheable to False to skip caching a result.
+	Results of lazy parsers are neither copied nor frozen, which would run all their type processors, and are shared between callers instead.
+	"""
+
+	def __init__(
+		self,
+		max_entries: int = 128,
+		max_bytes: Optional[int] = None,
+		ttl: Optional[float] = None,
+		hash_content: bool = False,
+		immutable: bool = False
+	):
+		"""
+		Initializes the result cache.
+
+		Args:
+			max_entries (int): Maximum number of cached files.
+			max_bytes (Optional[int]): Maximum total size of the cached source files, unbounded if None.
+			ttl (Optional[float]): Seconds an entry stays valid, unlimited if None.
+			hash_content (bool): Whether to also compare a hash of the file contents, catching changes that keep size and modification time.
+			immutable (bool): Whether to return frozen results shared between callers instead of deep copies.
+		"""
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.ttl = ttl
+		self.hash_content = hash_content
+		self.immutable = immutable
+
+		self.hits = 0
+		self.misses = 0
+
+		self._entries: OrderedDict[Hashable, JunkResultCacheEntry] = OrderedDict()
+		self._total_bytes = 0
+		self._lock = threading.Lock()
+
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+
+	def __getstate__(self) -> dict:
+		# Only the configuration is pickled, unpickled caches start empty
+		state = self.__dict__.copy()
+		for attribute in ("_entries", "_total_bytes", "_lock", "hits", "misses"):
+			state.pop(attribute)
+
+		return state
+
+
+	def __setstate__(self, state: dict):
+		self.__init__(**state)
+
+
+	def get_or_load(self, parser: JunkParser, file_path: Union[str, Path]) -> Any:
+		"""
+		Returns the cached result for a file, loading it with the given parser when missing or outdated.
+
+		Args:
+			parser (JunkParser): The parser loading the file.
+			file_path (Union[str, Path]): The path to the Junk file.
+
+		Returns:
+			Any: The parsed Python object.
+		"""
+		found, result = self._lookup(parser, file_path)
+		if found:
+			return result
+
+		return self._store(result, *parser._load_file_data(file_path, result.string))
+
+
+	async def aget_or_load(self, parser: JunkParser, file_path: Union[str, Path], executor: Optional[Executor] = None) -> Any:
+		"""
+		Returns the cached result for a file without blocking the event loop, loading it with the async methods of the given parser when missing or outdated.
+
+		Args:
+			parser (JunkParser): The parser loading the file.
+			file_path (Union[str, Path]): The path to the Junk file.
+			executor (Optional[Executor]): The thread executor checking and loading the file, the default executor of the event loop if None.
+
+		Returns:
+			Any: The parsed Python object.
+		"""
+		found, result = await asynchronous.run_in_executor(executor, self._lookup, parser, file_path)
+		if found:
+			return result
+
+		return self._store(result, *await parser._aload_file_data(file_path, result.string, executor))
+
+
+	def _lookup(self, parser: JunkParser, file_path: Union[str, Path]) -> Tuple[bool, Union[Any, JunkResultCacheMiss]]:
+		resolved_path = Path(file_path).resolve()
+		key = (resolved_path, type(parser), parser._type_processors_fingerprint, parser._lazy, parser._numeric_arrays)
+		file_stat = os.stat(resolved_path)
+		stat_fingerprint = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+
+		with self._lock:
+			entry = self._get_entry(key)
+
+		if entry is not None and not _dependencies_unchanged(entry.dependencies):
+			entry = None
+
+		if entry is not None and entry.stat_fingerprint == stat_fingerprint and not self.hash_content:
+			return True, self._hit(entry)
+
+		string = None
+		content_hash = None
+
+		if self.hash_content:
+			with open(resolved_path, "rb") as opened_fp:
+				content = opened_fp.read()
+
+			content_hash = hashlib.blake2b(content).digest()
+
+			if entry is not None and entry.content_hash == content_hash:
+				entry.stat_fingerprint = stat_fingerprint
+				return True, self._hit(entry)
+
+			with io.TextIOWrapper(io.BytesIO(content)) as text_fp:
+				string = text_fp.read()
+
+		with self._lock:
+			self.misses += 1
+
+		return False, JunkResultCacheMiss(key, stat_fingerprint, content_hash, file_stat.st_size, string, parser._lazy)
+
+
+	def _store(self, miss: JunkResultCacheMiss, return_data: Any, metadata: JunkMetadata) -> Any:
+		dependencies = set(metadata.dependencies)
+		if metadata.includes is not None:
+			dependencies.update(metadata.includes.files)
+
+		dependencies_fingerprint = _dependencies_fingerprint(dependencies)
+
+		if metadata.cacheable and dependencies_fingerprint is not None:
+			if miss.lazy:
+				# Lazy values stay unresolved until accessed, resolving them once for every caller
+				self._put(miss.key, JunkResultCacheEntry(return_data, miss.stat_fingerprint, miss.content_hash, miss.size, time.monotonic(), True, dependencies_fingerprint))
+				return return_data
+
+			cached_data = freeze(return_data) if(self.immutable) else copy.deepcopy(return_data)
+			self._put(miss.key, JunkResultCacheEntry(cached_data, miss.stat_fingerprint, miss.content_hash, miss.size, time.monotonic(), False, dependencies_fingerprint))
+
+			if self.immutable:
+				return cached_data
+
+		return return_data
+
+
+	def invalidate(self, file_path: Optional[Union[str, Path]] = None):
+		"""
+		Removes cached results.
+
+		Args:
+			file_path (Optional[Union[str, Path]]): The file whose results, and the results depending on it, are removed for every parser, or None to clear the whole cache.
+		"""
+		with self._lock:
+			if file_path is None:
+				self._entries.clear()
+				self._total_bytes = 0
+				return
+
+			resolved_path = Path(file_path).resolve()
+			for key in [
+				key for key, entry in self._entries.items()
+				if key[0] == resolved_path or any(dependency_path == resolved_path for dependency_path, _ in entry.dependencies)
+			]:
+				self._total_bytes -= self._entries.pop(key).size
+
+
+	def _hit(self, entry: JunkResultCacheEntry) -> Any:
+		with self._lock:
+			self.hits += 1
+
+		return entry.data if(self.immutable or entry.lazy) else copy.deepcopy(entry.data)
+
+
+	def _get_entry(self, key: Hashable) -> Optional[JunkResultCacheEntry]:
+		entry = self._entries.get(key)
+		if entry is None:
+			return None
+
+		if self.ttl is not None and time.monotonic() - entry.timestamp > self.ttl:
+			self._total_bytes -= self._entries.pop(key).size
+			return None
+
+		self._entries.move_to_end(key)
+		return entry
+
+
+	def _put(self, key: Hashable, entry: JunkResultCacheEntry):
+		with self._lock:
+			previous_entry = self._entries.pop(key, None)
+			if previous_entry is not None:
+				self._total_bytes -= previous_entry.size
+
+			self._entries[key] = entry
+			self._total_bytes += entry.size
+
+			while self._entries and (
+				len(self._entries) > self.max_entries
+				or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+			):
+				_, evicted_entry = self._entries.popitem(last=False)
+				self._total_bytes -= evicted_entry.size
+
+
+
+def typed_key(value: Any) -> Hashable:
+	"""
+	Returns the part of a memo key identifying a value, telling apart equal values that may load differently, like 1, 1.0 and True, or 0.0 and -0.0.
+
+	Args:
+		value (Any): The value.
+
+	Returns:
+		Hashable: The key.
+	"""
+	if type(value) is float:
+		return (float, value, math.copysign(1.0, value))
+
+	return (type(value), value)
+
+
+
+class JunkTypeMemo:
+	"""
+	Bounded LRU memo of type processor results, keyed on the type keyword, the parsed value and the modifiers.
+	Typed values whose value or modifiers are not hashable, such as lists and dicts, are loaded without being memoized.
+	"""
+
+	def __init__(self, max_entries: int = 4096):
+		"""
+		Initializes the memo.
+
+		Args:
+			max_entries (int): Maximum number of memoized results.
+		"""
+		self.max_entries = max_entries
+
+		self.hits = 0
+		self.misses = 0
+
+		self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+		self._lock = threading.Lock()
+
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+
+	def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+		"""
+		Returns the memoized result for a key, calling load when missing.
+
+		Args:
+			key (Hashable): The memo key.
+			load (Callable[[], Any]): Callable returning the result.
+
+		Returns:
+			Any: The result.
+		"""
+		try:
+			with self._lock:
+				loaded_value = self._entries.get(key, _MISSING)
+
+				if loaded_value is not _MISSING:
+					self._entries.move_to_end(key)
+					self.hits += 1
+					return loaded_value
+
+				self.misses += 1
+
+		except TypeError:
+			return load()
+
+		loaded_value = load()
+
+		with self._lock:
+			self._entries[key] = loaded_value
+			if len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+		return loaded_value
+
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
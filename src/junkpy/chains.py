@@ -0,0 +1,83 @@
+from typing import Any, Callable, FrozenSet, Hashable, List, Sequence, Tuple
+from array import array
+from .type_processors import JunkTypeProcessor, check_output_type, static_output_class
+from .cache import typed_key
+
+
+
+COMPILED_CHAINS_SIZE = 1024
+
+
+
+def chain_key(chain: Sequence[Tuple[str, dict]]) -> Hashable:
+	"""
+	Returns the key identifying an annotation chain among the compiled ones.
+
+	Args:
+		chain (Sequence[Tuple[str, dict]]): The type keywords along with their modifiers, outermost first.
+
+	Returns:
+		Hashable: The key, made of the keywords alone for annotations without modifiers.
+
+	Raises:
+		TypeError: If a modifier is not hashable, in which case the chain cannot be compiled.
+	"""
+	if len(chain) == 1 and not chain[0][1]:
+		return chain[0][0]
+
+	key = ()
+	for type_cls, type_kwargs in chain:
+		if type_kwargs:
+			key = tuple((type_cls, *((name, typed_key(kwarg)) for name, kwarg in type_kwargs.items())) for type_cls, type_kwargs in chain)
+			hash(key)
+			return key
+
+		key += (type_cls,)
+
+	return key
+
+
+def compile_chain(steps: List[Tuple[str, JunkTypeProcessor, dict, Callable[[Any], Any], bool]], array_keywords: FrozenSet[str] = frozenset()) -> Callable[[Any], Any]:
+	"""
+	Compiles the steps of an annotation chain into a single callable loading a value through all of them.
+
+	Args:
+		steps (List[Tuple[str, JunkTypeProcessor, dict, Callable[[Any], Any], bool]]): The type keyword, the type processor, the modifiers of the annotation, the callable loading
+			a value with these modifiers already bound, and whether its output type is checked, innermost first.
+		array_keywords (FrozenSet[str]): Keywords of the type processors accepting numeric arrays, the others receiving arrays loaded by inner annotations as lists.
+
+	Returns:
+		Callable[[Any], Any]: The callable loading a value.
+	"""
+	if len(steps) == 1:
+		type_cls, type_processor, type_kwargs, load, checked = steps[0]
+		if not checked:
+			return load
+
+		output_class = static_output_class(type_processor)
+
+		def load_checked(value: Any) -> Any:
+			loaded_value = load(value)
+			if not isinstance(loaded_value, output_class):
+				check_output_type(type_processor, type_cls, loaded_value, value, type_kwargs)
+
+			return loaded_value
+
+		return load_checked
+
+	checked_steps = tuple((type_cls, type_processor, type_kwargs, load, static_output_class(type_processor) if(checked) else None, type_cls not in array_keywords) for type_cls, type_processor, type_kwargs, load, checked in steps)
+
+	def load_chain(value: Any) -> Any:
+		for type_cls, type_processor, type_kwargs, load, output_class, takes_lists in checked_steps:
+			if takes_lists and type(value) is array:
+				value = value.tolist()
+
+			loaded_value = load(value)
+			if output_class is not None and not isinstance(loaded_value, output_class):
+				check_output_type(type_processor, type_cls, loaded_value, value, type_kwargs)
+
+			value = loaded_value
+
+		return value
+
+	return load_chain
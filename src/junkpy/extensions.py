@@ -1,25 +1,164 @@
 from .type_processors import JunkTypeProcessor
 from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import re
+
+try:
+	import numpy
+except ImportError:
+	# NumPy is optional, only JunkNdarrayTypeProcessor requires it
+	numpy = None
+
+
+
+class JunkMagnitudeConversion:
+	"""
+	Conversion between two units of a magnitude, from value * input ratio + input offset in the default unit.
+
+	Attributes:
+		input_ratio (Decimal): Ratio of the input unit to the default unit.
+		output_ratio (Decimal): Ratio of the output unit to the default unit.
+		offset (Decimal): Input offset minus output offset, zero except for units like degrees Celsius.
+		factor (float): Ratio of the input unit to the output unit, used in float mode.
+		shift (float): Offset in output units, used in float mode.
+	"""
+	__slots__ = ("input_ratio", "output_ratio", "offset", "factor", "shift")
+
+
+	def __init__(self, input_unit: Tuple[Decimal, Decimal], output_unit: Tuple[Decimal, Decimal]):
+		self.input_ratio, input_offset = input_unit
+		self.output_ratio, output_offset = output_unit
+		self.offset = input_offset - output_offset
+		self.factor = float(self.input_ratio / self.output_ratio)
+		self.shift = float(self.offset / self.output_ratio)
+
+
+	def convert(self, value: Any, mode: str, decimal_class: Type[Decimal] = Decimal) -> Union[Decimal, float]:
+		if mode == "decimal":
+			if self.offset:
+				return (decimal_class(value) * self.input_ratio + self.offset) / self.output_ratio
+
+			return decimal_class(value) * self.input_ratio / self.output_ratio
+
+		if mode == "float":
+			return float(value) * self.factor + self.shift
+
+		raise ValueError(f"Unsupported mode <{mode}>")
+
+
+	def convert_many(self, values: List[Any], mode: str, decimal_class: Type[Decimal] = Decimal) -> List[Union[Decimal, float]]:
+		if mode == "decimal":
+			input_ratio, output_ratio, offset = self.input_ratio, self.output_ratio, self.offset
+			if offset:
+				return [(decimal_class(value) * input_ratio + offset) / output_ratio for value in values]
+
+			return [decimal_class(value) * input_ratio / output_ratio for value in values]
+
+		if mode == "float":
+			factor, shift = self.factor, self.shift
+			if shift:
+				return [float(value) * factor + shift for value in values]
+
+			return [float(value) * factor for value in values]
+
+		raise ValueError(f"Unsupported mode <{mode}>")
 
 
 
 class JunkBaseMagnitudeTypeProcessor(JunkTypeProcessor):
+	"""
+	Base class of the type processors converting values between units of a magnitude: (distance, input="ft", output="m") 10.
+
+	Values are converted to CLASS, Decimal unless changed by subclasses, or to float with mode="float", and lists of values are converted as a whole into lists.
+	Units missing from UNITS, like a missing input or output, are the default unit. Conversions between every pair of units are computed once per class.
+
+	Attributes:
+		DEFAULT_UNIT (str): The unit of values without input or output modifiers.
+		UNITS (Dict[str, Union[Decimal, Tuple[Decimal, Decimal]]]): Ratio of each lowercase unit to the default unit,
+			or ratio and offset for units whose zero differs, like degrees Celsius to kelvins: value in kelvins = value * ratio + offset.
+	"""
 	CLASS = Decimal
 	KEYWORD = None
+	PURE = True
 	DEFAULT_UNIT = None
 	UNITS = {}
+
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+
+		if cls.DEFAULT_UNIT is not None:
+			cls._CONVERSIONS = _conversion_matrix(cls.UNITS, cls.DEFAULT_UNIT)
 	
 
 	def load(self, value, **kwargs):
-		input = kwargs.get("input")
-		output = kwargs.get("output")
-		input_ratio = self.UNITS.get((input if(input is not None) else self.DEFAULT_UNIT).lower(), self.UNITS[self.DEFAULT_UNIT])
-		output_ratio = self.UNITS.get((output if(output is not None) else self.DEFAULT_UNIT).lower(), self.UNITS[self.DEFAULT_UNIT])
-		
-		return self.CLASS(value) * input_ratio / output_ratio
+		conversion = self._conversion(kwargs.get("input"), kwargs.get("output"))
+
+		if isinstance(value, list):
+			return conversion.convert_many(value, kwargs.get("mode", "decimal"), self.CLASS)
+
+		return conversion.convert(value, kwargs.get("mode", "decimal"), self.CLASS)
+
+
+	def load_many(self, values, **kwargs):
+		if type(self).load is not JunkBaseMagnitudeTypeProcessor.load:
+			return super().load_many(values, **kwargs)
+
+		return self._conversion(kwargs.get("input"), kwargs.get("output")).convert_many(values, kwargs.get("mode", "decimal"), self.CLASS)
+
+
+	def output_class(self, value, **kwargs):
+		if isinstance(value, list):
+			return list
+
+		return float if(kwargs.get("mode") == "float") else self.CLASS
+
+
+	def _conversion(self, input: Optional[str], output: Optional[str]) -> JunkMagnitudeConversion:
+		conversion = self._CONVERSIONS.get((input, output))
+		if conversion is None:
+			# Units in other cases, or unknown units standing for the default one
+			conversion = self._CONVERSIONS[(self._unit(input), self._unit(output))]
+
+		return conversion
+
+
+	def _unit(self, unit: Optional[str]) -> Optional[str]:
+		unit = unit.lower() if(isinstance(unit, str)) else None
+		return unit if(unit in self.UNITS) else None
 		
 	
 	
+def _conversion_matrix(units: Dict[str, Union[Decimal, Tuple[Decimal, Decimal]]], default_unit: str) -> Dict[Tuple[Optional[str], Optional[str]], JunkMagnitudeConversion]:
+	# Conversions by input and output unit, None standing for the default unit
+	unit_ratios = {unit: ratio if(isinstance(ratio, tuple)) else (ratio, Decimal(0)) for unit, ratio in units.items()}
+	unit_ratios[None] = unit_ratios[default_unit]
+
+	return {
+		(input_unit, output_unit): JunkMagnitudeConversion(input_ratio, output_ratio)
+		for input_unit, input_ratio in unit_ratios.items()
+		for output_unit, output_ratio in unit_ratios.items()
+	}
+
+
+def magnitude_type_processor(keyword: str, default_unit: str, units: Dict[str, Union[Decimal, Tuple[Decimal, Decimal]]]) -> Type[JunkBaseMagnitudeTypeProcessor]:
+	"""
+	Creates the type processor of a new magnitude, same as subclassing JunkBaseMagnitudeTypeProcessor.
+	Parsers pickled for process pools need type processors importable by name, so subclasses should be preferred there.
+
+	Args:
+		keyword (str): The type keyword.
+		default_unit (str): The unit of values without input or output modifiers.
+		units (Dict[str, Union[Decimal, Tuple[Decimal, Decimal]]]): Ratio, or ratio and offset, of each lowercase unit to the default unit.
+
+	Returns:
+		Type[JunkBaseMagnitudeTypeProcessor]: The type processor class.
+	"""
+	name = "Junk" + "".join(part.capitalize() for part in re.split(r"[^A-Za-z0-9]+", keyword)) + "TypeProcessor"
+	return type(name, (JunkBaseMagnitudeTypeProcessor,), {"KEYWORD": keyword, "DEFAULT_UNIT": default_unit, "UNITS": dict(units)})
+	
+	
+	
 class JunkMassTypeProcessor(JunkBaseMagnitudeTypeProcessor):
 	KEYWORD = "mass"
 	DEFAULT_UNIT = "g"
@@ -99,10 +238,96 @@ class JunkSpeedTypeProcessor(JunkBaseMagnitudeTypeProcessor):
 		"ft/s": Decimal("0.3048"), # Feet per second
 		"mph": Decimal("0.447040972"), # Miles per hour
 	}
+
+	
+	
+class JunkDurationTypeProcessor(JunkBaseMagnitudeTypeProcessor):
+	KEYWORD = "duration"
+	DEFAULT_UNIT = "s"
+	UNITS = {
+		"ns": Decimal("0.000000001"), # Nanosecond
+		"us": Decimal("0.000001"), # Microsecond
+		"µs": Decimal("0.000001"), # Microsecond
+		"ms": Decimal("0.001"), # Millisecond
+		"s": Decimal(1), # Second
+		"min": Decimal(60), # Minute
+		"h": Decimal(3600), # Hour
+		"d": Decimal(86400), # Day
+		"wk": Decimal(604800), # Week
+	}
+	
+	
+	
+class JunkDataSizeTypeProcessor(JunkBaseMagnitudeTypeProcessor):
+	KEYWORD = "data_size"
+	DEFAULT_UNIT = "b"
+	UNITS = {
+		"bit": Decimal("0.125"), # Bit
+		"b": Decimal(1), # Byte
+		
+		# Decimal
+		"kb": Decimal(1000), # Kilobyte
+		"mb": Decimal(1000 ** 2), # Megabyte
+		"gb": Decimal(1000 ** 3), # Gigabyte
+		"tb": Decimal(1000 ** 4), # Terabyte
+		
+		# Binary
+		"kib": Decimal(1024), # Kibibyte
+		"mib": Decimal(1024 ** 2), # Mebibyte
+		"gib": Decimal(1024 ** 3), # Gibibyte
+		"tib": Decimal(1024 ** 4), # Tebibyte
+	}
+	
+	
+	
+class JunkPressureTypeProcessor(JunkBaseMagnitudeTypeProcessor):
+	KEYWORD = "pressure"
+	DEFAULT_UNIT = "pa"
+	UNITS = {
+		# Metric
+		"pa": Decimal(1), # Pascal
+		"hpa": Decimal(100), # Hectopascal
+		"kpa": Decimal(1000), # Kilopascal
+		"mpa": Decimal(1000000), # Megapascal
+		"mbar": Decimal(100), # Millibar
+		"bar": Decimal(100000), # Bar
+		"atm": Decimal(101325), # Atmosphere
+		"torr": Decimal(101325) / 760, # Torr
+		"mmhg": Decimal("133.322387415"), # Millimeter of mercury
+		
+		# Imperial
+		"psi": Decimal("6894.757293168361"), # Pound per square inch
+	}
 	
 	
+	
+class JunkTemperatureTypeProcessor(JunkBaseMagnitudeTypeProcessor):
+	KEYWORD = "temperature"
+	DEFAULT_UNIT = "k"
+	UNITS = {
+		"k": Decimal(1), # Kelvin
+		"c": (Decimal(1), Decimal("273.15")), # Degree Celsius
+		"f": (Decimal(5) / 9, Decimal("459.67") * 5 / 9), # Degree Fahrenheit
+		"r": Decimal(5) / 9, # Degree Rankine
+	}
+	
+	
+
 
 
+class JunkNdarrayTypeProcessor(JunkTypeProcessor):
+	"""
+	Loads a list of numbers as a NumPy array, of the type given by the dtype modifier: (ndarray, dtype="f4") [...].
+	Requires NumPy, numbers are copied from the array.array built by the scanner backend without creating a Python object per number.
+	"""
+	CLASS = numpy.ndarray if(numpy is not None) else None
+	KEYWORD = "ndarray"
+	SNAPSHOT_SAFE = True
+	NUMERIC_ARRAYS = True
 
 
+	def load(self, value, dtype=None, **kwargs):
+		if numpy is None:
+			raise ImportError(f"NumPy is required by the type processor <{self.KEYWORD}>")
 
+		return numpy.array(value, dtype=dtype)
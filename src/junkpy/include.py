@@ -0,0 +1,376 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Set, Tuple
+if TYPE_CHECKING:
+	from .base import JunkParser
+	from .type_processors import JunkTypeProcessor
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+import copy
+import os
+import re
+import threading
+
+
+
+# Include graph of the top-level load an included file is loaded for, None outside of included files
+INCLUDE_GRAPH: ContextVar[Optional[JunkIncludeGraph]] = ContextVar("junk_include_graph", default=None)
+
+# Include directives with a literal path, prefetched concurrently before the type processors reach them.
+# Comments and strings are matched as well so that the directives they contain are skipped
+_INCLUDE_DIRECTIVE = re.compile(r'#[^\n]*|"(?:[^"\\\n]|\\.)*"|\(\s*"?include"?\s*\)\s*"((?:[^"\\]|\\.)*)"')
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+
+def _get_executor() -> ThreadPoolExecutor:
+	global _EXECUTOR
+
+	if _EXECUTOR is None:
+		with _EXECUTOR_LOCK:
+			if _EXECUTOR is None:
+				_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="junk_include")
+
+	return _EXECUTOR
+
+
+def _fingerprint(file_path: Path) -> Tuple[int, int]:
+	file_stat = os.stat(file_path)
+	return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+
+@dataclass
+class JunkIncludeCacheEntry:
+	"""
+	Result of an included file, reused by later loads while the file and the files it includes are unchanged.
+
+	Attributes:
+		fingerprint (Tuple[int, int]): Modification time and size of the file before it was parsed.
+		data (Any): The parsed data, never returned without being copied.
+		includes (Tuple[Path, ...]): The files it includes.
+		dependencies (FrozenSet[Path]): Every file its data depends on, see JunkMetadata.dependencies.
+	"""
+	fingerprint: Tuple[int, int]
+	data: Any
+	includes: Tuple[Path, ...]
+	dependencies: FrozenSet[Path]
+
+
+
+class JunkIncludeCache:
+	"""
+	Bounded LRU cache of the results of included files, held by the include type processor of a parser and shared by its loads.
+	"""
+
+	def __init__(self, max_entries: int = 256):
+		"""
+		Initializes the include cache.
+
+		Args:
+			max_entries (int): Maximum number of cached files.
+		"""
+		self.max_entries = max_entries
+
+		self._entries: OrderedDict[Path, JunkIncludeCacheEntry] = OrderedDict()
+		self._lock = threading.Lock()
+
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+
+	def get(self, file_path: Path) -> Optional[JunkIncludeCacheEntry]:
+		with self._lock:
+			entry = self._entries.get(file_path)
+			if entry is not None:
+				self._entries.move_to_end(file_path)
+
+			return entry
+
+
+	def put(self, file_path: Path, entry: JunkIncludeCacheEntry):
+		with self._lock:
+			self._entries[file_path] = entry
+			self._entries.move_to_end(file_path)
+
+			# Entries including evicted files are loaded again, as outdated ones
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+
+	def invalidate(self, file_path: Optional[Path] = None):
+		with self._lock:
+			if file_path is None:
+				self._entries.clear()
+
+			else:
+				self._entries.pop(Path(file_path).resolve(), None)
+
+
+
+class _JunkIncludeTask:
+	# Load of an included file, run by whichever thread claims it first: a prefetching worker or a type processor needing it
+	__slots__ = ("file_path", "claimed", "done", "data", "cacheable", "dependencies", "error")
+
+	def __init__(self, file_path: Path):
+		self.file_path = file_path
+		self.claimed = False
+		self.done = threading.Event()
+		self.data = None
+		self.cacheable = True
+		self.dependencies: FrozenSet[Path] = frozenset()
+		self.error: Optional[BaseException] = None
+
+
+
+class JunkIncludeGraph:
+	"""
+	Dependency graph of the files included by a top-level load, in which every distinct file is loaded once.
+
+	Attributes:
+		root (Optional[Path]): The file of the top-level load, None for strings.
+		edges (Dict[Optional[Path], List[Path]]): The files included by each file, in order of inclusion.
+	"""
+
+	def __init__(self, parser: JunkParser, cache: JunkIncludeCache, root: Optional[Path]):
+		self.root = root
+		self.edges: Dict[Optional[Path], List[Path]] = {}
+
+		self._parser = parser
+		self._cache = cache
+		self._tasks: Dict[Path, _JunkIncludeTask] = {}
+		self._valid_entries: Dict[Path, Optional[JunkIncludeCacheEntry]] = {}
+		self._lock = threading.Lock()
+
+
+	@property
+	def files(self) -> Set[Path]:
+		"""
+		Returns:
+			Set[Path]: Every file included, directly or not, by the top-level load.
+		"""
+		with self._lock:
+			return {file_path for includes in self.edges.values() for file_path in includes}
+
+
+	def _path_exists(self, source: Path, target: Optional[Path]) -> Optional[List[Path]]:
+		# Depth-first search of a path of includes, called with the lock held
+		stack = [(source, [source])]
+		visited = set()
+
+		while stack:
+			file_path, path = stack.pop()
+			if file_path == target:
+				return path
+
+			if file_path in visited:
+				continue
+
+			visited.add(file_path)
+			for included_path in self.edges.get(file_path, ()):
+				stack.append((included_path, path + [included_path]))
+
+		return None
+
+
+	def _add_edge(self, source: Optional[Path], target: Path):
+		with self._lock:
+			cycle = [target] if(target == source) else self._path_exists(target, source)
+			if cycle is not None:
+				raise ValueError("Include cycle: " + " -> ".join(str(file_path) for file_path in [source] + cycle))
+
+			includes = self.edges.setdefault(source, [])
+			if target not in includes:
+				includes.append(target)
+
+
+	def _get_task(self, file_path: Path) -> Tuple[_JunkIncludeTask, bool]:
+		with self._lock:
+			task = self._tasks.get(file_path)
+			if task is None:
+				task = self._tasks[file_path] = _JunkIncludeTask(file_path)
+				return task, True
+
+			return task, False
+
+
+	def _claim(self, task: _JunkIncludeTask) -> bool:
+		with self._lock:
+			if task.claimed:
+				return False
+
+			task.claimed = True
+			return True
+
+
+	def prefetch(self, source: Optional[Path], string: str):
+		"""
+		Starts loading the files included with a literal path by a Junk string in background threads, before its type processors need them.
+
+		Args:
+			source (Optional[Path]): The file the string was read from, None for strings.
+			string (str): The Junk string.
+		"""
+		for match in _INCLUDE_DIRECTIVE.finditer(string):
+			if match.group(1) is None:
+				continue
+
+			file_path = resolve_include_path(source, match.group(1))
+			if file_path == source or file_path == self.root:
+				continue
+
+			task, created = self._get_task(file_path)
+
+			if created and file_path.is_file():
+				_get_executor().submit(self._run_claimed, task)
+
+
+	def _run_claimed(self, task: _JunkIncludeTask):
+		if self._claim(task):
+			self._run(task)
+
+
+	def _valid_entry(self, file_path: Path) -> Optional[JunkIncludeCacheEntry]:
+		# Cached entries are only valid while the file and everything it includes are unchanged, which is checked once per top-level load
+		with self._lock:
+			if file_path in self._valid_entries:
+				return self._valid_entries[file_path]
+
+		entry = self._cache.get(file_path)
+		try:
+			if entry is not None and (
+				_fingerprint(file_path) != entry.fingerprint
+				or any(self._valid_entry(included_path) is None for included_path in entry.includes)
+			):
+				entry = None
+
+		except OSError:
+			entry = None
+
+		with self._lock:
+			self._valid_entries[file_path] = entry
+
+		return entry
+
+
+	def _add_cached_edges(self, file_path: Path, entry: JunkIncludeCacheEntry):
+		for included_path in entry.includes:
+			self._add_edge(file_path, included_path)
+			self._add_cached_edges(included_path, self._valid_entry(included_path))
+
+
+	def _run(self, task: _JunkIncludeTask):
+		token = INCLUDE_GRAPH.set(self)
+
+		try:
+			entry = self._valid_entry(task.file_path)
+
+			if entry is not None:
+				self._add_cached_edges(task.file_path, entry)
+				task.data = entry.data
+				task.dependencies = entry.dependencies
+
+			else:
+				fingerprint = _fingerprint(task.file_path)
+				with open(task.file_path, "rt") as opened_fp:
+					string = opened_fp.read()
+
+				self.prefetch(task.file_path, string)
+
+				task.data, metadata = self._parser._load_file_data(task.file_path, string)
+				task.cacheable = metadata.cacheable
+				task.dependencies = frozenset(metadata.dependencies)
+
+				if metadata.cacheable:
+					with self._lock:
+						includes = tuple(self.edges.get(task.file_path, ()))
+
+					self._cache.put(task.file_path, JunkIncludeCacheEntry(fingerprint, copy.deepcopy(task.data), includes, task.dependencies))
+
+		except BaseException as e:
+			task.error = e
+
+		finally:
+			INCLUDE_GRAPH.reset(token)
+			task.done.set()
+
+
+	def include(self, source: Optional[Path], file_path: Path) -> Tuple[Any, bool, FrozenSet[Path]]:
+		"""
+		Returns a copy of the data of an included file, loading it unless another thread already does.
+
+		Args:
+			source (Optional[Path]): The including file, None for strings.
+			file_path (Path): The resolved path of the included file.
+
+		Returns:
+			Tuple[Any, bool, FrozenSet[Path]]: The data of the included file, whether it can be cached, and the files its data depends on.
+		"""
+		self._add_edge(source, file_path)
+
+		task, _ = self._get_task(file_path)
+		if self._claim(task):
+			self._run(task)
+
+		else:
+			task.done.wait()
+
+		if task.error is not None:
+			raise task.error
+
+		return copy.deepcopy(task.data), task.cacheable, task.dependencies
+
+
+
+def resolve_include_path(source: Optional[Path], value: str) -> Path:
+	file_path = Path(os.path.expandvars(value))
+
+	if not file_path.is_absolute() and source is not None:
+		file_path = source.parent / file_path
+
+	return file_path.resolve()
+
+
+def load_include(type_processor: JunkTypeProcessor, cache: JunkIncludeCache, value: Any) -> Any:
+	"""
+	Loads the file included by a typed value.
+
+	Args:
+		type_processor (JunkTypeProcessor): The include type processor.
+		cache (JunkIncludeCache): The results of included files of the parser.
+		value (Any): The path of the included file, relative to the including file or to the working directory for strings.
+
+	Returns:
+		Any: The data of the included file.
+	"""
+	metadata = type_processor.metadata
+	source = metadata.file_path.resolve() if(metadata.file_path is not None) else None
+
+	graph = INCLUDE_GRAPH.get()
+	if graph is None:
+		graph = metadata.includes
+
+		# First include of a top-level load, whose other includes are prefetched from the text being parsed while this one loads
+		if graph is None:
+			graph = metadata.includes = JunkIncludeGraph(type_processor.parser, cache, source)
+
+			if metadata.text is not None:
+				graph.prefetch(source, metadata.text)
+
+	file_path = resolve_include_path(source, str(value))
+	data, cacheable, dependencies = graph.include(source, file_path)
+
+	metadata.dependencies.add(file_path)
+	metadata.dependencies.update(dependencies)
+
+	# Results including files that cannot be cached cannot be cached either
+	if not cacheable:
+		metadata.cacheable = False
+
+	return data
@@ -0,0 +1,373 @@
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from .scanner import _IGNORE, JunkScanner, JunkSyntaxError
+
+
+
+class _JunkSpan:
+	# Parsed value along with the spans of the values it contains, the positions of which are relative to the value so that unchanged spans are reused as they are
+	__slots__ = ("length", "value", "reusable", "keys", "offsets", "children")
+
+	def __init__(self, length: int, value: Any, reusable: bool, keys: Optional[List[str]] = None, offsets: Optional[List[int]] = None, children: Optional[List["_JunkSpan"]] = None):
+		self.length = length
+		self.value = value
+		# Whether the value does not contain typed values whose type processors must run on every load
+		self.reusable = reusable
+		# Keys of the values of dicts, None for lists and other values
+		self.keys = keys
+		self.offsets = offsets
+		self.children = children
+
+
+
+@dataclass
+class JunkIncrementalResult:
+	"""
+	Result of an incremental load, passed to the next one as the previous result.
+
+	Attributes:
+		string (str): The parsed Junk string.
+		data (Any): The parsed Python object, returned by after_parsing and validated if requested.
+		changed (List[Tuple[Union[str, int], ...]]): Key paths of the values that changed since the previous result, () for the whole object.
+			Dicts report their added, removed and changed keys, while lists report their changed items or themselves when their length changed.
+		reparsed (Optional[Tuple[Union[str, int], ...]]): Key path of the container parsed again, () for the whole string, None if nothing was parsed.
+	"""
+	string: str
+	data: Any
+	changed: List[Tuple[Union[str, int], ...]]
+	reparsed: Optional[Tuple[Union[str, int], ...]]
+	root_offset: int = field(default=0, repr=False, compare=False)
+	root: Optional[_JunkSpan] = field(default=None, repr=False, compare=False)
+	type_processors: FrozenSet = field(default=frozenset(), repr=False, compare=False)
+
+
+
+class JunkIncrementalScanner(JunkScanner):
+	"""
+	Scanner recording the span of every value held by a dict or a list, and reusing the values of a previous parse whose text did not change.
+	Typed values are reused along with the results of their type processors, unless those need to run on every load.
+	"""
+
+	def __init__(self, typed_value_parser: Callable[[str, dict, Any], Any], reusable_keywords: FrozenSet[str]):
+		"""
+		Initializes the scanner, used for a single load.
+
+		Args:
+			typed_value_parser (Callable[[str, dict, Any], Any]): Callable receiving the type keyword, its kwargs and the value, returning the processed value.
+			reusable_keywords (FrozenSet[str]): Keywords of the type processors whose results can be reused, see JunkTypeProcessor.PURE.
+		"""
+		super().__init__(self._parse_typed_value)
+		self._load_typed_value = typed_value_parser
+		self._reusable_keywords = reusable_keywords
+		self._not_reusable = 0
+
+		# Edited region of the previous string, between its unchanged prefix and suffix
+		self._prefix = 0
+		self._old_end = 0
+		self._new_end = 0
+		self._delta = 0
+
+
+	def _parse_typed_value(self, type_cls: str, type_kwargs: dict, value: Any) -> Any:
+		if type_cls not in self._reusable_keywords:
+			self._not_reusable += 1
+
+		return self._load_typed_value(type_cls, type_kwargs, value)
+
+
+	def _set_edit(self, old_string: str, new_string: str):
+		if old_string == new_string:
+			# Nothing was edited, every reusable value is reused
+			self._prefix = self._old_end = self._new_end = len(new_string) + 1
+			return
+
+		max_prefix = min(len(old_string), len(new_string))
+		prefix = _common_length(old_string, new_string, 0, 0, max_prefix, 1)
+		suffix = _common_length(old_string, new_string, len(old_string), len(new_string), max_prefix - prefix, -1)
+
+		self._prefix = prefix
+		self._old_end = len(old_string) - suffix
+		self._new_end = len(new_string) - suffix
+		self._delta = self._new_end - self._old_end
+
+
+	def _reusable_span(self, pos: int, old_children: Optional[Dict[int, _JunkSpan]]) -> Tuple[Optional[_JunkSpan], int]:
+		# Returns the previous span starting at the same text as pos along with its previous position
+		if old_children is None:
+			return None, 0
+
+		if pos < self._prefix:
+			old_pos = pos
+
+		elif pos >= self._new_end:
+			old_pos = pos - self._delta
+
+		else:
+			return None, 0
+
+		return old_children.get(old_pos), old_pos
+
+
+	def _scan_span(self, text: str, pos: int, old_children: Optional[Dict[int, _JunkSpan]], allow_typed: bool = True) -> Tuple[Any, int, _JunkSpan]:
+		old_span, old_pos = self._reusable_span(pos, old_children)
+
+		if old_span is not None:
+			# Values are only reused when the character following them did not change either, since it ends numbers and names
+			if old_span.reusable and (old_pos + old_span.length < self._prefix or old_pos >= self._old_end):
+				return old_span.value, pos + old_span.length, old_span
+
+			if old_span.children is None:
+				old_span = None
+
+		char = text[pos:pos + 1]
+		if char == "{" or char == "[":
+			return self._scan_container(text, pos, old_span, old_pos)
+
+		not_reusable = self._not_reusable
+		value, end = self._scan_value(text, pos, allow_typed)
+		return value, end, _JunkSpan(end - pos, value, self._not_reusable == not_reusable)
+
+
+	def _scan_container(self, text: str, start: int, old_span: Optional[_JunkSpan], old_start: int) -> Tuple[Any, int, _JunkSpan]:
+		old_children = None
+		if old_span is not None:
+			old_children = {old_start + offset: child for offset, child in zip(old_span.offsets, old_span.children)}
+
+		if text[start] == "{":
+			return self._scan_span_dict(text, start, old_children)
+
+		return self._scan_span_list(text, start, old_children)
+
+
+	def _scan_span_dict(self, text: str, start: int, old_children: Optional[Dict[int, _JunkSpan]]) -> Tuple[dict, int, _JunkSpan]:
+		pos = _IGNORE.match(text, start + 1).end()
+		result = {}
+		keys = []
+		offsets = []
+		children = []
+
+		if text.startswith("}", pos):
+			return result, pos + 1, _JunkSpan(pos + 1 - start, result, True, keys, offsets, children)
+
+		while True:
+			key, pos = self._scan_name(text, pos)
+			pos = _IGNORE.match(text, pos).end()
+
+			if not text.startswith(":", pos):
+				raise JunkSyntaxError(text, pos, "':'")
+
+			pos = _IGNORE.match(text, pos + 1).end()
+			char = text[pos:pos + 1]
+
+			if char == "," or char == "}":
+				result[key] = None
+
+			else:
+				value_start = pos
+				result[key], pos, span = self._scan_span(text, pos, old_children)
+				keys.append(key)
+				offsets.append(value_start - start)
+				children.append(span)
+
+				pos = _IGNORE.match(text, pos).end()
+				char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("}", pos):
+					break
+
+			elif char == "}":
+				break
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or '}'")
+
+		return result, pos + 1, _JunkSpan(pos + 1 - start, result, all(child.reusable for child in children), keys, offsets, children)
+
+
+	def _scan_span_list(self, text: str, start: int, old_children: Optional[Dict[int, _JunkSpan]]) -> Tuple[list, int, _JunkSpan]:
+		pos = _IGNORE.match(text, start + 1).end()
+		result = []
+		offsets = []
+		children = []
+
+		if text.startswith("]", pos):
+			return result, pos + 1, _JunkSpan(pos + 1 - start, result, True, None, offsets, children)
+
+		while True:
+			value_start = pos
+			value, pos, span = self._scan_span(text, pos, old_children)
+			result.append(value)
+			offsets.append(value_start - start)
+			children.append(span)
+
+			pos = _IGNORE.match(text, pos).end()
+			char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("]", pos):
+					break
+
+			elif char == "]":
+				break
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or ']'")
+
+		return result, pos + 1, _JunkSpan(pos + 1 - start, result, all(child.reusable for child in children), None, offsets, children)
+
+
+	def _scan_document(self, text: str, old_children: Optional[Dict[int, _JunkSpan]]) -> Tuple[int, _JunkSpan]:
+		start = _IGNORE.match(text, 0).end()
+		_, pos, span = self._scan_span(text, start, old_children, False)
+		pos = _IGNORE.match(text, pos).end()
+
+		if pos != len(text):
+			raise JunkSyntaxError(text, pos, "end of input")
+
+		return start, span
+
+
+	def _find_edited_container(self, root_offset: int, root: _JunkSpan) -> List[Tuple[_JunkSpan, int, int]]:
+		# Path of (span, position, index in the parent) from the root to the smallest container whose brackets enclose the edited region
+		path = []
+		span, start, index = root, root_offset, -1
+
+		while span.children is not None and start < self._prefix and self._old_end < start + span.length:
+			path.append((span, start, index))
+
+			index = bisect_right(span.offsets, self._prefix - 1 - start) - 1
+			if index < 0:
+				break
+
+			span, start = span.children[index], start + span.offsets[index]
+
+		return path
+
+
+	def parse_incremental(self, text: str, previous: Optional[JunkIncrementalResult]) -> Tuple[int, _JunkSpan, List[Tuple[Union[str, int], ...]], Optional[Tuple[Union[str, int], ...]]]:
+		"""
+		Parses a Junk string, reparsing only the smallest container enclosing the region edited since the previous result.
+
+		Args:
+			text (str): The Junk string to parse.
+			previous (Optional[JunkIncrementalResult]): The previous result, the string is parsed entirely if None.
+
+		Returns:
+			Tuple[int, _JunkSpan, List[Tuple[Union[str, int], ...]], Optional[Tuple[Union[str, int], ...]]]: The position and span of the parsed value, the changed key paths and the key path of the reparsed container.
+		"""
+		if previous is None or previous.root is None:
+			root_offset, root = self._scan_document(text, None)
+			return root_offset, root, [()], ()
+
+		self._set_edit(previous.string, text)
+		# Typed values that cannot be reused are loaded again wherever they are, by scanning the whole string
+		path = self._find_edited_container(previous.root_offset, previous.root) if(previous.root.reusable) else []
+
+		if path:
+			old_span, start, _ = path[-1]
+			value, end, span = self._scan_container(text, start, old_span, start)
+
+			# The container is only replaced when its closing bracket is still the one ending it
+			if end == start + old_span.length + self._delta:
+				keys = _key_path(path)
+				changed = []
+				_diff(old_span.value, value, keys, changed)
+				return previous.root_offset, _replace_span(path, span, self._delta), changed, keys
+
+		root_offset, root = self._scan_document(text, {previous.root_offset: previous.root})
+		if root is previous.root:
+			return root_offset, root, [], None
+
+		changed = []
+		_diff(previous.root.value, root.value, (), changed)
+		return root_offset, root, changed, ()
+
+
+
+def _common_length(a: str, b: str, a_start: int, b_start: int, max_length: int, step: int) -> int:
+	# Length of the common prefix (step 1) or suffix (step -1) of two strings, comparing blocks of characters before single ones
+	length = 0
+	block = 4096
+
+	while length < max_length:
+		size = min(block, max_length - length)
+		if step > 0:
+			equal = a[a_start + length:a_start + length + size] == b[b_start + length:b_start + length + size]
+
+		else:
+			equal = a[a_start - length - size:a_start - length] == b[b_start - length - size:b_start - length]
+
+		if equal:
+			length += size
+
+		elif size == 1:
+			break
+
+		else:
+			block = 1 if(size <= 64) else 64
+
+	return length
+
+
+def _key_path(path: List[Tuple[_JunkSpan, int, int]]) -> Tuple[Union[str, int], ...]:
+	keys = []
+	for (parent, _, _), (_, _, index) in zip(path, path[1:]):
+		keys.append(parent.keys[index] if(parent.keys is not None) else index)
+
+	return tuple(keys)
+
+
+def _replace_span(path: List[Tuple[_JunkSpan, int, int]], span: _JunkSpan, delta: int) -> _JunkSpan:
+	# Copies the containers enclosing the reparsed one, sharing every other value with the previous result
+	for (parent, _, _), (_, _, index) in zip(reversed(path[:-1]), reversed(path[1:])):
+		children = list(parent.children)
+		children[index] = span
+		offsets = parent.offsets[:index + 1] + [offset + delta for offset in parent.offsets[index + 1:]]
+
+		if parent.keys is not None:
+			value = dict(parent.value)
+			# Values of duplicate keys are overwritten by the last one
+			if parent.keys[index] not in parent.keys[index + 1:]:
+				value[parent.keys[index]] = span.value
+
+		else:
+			value = list(parent.value)
+			value[index] = span.value
+
+		span = _JunkSpan(parent.length + delta, value, all(child.reusable for child in children), parent.keys, offsets, children)
+
+	return span
+
+
+def _diff(old: Any, new: Any, path: Tuple[Union[str, int], ...], changed: List[Tuple[Union[str, int], ...]]):
+	# Values reused from the previous result are identical, so that only reparsed values are compared
+	if old is new:
+		return
+
+	if type(old) is dict and type(new) is dict:
+		for key, value in new.items():
+			if key in old:
+				_diff(old[key], value, path + (key,), changed)
+
+			else:
+				changed.append(path + (key,))
+
+		changed.extend(path + (key,) for key in old if key not in new)
+
+	elif type(old) is list and type(new) is list and len(old) == len(new):
+		for index, (old_value, new_value) in enumerate(zip(old, new)):
+			_diff(old_value, new_value, path + (index,), changed)
+
+	else:
+		try:
+			equal = type(old) is type(new) and bool(old == new)
+
+		except Exception:
+			equal = False
+
+		if not equal:
+			changed.append(path)
@@ -0,0 +1,328 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterator
+if TYPE_CHECKING:
+	from .base import JunkMetadata
+	from .type_processors import JunkTypeProcessor
+
+import copy
+import threading
+
+
+
+_UNRESOLVED = object()
+
+
+
+def _materialized(value: Any) -> Any:
+	return value
+
+
+
+class JunkLazyValue:
+	"""
+	Typed value whose type processor only runs on first access, returned by parsers created with lazy=True.
+
+	The loaded value is cached, and the output type of the type processor is checked when it runs. Comparing, copying or pickling a lazy value materializes it.
+	Lazy values may be shared between threads through result caches, their type processor runs once all the same.
+	"""
+	__slots__ = ("type_processor", "type_cls", "type_kwargs", "value", "metadata", "_loaded_value", "_lock")
+
+
+	def __init__(self, type_processor: JunkTypeProcessor, type_cls: str, type_kwargs: dict, value: Any, metadata: JunkMetadata):
+		"""
+		Initializes the lazy value.
+
+		Args:
+			type_processor (JunkTypeProcessor): The type processor loading the value.
+			type_cls (str): The type keyword.
+			type_kwargs (dict): The type modifiers, which may contain lazy values.
+			value (Any): The parsed value, which may contain lazy values.
+			metadata (JunkMetadata): The metadata of the parsed document, seen by the type processor when it runs.
+		"""
+		self.type_processor = type_processor
+		self.type_cls = type_cls
+		self.type_kwargs = type_kwargs
+		self.value = value
+		self.metadata = metadata
+		self._loaded_value = _UNRESOLVED
+		self._lock = threading.Lock()
+
+
+	@property
+	def resolved(self) -> bool:
+		return self._loaded_value is not _UNRESOLVED
+
+
+	def resolve(self) -> Any:
+		"""
+		Runs the type processor on first call and returns the loaded value.
+
+		Returns:
+			Any: The loaded value.
+		"""
+		if self._loaded_value is _UNRESOLVED:
+			with self._lock:
+				if self._loaded_value is _UNRESOLVED:
+					local_storage = self.type_processor.parser._local_storage
+
+					try:
+						local_storage.push(self.metadata)
+						loaded_value = self.type_processor.parser._load_typed_value(self.type_processor, self.type_cls, resolve_all(self.type_kwargs), resolve_all(self.value))
+
+					finally:
+						local_storage.pop()
+
+					# Release the raw data once loaded
+					self.type_kwargs = self.value = self.metadata = None
+					self._loaded_value = loaded_value
+
+		return self._loaded_value
+
+
+	def __eq__(self, other: Any) -> bool:
+		return self.resolve() == other
+
+
+	__hash__ = None
+
+
+	def __copy__(self) -> Any:
+		return self.resolve()
+
+
+	def __deepcopy__(self, memo: dict) -> Any:
+		return copy.deepcopy(self.resolve(), memo)
+
+
+	def __reduce__(self):
+		return (_materialized, (self.resolve(),))
+
+
+	def __repr__(self) -> str:
+		if self.resolved:
+			return f"JunkLazyValue({self._loaded_value!r})"
+
+		return f"JunkLazyValue(({self.type_cls}) {self.value!r})"
+
+
+
+class JunkLazyDict(dict):
+	"""
+	Dict materializing its lazy values when they are accessed.
+
+	Building a dict from it, with dict(), {**data}, update or |, materializes its values as well.
+	"""
+
+	def __getitem__(self, key: Any) -> Any:
+		value = super().__getitem__(key)
+		if isinstance(value, JunkLazyValue):
+			value = value.resolve()
+			super().__setitem__(key, value)
+
+		return value
+
+
+	def get(self, key: Any, default: Any = None) -> Any:
+		return self[key] if(key in self) else default
+
+
+	def pop(self, key: Any, *default) -> Any:
+		value = super().pop(key, *default)
+		return value.resolve() if(isinstance(value, JunkLazyValue)) else value
+
+
+	def popitem(self) -> tuple:
+		key, value = super().popitem()
+		return key, value.resolve() if(isinstance(value, JunkLazyValue)) else value
+
+
+	def setdefault(self, key: Any, default: Any = None) -> Any:
+		if key not in self:
+			super().__setitem__(key, default)
+
+		return self[key]
+
+
+	def values(self):
+		self.resolve_all(recursive=False)
+		return super().values()
+
+
+	def items(self):
+		self.resolve_all(recursive=False)
+		return super().items()
+
+
+	def __iter__(self) -> Iterator[Any]:
+		# Dicts built from dict subclasses iterating like dicts copy their values directly, this makes them call __getitem__ instead
+		return super().__iter__()
+
+
+	def copy(self) -> JunkLazyDict:
+		copied = JunkLazyDict()
+		dict.update(copied, super().items())
+		return copied
+
+
+	def resolve_all(self, recursive: bool = True) -> JunkLazyDict:
+		"""
+		Materializes every lazy value of the dict.
+
+		Args:
+			recursive (bool): Whether to also materialize the lazy values of nested containers.
+
+		Returns:
+			JunkLazyDict: The dict itself.
+		"""
+		for key, value in super().items():
+			if isinstance(value, JunkLazyValue):
+				super().__setitem__(key, value.resolve())
+
+			elif recursive:
+				resolve_all(value)
+
+		return self
+
+
+
+class JunkLazyList(list):
+	"""
+	List materializing its lazy values when they are accessed.
+
+	Concatenating or repeating it returns a lazy list as well.
+	"""
+
+	def __getitem__(self, index: Any) -> Any:
+		if isinstance(index, slice):
+			return JunkLazyList(super().__getitem__(index))
+
+		value = super().__getitem__(index)
+		if isinstance(value, JunkLazyValue):
+			value = value.resolve()
+			super().__setitem__(index, value)
+
+		return value
+
+
+	def __iter__(self) -> Iterator[Any]:
+		for index in range(len(self)):
+			yield self[index]
+
+
+	def __reversed__(self) -> Iterator[Any]:
+		for index in reversed(range(len(self))):
+			yield self[index]
+
+
+	def pop(self, index: int = -1) -> Any:
+		value = super().pop(index)
+		return value.resolve() if(isinstance(value, JunkLazyValue)) else value
+
+
+	def __add__(self, other: Any) -> JunkLazyList:
+		result = super().__add__(other)
+		return JunkLazyList(result) if(result is not NotImplemented) else result
+
+
+	def __radd__(self, other: Any) -> JunkLazyList:
+		if not isinstance(other, list):
+			return NotImplemented
+
+		return JunkLazyList(list.__add__(other, self))
+
+
+	def __mul__(self, count: Any) -> JunkLazyList:
+		result = super().__mul__(count)
+		return JunkLazyList(result) if(result is not NotImplemented) else result
+
+
+	__rmul__ = __mul__
+
+
+	def copy(self) -> JunkLazyList:
+		return JunkLazyList(super().copy())
+
+
+	def resolve_all(self, recursive: bool = True) -> JunkLazyList:
+		"""
+		Materializes every lazy value of the list.
+
+		Args:
+			recursive (bool): Whether to also materialize the lazy values of nested containers.
+
+		Returns:
+			JunkLazyList: The list itself.
+		"""
+		for index, value in enumerate(super().__iter__()):
+			if isinstance(value, JunkLazyValue):
+				super().__setitem__(index, value.resolve())
+
+			elif recursive:
+				resolve_all(value)
+
+		return self
+
+
+
+def wrap_lazy_containers(data: Any) -> Any:
+	"""
+	Replaces the containers of parsed data directly holding lazy values with their lazy counterparts.
+
+	Args:
+		data (Any): The parsed data.
+
+	Returns:
+		Any: The parsed data, or its lazy counterpart.
+	"""
+	if isinstance(data, dict):
+		has_lazy_values = False
+		for key, value in data.items():
+			if isinstance(value, JunkLazyValue):
+				has_lazy_values = True
+
+			elif isinstance(value, (list, dict)):
+				data[key] = wrap_lazy_containers(value)
+
+		return JunkLazyDict(data) if(has_lazy_values) else data
+
+	elif isinstance(data, list):
+		has_lazy_values = False
+		for index, value in enumerate(data):
+			if isinstance(value, JunkLazyValue):
+				has_lazy_values = True
+
+			elif isinstance(value, (list, dict)):
+				data[index] = wrap_lazy_containers(value)
+
+		return JunkLazyList(data) if(has_lazy_values) else data
+
+	return data
+
+
+def resolve_all(data: Any) -> Any:
+	"""
+	Materializes every lazy value of parsed data, in place for containers.
+
+	Args:
+		data (Any): The parsed data.
+
+	Returns:
+		Any: The materialized data.
+	"""
+	if isinstance(data, JunkLazyValue):
+		return data.resolve()
+
+	elif isinstance(data, (JunkLazyDict, JunkLazyList)):
+		return data.resolve_all()
+
+	elif isinstance(data, dict):
+		for key, value in data.items():
+			if isinstance(value, (JunkLazyValue, list, dict)):
+				data[key] = resolve_all(value)
+
+	elif isinstance(data, list):
+		for index, value in enumerate(data):
+			if isinstance(value, (JunkLazyValue, list, dict)):
+				data[index] = resolve_all(value)
+
+	return data
@@ -0,0 +1,344 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_left
+import functools
+import threading
+import time
+import weakref
+
+
+
+DEFAULT_LOAD_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_TYPE_PROCESSOR_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.01, 0.1)
+
+
+
+class _JunkMetricsShard:
+	# Metrics written by a single thread, so that recording them needs no lock
+	__slots__ = ("counters", "histograms", "thread")
+
+	def __init__(self, thread: Optional[threading.Thread] = None):
+		self.counters: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+		# Bucket counts followed by the sum and the count of the observations
+		self.histograms: Dict[Tuple[str, Tuple[str, ...]], List[float]] = {}
+		self.thread = weakref.ref(thread) if(thread is not None) else None
+
+
+	@property
+	def retired(self) -> bool:
+		# The thread writing the shard ended, so that it can be merged safely
+		thread = self.thread() if(self.thread is not None) else None
+		return self.thread is not None and (thread is None or not thread.is_alive())
+
+
+	def merge(self, other: _JunkMetricsShard):
+		# Copying the dicts of another thread is atomic, while iterating them is not
+		for key, value in dict(other.counters).items():
+			self.counters[key] = self.counters.get(key, 0) + value
+
+		for key, histogram in dict(other.histograms).items():
+			merged = self.histograms.get(key)
+			self.histograms[key] = list(histogram) if(merged is None) else [a + b for a, b in zip(merged, histogram)]
+
+
+
+class JunkMetrics:
+	"""
+	Cumulative, thread-safe metrics of the loads run by the parsers sharing it.
+
+	Every thread records into its own shard without locking, shards being merged when a snapshot is taken.
+	The shards of ended threads are merged into a single one, so that replacing threads does not grow the metrics.
+	Counts loads, failures and latency by entry point, parsed bytes, calls and latency of type processors by keyword, and hits and misses of the caches of the parsers.
+	"""
+
+	def __init__(
+		self,
+		load_buckets: Iterable[float] = DEFAULT_LOAD_BUCKETS,
+		type_processor_buckets: Iterable[float] = DEFAULT_TYPE_PROCESSOR_BUCKETS
+	):
+		"""
+		Initializes the metrics.
+
+		Args:
+			load_buckets (Iterable[float]): Upper bounds of the load latency histogram buckets, in seconds.
+			type_processor_buckets (Iterable[float]): Upper bounds of the type processor latency histogram buckets, in seconds.
+		"""
+		self.load_buckets = tuple(sorted(load_buckets))
+		self.type_processor_buckets = tuple(sorted(type_processor_buckets))
+
+		self._shards: List[_JunkMetricsShard] = []
+		self._retired_shard = _JunkMetricsShard()
+		self._shards_lock = threading.Lock()
+		self._local = threading.local()
+		self._caches: Dict[str, weakref.WeakSet] = {}
+
+
+	def __getstate__(self) -> dict:
+		# Only the configuration is pickled, unpickled metrics start empty
+		return {"load_buckets": self.load_buckets, "type_processor_buckets": self.type_processor_buckets}
+
+
+	def __setstate__(self, state: dict):
+		self.__init__(**state)
+
+
+	def _get_shard(self) -> _JunkMetricsShard:
+		shard = getattr(self._local, "shard", None)
+
+		if shard is None:
+			shard = self._local.shard = _JunkMetricsShard(threading.current_thread())
+			with self._shards_lock:
+				self._retire_shards()
+				self._shards.append(shard)
+
+		return shard
+
+
+	def _retire_shards(self):
+		# Called with the shards lock held
+		shards = []
+		for shard in self._shards:
+			if shard.retired:
+				self._retired_shard.merge(shard)
+
+			else:
+				shards.append(shard)
+
+		self._shards = shards
+
+
+	def _increment(self, name: str, labels: Tuple[str, ...], amount: int = 1):
+		counters = self._get_shard().counters
+		key = (name, labels)
+		counters[key] = counters.get(key, 0) + amount
+
+
+	def _observe(self, name: str, labels: Tuple[str, ...], buckets: Tuple[float, ...], value: float):
+		histograms = self._get_shard().histograms
+		key = (name, labels)
+
+		histogram = histograms.get(key)
+		if histogram is None:
+			histogram = histograms[key] = [0] * (len(buckets) + 3)
+
+		# The last bucket holds the observations above every upper bound
+		histogram[bisect_left(buckets, value)] += 1
+		histogram[-2] += value
+		histogram[-1] += 1
+
+
+	def register_cache(self, name: str, cache: Any):
+		"""
+		Reports the hits and misses of a cache, which must have hits and misses attributes, in the snapshots. Caches are held weakly and registered once.
+
+		Args:
+			name (str): The cache label, "result" for JunkResultCache and "type_memo" for JunkTypeMemo.
+			cache (Any): The cache.
+		"""
+		with self._shards_lock:
+			self._caches.setdefault(name, weakref.WeakSet()).add(cache)
+
+
+	def count_bytes(self, string: str):
+		self._increment("parsed_bytes", (), len(string.encode("utf-8")))
+
+
+	def timed_type_processor(self, keyword: str, func: Callable, *args, **kwargs) -> Any:
+		start = time.perf_counter()
+
+		try:
+			return func(*args, **kwargs)
+
+		finally:
+			self._observe("type_processor_duration", (keyword,), self.type_processor_buckets, time.perf_counter() - start)
+
+
+	def timed_load(self, entry_point: str, func: Callable, *args, **kwargs) -> Any:
+		"""
+		Calls a load method, counting it along with its latency and failures. Loads nested in another load of the same thread, like load_file within load_file_from_env, are only counted once.
+
+		Args:
+			entry_point (str): The name of the load method.
+			func (Callable): The load method.
+
+		Returns:
+			Any: The result of the load method.
+		"""
+		if getattr(self._local, "loading", False):
+			return func(*args, **kwargs)
+
+		self._local.loading = True
+		start = time.perf_counter()
+
+		try:
+			return func(*args, **kwargs)
+
+		except Exception as e:
+			self._increment("load_failures", (entry_point, type(e).__name__))
+			raise
+
+		finally:
+			self._local.loading = False
+			self._increment("loads", (entry_point,))
+			self._observe("load_duration", (entry_point,), self.load_buckets, time.perf_counter() - start)
+
+
+	def snapshot(self) -> dict:
+		"""
+		Merges the metrics recorded by every thread.
+
+		Returns:
+			dict: The metrics, as
+				loads (Dict[str, int]) and load_failures (Dict[str, Dict[str, int]]) by entry point and exception type name,
+				load_duration (Dict[str, dict]) histograms by entry point,
+				parsed_bytes (int),
+				type_processor_duration (Dict[str, dict]) histograms by keyword, whose counts are the type processor calls,
+				and caches (Dict[str, Dict[str, int]]) hits and misses by cache name.
+				Histograms hold their cumulative bucket counts keyed by upper bound, infinity included, along with the sum and count of the observations.
+		"""
+		merged_shard = _JunkMetricsShard()
+
+		with self._shards_lock:
+			self._retire_shards()
+			merged_shard.merge(self._retired_shard)
+			shards = list(self._shards)
+			caches = {name: list(cache_set) for name, cache_set in self._caches.items()}
+
+		for shard in shards:
+			merged_shard.merge(shard)
+
+		counters = merged_shard.counters
+		histograms = merged_shard.histograms
+
+		snapshot = {
+			"loads": {},
+			"load_failures": {},
+			"load_duration": {},
+			"parsed_bytes": counters.get(("parsed_bytes", ()), 0),
+			"type_processor_duration": {},
+			"caches": {
+				name: {
+					"hits": sum(cache.hits for cache in cache_list),
+					"misses": sum(cache.misses for cache in cache_list)
+				}
+				for name, cache_list in caches.items()
+			},
+		}
+
+		for (name, labels), value in counters.items():
+			if name == "loads":
+				snapshot["loads"][labels[0]] = value
+
+			elif name == "load_failures":
+				snapshot["load_failures"].setdefault(labels[0], {})[labels[1]] = value
+
+		for (name, labels), histogram in histograms.items():
+			buckets = self.load_buckets if(name == "load_duration") else self.type_processor_buckets
+			cumulative_counts = []
+			total = 0
+			for count in histogram[:-2]:
+				total += count
+				cumulative_counts.append(total)
+
+			snapshot[name][labels[0]] = {
+				"buckets": dict(zip(buckets + (float("inf"),), cumulative_counts)),
+				"sum": histogram[-2],
+				"count": histogram[-1],
+			}
+
+		return snapshot
+
+
+	def render_prometheus(self, prefix: str = "junkpy") -> str:
+		"""
+		Renders a snapshot of the metrics in the Prometheus text exposition format.
+
+		Args:
+			prefix (str): Prefix of the metric names.
+
+		Returns:
+			str: The metrics.
+		"""
+		snapshot = self.snapshot()
+		lines = []
+
+		def family(name: str, metric_type: str, help_text: str):
+			lines.append(f"# HELP {prefix}_{name} {help_text}")
+			lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+		def sample(name: str, labels: Dict[str, str], value: float):
+			labels_text = ",".join(f'{label}="{_escape_label_value(str(label_value))}"' for label, label_value in labels.items())
+			lines.append(f"{prefix}_{name}{{{labels_text}}} {_format_value(value)}" if(labels_text) else f"{prefix}_{name} {_format_value(value)}")
+
+		def histogram(name: str, label: str, histograms: Dict[str, dict]):
+			for label_value, data in sorted(histograms.items()):
+				for upper_bound, count in data["buckets"].items():
+					sample(f"{name}_bucket", {label: label_value, "le": _format_value(upper_bound)}, count)
+
+				sample(f"{name}_sum", {label: label_value}, data["sum"])
+				sample(f"{name}_count", {label: label_value}, data["count"])
+
+		family("loads_total", "counter", "Junk loads by entry point.")
+		for entry_point, value in sorted(snapshot["loads"].items()):
+			sample("loads_total", {"entry_point": entry_point}, value)
+
+		family("load_failures_total", "counter", "Failed Junk loads by entry point and exception type.")
+		for entry_point, failures in sorted(snapshot["load_failures"].items()):
+			for exception, value in sorted(failures.items()):
+				sample("load_failures_total", {"entry_point": entry_point, "exception": exception}, value)
+
+		family("load_duration_seconds", "histogram", "Duration of Junk loads by entry point.")
+		histogram("load_duration_seconds", "entry_point", snapshot["load_duration"])
+
+		family("parsed_bytes_total", "counter", "Bytes of Junk input parsed.")
+		sample("parsed_bytes_total", {}, snapshot["parsed_bytes"])
+
+		family("type_processor_duration_seconds", "histogram", "Duration of type processor calls by keyword.")
+		histogram("type_processor_duration_seconds", "keyword", snapshot["type_processor_duration"])
+
+		for name, help_text in (("hits", "Cache hits by cache."), ("misses", "Cache misses by cache.")):
+			family(f"cache_{name}_total", "counter", help_text)
+			for cache, values in sorted(snapshot["caches"].items()):
+				sample(f"cache_{name}_total", {"cache": cache}, values[name])
+
+		return "\n".join(lines) + "\n"
+
+
+
+def _escape_label_value(value: str) -> str:
+	return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+	if value == float("inf"):
+		return "+Inf"
+
+	return repr(value) if(isinstance(value, float)) else str(value)
+
+
+def instrumented(entry_point: str) -> Callable[[Callable], Callable]:
+	"""
+	Decorates a load method of JunkParser so that its calls are counted by the metrics of the parser, if any.
+
+	Args:
+		entry_point (str): The name of the load method.
+
+	Returns:
+		Callable[[Callable], Callable]: The decorator.
+	"""
+	def decorator(method: Callable) -> Callable:
+		@functools.wraps(method)
+		def wrapper(self, *args, **kwargs):
+			if self._metrics is None:
+				return method(self, *args, **kwargs)
+
+			return self._metrics.timed_load(entry_point, method, self, *args, **kwargs)
+
+		return wrapper
+
+	return decorator
+
+
+
+# Metrics shared by the parsers created with metrics=True
+DEFAULT_METRICS = JunkMetrics()
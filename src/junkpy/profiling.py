@@ -0,0 +1,196 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, IO, Optional
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from lark import Lark, Token
+import threading
+import time
+
+
+
+# Report collecting the loads running in the current context, None when profiling is disabled
+PROFILE_REPORT: ContextVar[Optional[JunkProfileReport]] = ContextVar("junk_profile_report", default=None)
+
+PHASES = ("read", "before_parsing", "parse", "transform", "type_processors", "after_parsing", "validation")
+
+
+
+@dataclass
+class JunkProcessorProfile:
+	"""
+	Calls of a type processor.
+
+	Attributes:
+		calls (int): Number of calls to its load method. Results served by the type memo are not counted.
+		time (float): Cumulative time of the calls, in seconds.
+	"""
+	calls: int = 0
+	time: float = 0.0
+
+
+
+@dataclass
+class JunkProfileReport:
+	"""
+	Profile of the loads run within a JunkParser.profile block.
+
+	Attributes:
+		loads (int): Number of loads.
+		bytes_read (int): Size of the parsed Junk input, UTF-8 encoded.
+		tokens (int): Number of tokens lexed by the Lark backend, ignoring whitespace and comments.
+		nodes (Dict[str, int]): Number of nodes built by the Lark backend, by grammar rule.
+		parsing_paths (Dict[str, int]): Number of loads by parsing path, see JunkMetadata.parsing_path.
+		phases (Dict[str, float]): Time spent in each phase, in seconds. Phases do not overlap, so nested phases are not counted in the enclosing one:
+			read (reading files), before_parsing and after_parsing (hooks), parse (lexing and parsing), transform (JunkTransformer callbacks),
+			type_processors (type processor load methods) and validation (pydantic validation).
+		processors (Dict[str, JunkProcessorProfile]): Calls of each type processor, by keyword.
+	"""
+	loads: int = 0
+	bytes_read: int = 0
+	tokens: int = 0
+	nodes: Dict[str, int] = field(default_factory=dict)
+	parsing_paths: Dict[str, int] = field(default_factory=dict)
+	phases: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+	processors: Dict[str, JunkProcessorProfile] = field(default_factory=dict)
+
+
+	def __post_init__(self):
+		self._lock = threading.Lock()
+		# Time of the phases nested in the phases running in the current thread
+		self._local = threading.local()
+
+
+	@property
+	def total_time(self) -> float:
+		return sum(self.phases.values())
+
+
+	def as_dict(self) -> dict:
+		report = asdict(self)
+		report["total_time"] = self.total_time
+		return report
+
+
+	def timed(self, phase: str, func: Callable, *args, **kwargs) -> Any:
+		"""
+		Calls a function, adding its time to a phase minus the time of the phases nested in it.
+
+		Args:
+			phase (str): The phase.
+			func (Callable): The function.
+
+		Returns:
+			Any: The result of the function.
+		"""
+		stack = getattr(self._local, "stack", None)
+		if stack is None:
+			stack = self._local.stack = []
+
+		stack.append(0.0)
+		start = time.perf_counter()
+
+		try:
+			return func(*args, **kwargs)
+
+		finally:
+			elapsed = time.perf_counter() - start
+			nested_time = stack.pop()
+			if stack:
+				stack[-1] += elapsed
+
+			with self._lock:
+				self.phases[phase] = self.phases.get(phase, 0.0) + elapsed - nested_time
+
+
+	def timed_type_processor(self, keyword: str, func: Callable, *args, **kwargs) -> Any:
+		start = time.perf_counter()
+
+		try:
+			return self.timed("type_processors", func, *args, **kwargs)
+
+		finally:
+			elapsed = time.perf_counter() - start
+
+			with self._lock:
+				processor_profile = self.processors.get(keyword)
+				if processor_profile is None:
+					processor_profile = self.processors[keyword] = JunkProcessorProfile()
+
+				processor_profile.calls += 1
+				processor_profile.time += elapsed
+
+
+	def count_load(self):
+		with self._lock:
+			self.loads += 1
+
+
+	def count_input(self, string: str, parsing_path: str):
+		with self._lock:
+			self.bytes_read += len(string.encode("utf-8"))
+			self.parsing_paths[parsing_path] = self.parsing_paths.get(parsing_path, 0) + 1
+
+
+	def count_token(self, token: Token) -> Token:
+		with self._lock:
+			self.tokens += 1
+
+		return token
+
+
+	def count_node(self, rule: str):
+		with self._lock:
+			self.nodes[rule] = self.nodes.get(rule, 0) + 1
+
+
+
+def read(opened_fp: IO) -> str:
+	report = PROFILE_REPORT.get()
+	if report is None:
+		return opened_fp.read()
+
+	return report.timed("read", opened_fp.read)
+
+
+def _profiled_callback(rule: str, callback: Callable) -> Callable:
+	def profiled_callback(children):
+		report = PROFILE_REPORT.get()
+		if report is None:
+			return callback(children)
+
+		report.count_node(rule)
+		return report.timed("transform", callback, children)
+
+	return profiled_callback
+
+
+def _count_token(token: Token) -> Token:
+	report = PROFILE_REPORT.get()
+	return report.count_token(token) if(report is not None) else token
+
+
+def profiled_lark_parser(lark_parser: Lark, compiled_grammar: dict, transformer: Any) -> Lark:
+	"""
+	Builds a copy of a Lark parser counting tokens and nodes, and timing transformer callbacks, into the active report.
+	Used instead of the parser only while profiling, so that parsing does not pay for the instrumentation otherwise.
+
+	Args:
+		lark_parser (Lark): The Lark parser to copy.
+		compiled_grammar (dict): The serialized grammar of the parser.
+		transformer (Any): A new transformer, whose callbacks are wrapped in place.
+
+	Returns:
+		Lark: The profiled parser.
+	"""
+	for rule in {rule.origin.name for rule in lark_parser.rules}:
+		callback = getattr(transformer, rule, None)
+		if callback is not None:
+			setattr(transformer, rule, _profiled_callback(rule, callback))
+
+	ignored_terminals = set(lark_parser.lexer_conf.ignore)
+	return Lark._load_from_dict(
+		compiled_grammar["data"],
+		compiled_grammar["memo"],
+		transformer=transformer,
+		lexer_callbacks={terminal.name: _count_token for terminal in lark_parser.terminals if terminal.name not in ignored_terminals}
+	)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Type, Union
+if TYPE_CHECKING:
+	from .base import JunkParser
+
+from types import MappingProxyType
+from .type_processors import JunkTypeProcessor, JunkBaseTypeProcessorMeta
+import threading
+
+
+
+_OVERLAYS_SIZE = 64
+
+
+
+class JunkTypeProcessorRegistry:
+	"""
+	Immutable set of type processor classes by keyword, shared by every parser using it.
+
+	Overlays add or replace type processors without changing the registry they are created from, and are reused for the same classes,
+	so that everything derived from the classes is computed once per registry instead of once per parser.
+
+	Attributes:
+		classes (Mapping[str, Type[JunkTypeProcessor]]): The type processor classes by keyword, in registration order.
+		fingerprint (FrozenSet): Keywords along with their classes, identifying the registry in cache keys.
+		async_keywords (FrozenSet[str]): Keywords of the type processors overriding aload.
+		pure_keywords (FrozenSet[str]): Keywords of the pure type processors, see JunkTypeProcessor.PURE.
+		array_keywords (FrozenSet[str]): Keywords of the type processors accepting numeric arrays, see JunkTypeProcessor.NUMERIC_ARRAYS.
+	"""
+
+	def __init__(self, type_processor_classes: Iterable[Type[JunkTypeProcessor]] = ()):
+		"""
+		Initializes the registry, later classes replacing earlier ones with the same keyword.
+
+		Args:
+			type_processor_classes (Iterable[Type[JunkTypeProcessor]]): The type processor classes.
+		"""
+		classes = {}
+		for type_processor in type_processor_classes:
+			if not (isinstance(type_processor, type) and issubclass(type_processor, JunkTypeProcessor)):
+				raise TypeError(f"Unsupported class type <{type_processor}>'")
+
+			classes[type_processor.KEYWORD] = type_processor
+
+		self.classes = MappingProxyType(classes)
+		self.fingerprint = frozenset(classes.items())
+		self.async_keywords = frozenset(keyword for keyword, type_processor in classes.items() if type_processor.aload is not JunkTypeProcessor.aload)
+		self.pure_keywords = frozenset(keyword for keyword, type_processor in classes.items() if type_processor.PURE)
+		self.array_keywords = frozenset(keyword for keyword, type_processor in classes.items() if type_processor.NUMERIC_ARRAYS)
+
+		self._overlays = {}
+		self._overlays_lock = threading.Lock()
+
+
+	def __reduce__(self):
+		return (JunkTypeProcessorRegistry, (tuple(self.classes.values()),))
+
+
+	def __len__(self) -> int:
+		return len(self.classes)
+
+
+	def __contains__(self, keyword: str) -> bool:
+		return keyword in self.classes
+
+
+	def overlay(self, type_processor_classes: Iterable[Type[JunkTypeProcessor]]) -> JunkTypeProcessorRegistry:
+		"""
+		Returns a registry with the given type processors added to this one, replacing those with the same keywords.
+
+		Args:
+			type_processor_classes (Iterable[Type[JunkTypeProcessor]]): The type processor classes to add.
+
+		Returns:
+			JunkTypeProcessorRegistry: The registry, this one if no classes are given.
+		"""
+		type_processor_classes = tuple(type_processor_classes)
+		if not type_processor_classes:
+			return self
+
+		with self._overlays_lock:
+			registry = self._overlays.get(type_processor_classes)
+			if registry is None:
+				registry = JunkTypeProcessorRegistry((*self.classes.values(), *type_processor_classes))
+
+				if len(self._overlays) >= _OVERLAYS_SIZE:
+					self._overlays.clear()
+
+				self._overlays[type_processor_classes] = registry
+
+		return registry
+
+
+	def instantiate(self, parser: JunkParser) -> Dict[str, JunkTypeProcessor]:
+		"""
+		Creates the type processors of a parser.
+
+		Args:
+			parser (JunkParser): The parser owning the type processors.
+
+		Returns:
+			Dict[str, JunkTypeProcessor]: The type processors by keyword.
+		"""
+		return {keyword: type_processor(parser) for keyword, type_processor in self.classes.items()}
+
+
+
+# Base registry along with the tuple of base classes it was built from, replaced when JunkBaseTypeProcessor subclasses are defined
+_BASE_REGISTRY: Tuple[Tuple[Type[JunkTypeProcessor], ...], Optional[JunkTypeProcessorRegistry]] = ((), None)
+
+
+def base_registry() -> JunkTypeProcessorRegistry:
+	"""
+	Returns the registry of the built-in type processors and of every other JunkBaseTypeProcessor subclass defined so far.
+
+	Returns:
+		JunkTypeProcessorRegistry: The base registry.
+	"""
+	global _BASE_REGISTRY
+
+	base_classes = JunkBaseTypeProcessorMeta.BASE_TYPE_PROCESSOR_CLASSES
+	registered_classes, registry = _BASE_REGISTRY
+
+	if registry is None or registered_classes is not base_classes:
+		registry = JunkTypeProcessorRegistry(base_classes)
+		_BASE_REGISTRY = (base_classes, registry)
+
+	return registry
+
+
+def resolve_registry(type_processors: Optional[Union[JunkTypeProcessorRegistry, Type[JunkTypeProcessor], Iterable[Type[JunkTypeProcessor]]]]) -> JunkTypeProcessorRegistry:
+	"""
+	Returns the registry of a parser given its type_processors argument.
+
+	Args:
+		type_processors (Optional[Union[JunkTypeProcessorRegistry, Type[JunkTypeProcessor], Iterable[Type[JunkTypeProcessor]]]]): A registry used as it is,
+			or type processor classes overlaid on the base registry.
+
+	Returns:
+		JunkTypeProcessorRegistry: The registry.
+	"""
+	if isinstance(type_processors, JunkTypeProcessorRegistry):
+		return type_processors
+
+	if type_processors is None:
+		return base_registry()
+
+	if isinstance(type_processors, type):
+		type_processors = (type_processors,)
+
+	return base_registry().overlay(type_processors)
@@ -0,0 +1,365 @@
+from typing import Any, Callable, FrozenSet, Optional, Tuple
+from array import array
+from lark.exceptions import UnexpectedInput
+import re
+
+
+
+# Terminals of the Junk grammar, mirroring the Lark definitions
+_IGNORE = re.compile(r"(?:[ \t\f\r\n]+|#[^\n]*)*")
+_ESCAPED_STRING = re.compile(r'".*?(?<!\\)(\\\\)*?"')
+_EXTENDED_CNAME = re.compile(r"[_\-A-Za-z][_\-A-Za-z0-9]*")
+_SIGNED_NUMBER = re.compile(r"[+-]?(?:[0-9]+(\.[0-9]*)?|(\.[0-9]+))([eE][+-]?[0-9]+)?")
+_ARRAY_ITEM_END = re.compile(r"(?:[ \t\f\r\n]+|#[^\n]*)*([,\]])")
+
+# Context-free tokenization only used to locate the last token on unexpected end of input
+_ANY_TOKEN = re.compile(r'[ \t\f\r\n]+|#[^\n]*|".*?(?<!\\)(?:\\\\)*?"|[^ \t\f\r\n#"\[\]{}(),:=]+|.', re.DOTALL)
+
+_VALUE_END_CHARS = frozenset(",]})")
+
+
+
+class JunkSyntaxError(UnexpectedInput):
+	"""
+	Raised by the scanner backend when the input is not valid Junk syntax.
+
+	Shares the UnexpectedInput base class and the line, column and pos_in_stream attributes with the errors raised by the Lark backend, pointing to the same position.
+	"""
+
+	def __init__(self, text: str, pos: int, expected: str):
+		if pos < len(text):
+			self.found = repr(text[pos])
+
+		else:
+			self.found = "end of input"
+			pos = 0
+			for token in _ANY_TOKEN.finditer(text):
+				if not token.group().isspace() and not token.group().startswith("#"):
+					pos = token.start()
+
+		self.expected = expected
+		self.message = None
+		self.pos_in_stream = pos
+		self.line = text.count("\n", 0, pos) + 1
+		self.column = pos - text.rfind("\n", 0, pos)
+
+		super().__init__()
+
+
+	@classmethod
+	def from_error(cls, error: UnexpectedInput) -> "JunkSyntaxError":
+		"""
+		Creates a picklable copy of a syntax error raised by any backend, keeping its position and message.
+
+		Args:
+			error (UnexpectedInput): The syntax error to copy.
+
+		Returns:
+			JunkSyntaxError: The copied syntax error.
+		"""
+		syntax_error = cls.__new__(cls)
+		syntax_error.found = None
+		syntax_error.expected = None
+		syntax_error.message = str(error)
+		syntax_error.pos_in_stream = error.pos_in_stream
+		syntax_error.line = error.line
+		syntax_error.column = error.column
+		return syntax_error
+
+
+	def __reduce__(self):
+		return (JunkSyntaxError.__new__, (JunkSyntaxError,), self.__dict__)
+
+
+	def __str__(self):
+		if self.message is not None:
+			return self.message
+
+		return f"Unexpected {self.found} at line {self.line}, column {self.column}. Expected {self.expected}."
+
+
+
+class JunkScanner:
+	"""
+	Single-pass recursive descent parser for the Junk grammar that builds Python objects directly.
+
+	Accepts exactly the same language as the Lark grammar of JunkParser and delegates typed values to the given callable, so both backends return identical results.
+	"""
+
+	def __init__(
+		self,
+		typed_value_parser: Callable[[str, dict, Any], Any],
+		typed_chain_parser: Optional[Callable[[Tuple[Tuple[str, dict], ...], Any], Any]] = None,
+		array_keywords: FrozenSet[str] = frozenset(),
+		numeric_arrays: int = 0
+	):
+		"""
+		Initializes the scanner.
+
+		Args:
+			typed_value_parser (Callable[[str, dict, Any], Any]): Callable receiving the type keyword, its kwargs and the value, returning the processed value.
+			typed_chain_parser (Optional[Callable[[Tuple[Tuple[str, dict], ...], Any], Any]]): Callable receiving the type keywords and kwargs of chained annotations,
+				outermost first, and the value, returning the processed value. Chains are passed link by link to typed_value_parser if None.
+			array_keywords (FrozenSet[str]): Keywords of the type processors receiving lists of numbers as array.array, see JunkTypeProcessor.NUMERIC_ARRAYS.
+			numeric_arrays (int): Minimum length of the lists of integers or of floats returned as array.array, disabled if 0.
+		"""
+		self._typed_value_parser = typed_value_parser
+		self._typed_chain_parser = typed_chain_parser
+		self._array_keywords = array_keywords
+		self._numeric_arrays = numeric_arrays
+
+
+	def parse(self, text: str) -> Any:
+		"""
+		Parses a Junk string and returns the corresponding Python object.
+
+		Args:
+			text (str): The Junk string to parse.
+
+		Returns:
+			Any: The parsed Python object.
+		"""
+		pos = _IGNORE.match(text, 0).end()
+		value, pos = self._scan_value(text, pos, False)
+		pos = _IGNORE.match(text, pos).end()
+
+		if pos != len(text):
+			raise JunkSyntaxError(text, pos, "end of input")
+
+		return value
+
+
+	def _scan_value(self, text: str, pos: int, allow_typed: bool) -> Tuple[Any, int]:
+		char = text[pos:pos + 1]
+
+		if char == '"':
+			match = _ESCAPED_STRING.match(text, pos)
+			if match is None:
+				raise JunkSyntaxError(text, pos, "a value")
+
+			end = match.end()
+			return text[pos + 1:end - 1], end
+
+		elif char == "{":
+			return self._scan_dict(text, _IGNORE.match(text, pos + 1).end())
+
+		elif char == "[":
+			return self._scan_list(text, _IGNORE.match(text, pos + 1).end())
+
+		elif char == "(" and allow_typed:
+			return self._scan_typed_value(text, _IGNORE.match(text, pos + 1).end())
+
+		elif char == "t" and text.startswith("true", pos):
+			return True, pos + 4
+
+		elif char == "f" and text.startswith("false", pos):
+			return False, pos + 5
+
+		elif char == "n" and text.startswith("null", pos):
+			return None, pos + 4
+
+		match = _SIGNED_NUMBER.match(text, pos)
+		if match is None:
+			raise JunkSyntaxError(text, pos, "a value")
+
+		if match.lastindex is None:
+			return int(match.group()), match.end()
+
+		return float(match.group()), match.end()
+
+
+	def _scan_name(self, text: str, pos: int) -> Tuple[str, int]:
+		if text.startswith('"', pos):
+			match = _ESCAPED_STRING.match(text, pos)
+			if match is not None:
+				end = match.end()
+				return text[pos + 1:end - 1], end
+
+		else:
+			match = _EXTENDED_CNAME.match(text, pos)
+			if match is not None:
+				return match.group(), match.end()
+
+		raise JunkSyntaxError(text, pos, "a string or a name")
+
+
+	def _scan_dict(self, text: str, pos: int) -> Tuple[dict, int]:
+		if text.startswith("}", pos):
+			return {}, pos + 1
+
+		result = {}
+		while True:
+			key, pos = self._scan_name(text, pos)
+			pos = _IGNORE.match(text, pos).end()
+
+			if not text.startswith(":", pos):
+				raise JunkSyntaxError(text, pos, "':'")
+
+			pos = _IGNORE.match(text, pos + 1).end()
+			char = text[pos:pos + 1]
+
+			if char == "," or char == "}":
+				result[key] = None
+
+			else:
+				result[key], pos = self._scan_value(text, pos, True)
+				pos = _IGNORE.match(text, pos).end()
+				char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("}", pos):
+					return result, pos + 1
+
+			elif char == "}":
+				return result, pos + 1
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or '}'")
+
+
+	def _scan_list(self, text: str, pos: int) -> Tuple[list, int]:
+		if text.startswith("]", pos):
+			return [], pos + 1
+
+		if self._numeric_arrays:
+			values, end = self._scan_numeric_array(text, pos, False)
+			if values is not None and len(values) >= self._numeric_arrays:
+				return values, end
+
+		result = []
+		append = result.append
+		while True:
+			value, pos = self._scan_value(text, pos, True)
+			append(value)
+			pos = _IGNORE.match(text, pos).end()
+			char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("]", pos):
+					return result, pos + 1
+
+			elif char == "]":
+				return result, pos + 1
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or ']'")
+
+
+	def _scan_typed_value(self, text: str, pos: int) -> Tuple[Any, int]:
+		# Chained annotations are scanned together, so that their type processors can run as a single compiled chain
+		chain = []
+		while True:
+			type_cls, type_kwargs, end = self._scan_annotation(text, pos)
+			chain.append((type_cls, type_kwargs))
+			pos = _IGNORE.match(text, end).end()
+
+			if not text.startswith("(", pos):
+				break
+
+			pos = _IGNORE.match(text, pos + 1).end()
+
+		if pos == len(text):
+			raise JunkSyntaxError(text, pos, "a value")
+
+		if text[pos] in _VALUE_END_CHARS:
+			value = None
+
+		else:
+			value = None
+			if text[pos] == "[" and type_cls in self._array_keywords:
+				value, end = self._scan_numeric_array(text, _IGNORE.match(text, pos + 1).end(), True)
+
+			if value is None:
+				value, end = self._scan_value(text, pos, True)
+
+				if type(value) is array and type_cls not in self._array_keywords:
+					# Other type processors receive lists
+					value = value.tolist()
+
+		# Typed values are only closed by a separator or a bracket, checked before running type processors so that syntax errors win over their errors, like in the Lark backend
+		follow = _IGNORE.match(text, end).end()
+		if follow == len(text) or text[follow] not in _VALUE_END_CHARS:
+			raise JunkSyntaxError(text, follow, "',' or a closing bracket")
+
+		if len(chain) == 1:
+			return self._typed_value_parser(type_cls, type_kwargs, value), end
+
+		if self._typed_chain_parser is not None:
+			return self._typed_chain_parser(tuple(chain), value), end
+
+		for type_cls, type_kwargs in reversed(chain):
+			if type(value) is array and type_cls not in self._array_keywords:
+				value = value.tolist()
+
+			value = self._typed_value_parser(type_cls, type_kwargs, value)
+
+		return value, end
+
+
+	def _scan_annotation(self, text: str, pos: int) -> Tuple[str, dict, int]:
+		type_cls, pos = self._scan_name(text, pos)
+		pos = _IGNORE.match(text, pos).end()
+
+		type_kwargs = {}
+		while not text.startswith(")", pos):
+			if not text.startswith(",", pos):
+				raise JunkSyntaxError(text, pos, "',' or ')'")
+
+			key, pos = self._scan_name(text, _IGNORE.match(text, pos + 1).end())
+			pos = _IGNORE.match(text, pos).end()
+
+			if not text.startswith("=", pos):
+				raise JunkSyntaxError(text, pos, "'='")
+
+			type_kwargs[key], pos = self._scan_value(text, _IGNORE.match(text, pos + 1).end(), True)
+			pos = _IGNORE.match(text, pos).end()
+
+		return type_cls, type_kwargs, pos + 1
+
+
+	def _scan_numeric_array(self, text: str, pos: int, mixed: bool) -> Tuple[Optional[array], int]:
+		# Scans a list of numbers straight into an array, returning None as soon as anything else is found so that it is scanned again as a list
+		values = array("q")
+		append = values.append
+		ints = False
+		floats = False
+
+		while True:
+			match = _SIGNED_NUMBER.match(text, pos)
+			if match is None:
+				return None, pos
+
+			try:
+				if match.lastindex is None:
+					if floats and not mixed:
+						return None, pos
+
+					ints = True
+					append(int(match.group()))
+
+				else:
+					if not floats:
+						if ints and not mixed:
+							return None, pos
+
+						values = array("d", values)
+						append = values.append
+						floats = True
+
+					append(float(match.group()))
+
+			except OverflowError:
+				return None, pos
+
+			match = _ARRAY_ITEM_END.match(text, match.end())
+			if match is None:
+				return None, pos
+
+			if match.group(1) == "]":
+				return values, match.end()
+
+			pos = _IGNORE.match(text, match.end()).end()
+			if text.startswith("]", pos):
+				return values, pos + 1
@@ -0,0 +1,577 @@
+from typing import Annotated, Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+from pydantic import BaseModel, ValidationError
+from pydantic_core import PydanticCustomError, core_schema
+from .scanner import _ESCAPED_STRING, _EXTENDED_CNAME, _IGNORE, _SIGNED_NUMBER, _VALUE_END_CHARS, JunkScanner, JunkSyntaxError
+from .validation import get_type_adapter
+import functools
+import re
+import types
+
+
+
+_CACHE_SIZE = 256
+
+# Model settings that do not change how the data is validated
+_NEUTRAL_MODEL_CONFIG = frozenset((
+	"title", "extra", "populate_by_name", "validate_by_name", "frozen", "arbitrary_types_allowed",
+	"json_schema_extra", "json_schema_mode_override", "protected_namespaces", "defer_build", "from_attributes", "alias_generator"
+))
+
+_ERROR_TYPES = frozenset(get_args(core_schema.ErrorType))
+
+# Runs of scalar list items and dict pairs followed by a comma, skipped in a single match.
+# Tokens are atomic so that backtracking cannot match them differently than the scanner, like a string past its closing quote or a partial comment
+_STRING = rf"(?>{_ESCAPED_STRING.pattern})"
+_SKIPPED = rf"(?>{_IGNORE.pattern})"
+_SCALAR = rf"(?:{_STRING}|true|false|null|(?>{_SIGNED_NUMBER.pattern}))"
+_SKIPPED_ITEMS = re.compile(rf"(?:{_SCALAR}{_SKIPPED},{_SKIPPED})*")
+_SKIPPED_PAIRS = re.compile(rf"(?:(?:{_STRING}|(?>{_EXTENDED_CNAME.pattern})){_SKIPPED}:{_SKIPPED}(?:{_SCALAR}{_SKIPPED})?,{_SKIPPED})*")
+
+
+
+class _JunkSchemaError(Exception):
+	# Raised on invalid values, the key path of which is collected while unwinding the containers holding them
+	def __init__(self, pos: int, errors: List[dict]):
+		super().__init__()
+		self.pos = pos
+		self.errors = errors
+		self.path = []
+
+
+
+class _JunkSchemaNode:
+	# Annotation of a value, with the Python type it may already have to be returned as it is
+	__slots__ = ("annotation", "exact_type")
+
+	def __init__(self, annotation: Any, exact_type: Optional[type] = None):
+		self.annotation = annotation
+		self.exact_type = exact_type
+
+
+	def convert(self, value: Any, pos: int) -> Any:
+		# Converts a value scanned as it is, or returned by a type processor
+		if type(value) is self.exact_type or self.exact_type is object:
+			return value
+
+		try:
+			return get_type_adapter(self.annotation).validate_python(value)
+
+		except ValidationError as e:
+			raise _JunkSchemaError(pos, e.errors(include_url=False))
+
+
+
+class _JunkOptionalSchema(_JunkSchemaNode):
+	__slots__ = ("node",)
+
+	def __init__(self, annotation: Any, node: _JunkSchemaNode):
+		super().__init__(annotation)
+		self.node = node
+
+
+	def convert(self, value: Any, pos: int) -> Any:
+		if value is None:
+			return None
+
+		return self.node.convert(value, pos)
+
+
+
+class _JunkListSchema(_JunkSchemaNode):
+	__slots__ = ("item",)
+
+	def __init__(self, annotation: Any, item: _JunkSchemaNode):
+		super().__init__(annotation)
+		self.item = item
+
+
+
+class _JunkDictSchema(_JunkSchemaNode):
+	__slots__ = ("value",)
+
+	def __init__(self, annotation: Any, value: _JunkSchemaNode):
+		super().__init__(annotation)
+		self.value = value
+
+
+
+class _JunkModelSchema(_JunkSchemaNode):
+	__slots__ = ("_keys",)
+
+	def __init__(self, model: type):
+		super().__init__(model)
+		self._keys = None
+
+
+	@property
+	def keys(self) -> Dict[str, _JunkSchemaNode]:
+		# Annotations of the fields by key, compiled on first use so that models may refer to themselves
+		if self._keys is None:
+			model = self.annotation
+			populate_by_name = model.model_config.get("populate_by_name", False) or model.model_config.get("validate_by_name", False)
+
+			keys = {}
+			for name, field_info in model.model_fields.items():
+				if field_info.metadata:
+					# Constraints are checked when validating the values
+					node = _JunkSchemaNode(Annotated[(field_info.annotation, *field_info.metadata)])
+
+				else:
+					node = compile_schema(field_info.annotation)
+
+				alias = field_info.validation_alias or field_info.alias
+				keys[alias or name] = node
+				if alias is not None and populate_by_name:
+					# Names are ignored by the validator when the alias is also given, so their values are left to it
+					keys[name] = compile_schema(Any)
+
+			self._keys = keys
+
+		return self._keys
+
+
+	def build(self, values: dict, pos: int) -> BaseModel:
+		# Values already have the annotated types, so the validator of the model only fills the defaults, which is faster than doing it in Python
+		try:
+			return self.annotation.__pydantic_validator__.validate_python(values)
+
+		except ValidationError as e:
+			raise _JunkSchemaError(pos, e.errors(include_url=False))
+
+
+
+def _is_plain_model(model: type) -> bool:
+	# Models whose validation only converts the values of their fields, which can be converted while scanning
+	if model.__pydantic_root_model__ or model.__pydantic_custom_init__ or not model.__pydantic_complete__:
+		return False
+
+	config = model.model_config
+	if config.get("extra", "ignore") != "ignore" or any(key not in _NEUTRAL_MODEL_CONFIG and not key.startswith("ser_") for key in config):
+		return False
+
+	decorators = model.__pydantic_decorators__
+	if decorators.validators or decorators.field_validators or decorators.root_validators or decorators.model_validators:
+		return False
+
+	return all(
+		(field_info.validation_alias is None or isinstance(field_info.validation_alias, str)) and field_info.discriminator is None
+		for field_info in model.model_fields.values()
+	)
+
+
+def _compile_schema(annotation: Any) -> _JunkSchemaNode:
+	if annotation is Any or annotation is object:
+		return _JunkSchemaNode(annotation, object)
+
+	origin = get_origin(annotation)
+	args = get_args(annotation)
+
+	if origin is Union or origin is types.UnionType:
+		not_none = [arg for arg in args if arg is not type(None)]
+		if len(not_none) == 1 and len(args) == 2:
+			return _JunkOptionalSchema(annotation, compile_schema(not_none[0]))
+
+	elif origin is list or annotation is list:
+		return _JunkListSchema(annotation, compile_schema(args[0] if(args) else Any))
+
+	elif origin is dict or annotation is dict:
+		if not args or args[0] is str or args[0] is Any:
+			return _JunkDictSchema(annotation, compile_schema(args[1] if(args) else Any))
+
+	elif origin is None and isinstance(annotation, type):
+		if issubclass(annotation, BaseModel) and _is_plain_model(annotation):
+			return _JunkModelSchema(annotation)
+
+		return _JunkSchemaNode(annotation, annotation)
+
+	return _JunkSchemaNode(annotation)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _cached_schema(annotation: Any) -> _JunkSchemaNode:
+	return _compile_schema(annotation)
+
+
+def compile_schema(annotation: Any) -> _JunkSchemaNode:
+	"""
+	Returns the schema directing the scanner to the values of an annotation, compiled once per annotation.
+
+	Args:
+		annotation (Any): The pydantic model, or any type supported by TypeAdapter.
+
+	Returns:
+		_JunkSchemaNode: The compiled schema.
+	"""
+	try:
+		return _cached_schema(annotation)
+
+	except TypeError:
+		# Unhashable annotations are not cached
+		return _compile_schema(annotation)
+
+
+def _validation_error(annotation: Any, error: _JunkSchemaError, text: str) -> ValidationError:
+	line = text.count("\n", 0, error.pos) + 1
+	column = error.pos - text.rfind("\n", 0, error.pos)
+	title = annotation.__name__ if(isinstance(annotation, type)) else repr(annotation)
+	path = tuple(reversed(error.path))
+
+	line_errors = []
+	for line_error in error.errors:
+		error_type = line_error["type"]
+		if error_type not in _ERROR_TYPES:
+			# Raised by custom validators
+			error_type = PydanticCustomError(error_type, line_error["msg"])
+
+		line_errors.append({"type": error_type, "loc": path + tuple(line_error["loc"]), "input": line_error["input"]})
+		if "ctx" in line_error and isinstance(error_type, str):
+			line_errors[-1]["ctx"] = line_error["ctx"]
+
+	return ValidationError.from_exception_data(f"{title} at line {line}, column {column}", line_errors)
+
+
+
+class JunkSchemaScanner(JunkScanner):
+	"""
+	Scanner directed by the annotations of a pydantic model, building the model while parsing instead of validating the parsed data afterwards.
+
+	Plain models, without validators nor settings changing their validation, are built as soon as their dict is scanned, from values converted
+	to the annotated types as they are scanned. Keys unknown to these models are skipped without building their values nor running their type
+	processors, and other models are validated as usual from their parsed data.
+	"""
+
+	def parse_to(self, text: str, validate_to: Any) -> Any:
+		"""
+		Parses a Junk string to a pydantic model.
+
+		Args:
+			text (str): The Junk string to parse.
+			validate_to (Any): The pydantic model, or any type supported by TypeAdapter.
+
+		Returns:
+			Any: The validated object.
+
+		Raises:
+			ValidationError: If the data is invalid, pointing to the line and column of the first invalid value.
+		"""
+		pos = _IGNORE.match(text, 0).end()
+
+		try:
+			value, pos = self._scan_node(text, pos, False, compile_schema(validate_to))
+
+		except _JunkSchemaError as e:
+			# Syntax errors take precedence, as they would have been raised before validating the parsed data
+			self._check_syntax(text)
+			raise _validation_error(validate_to, e, text) from None
+
+		pos = _IGNORE.match(text, pos).end()
+
+		if pos != len(text):
+			raise JunkSyntaxError(text, pos, "end of input")
+
+		return value
+
+
+	def _check_syntax(self, text: str):
+		pos = self._skip_value(text, _IGNORE.match(text, 0).end(), False)
+		pos = _IGNORE.match(text, pos).end()
+
+		if pos != len(text):
+			raise JunkSyntaxError(text, pos, "end of input")
+
+
+	def _scan_node(self, text: str, pos: int, allow_typed: bool, node: _JunkSchemaNode) -> Tuple[Any, int]:
+		char = text[pos:pos + 1]
+		node_type = type(node)
+
+		if char == "(" and allow_typed:
+			value, end = self._scan_typed_value(text, _IGNORE.match(text, pos + 1).end())
+			return node.convert(value, pos), end
+
+		elif node_type is _JunkSchemaNode:
+			value, end = self._scan_value(text, pos, False)
+			if type(value) is node.exact_type:
+				return value, end
+
+			return node.convert(value, pos), end
+
+		elif node_type is _JunkModelSchema and char == "{":
+			return self._scan_model(text, pos, node)
+
+		elif node_type is _JunkListSchema and char == "[":
+			return self._scan_list_node(text, pos, node)
+
+		elif node_type is _JunkDictSchema and char == "{":
+			return self._scan_dict_node(text, pos, node)
+
+		elif node_type is _JunkOptionalSchema and not text.startswith("null", pos):
+			return self._scan_node(text, pos, allow_typed, node.node)
+
+		value, end = self._scan_value(text, pos, False)
+		return node.convert(value, pos), end
+
+
+	def _scan_model(self, text: str, pos: int, node: _JunkModelSchema) -> Tuple[BaseModel, int]:
+		start = pos
+		pos = _IGNORE.match(text, pos + 1).end()
+
+		if text.startswith("}", pos):
+			return node.build({}, start), pos + 1
+
+		keys = node.keys
+		values = {}
+		while True:
+			key, pos = self._scan_name(text, pos)
+			pos = _IGNORE.match(text, pos).end()
+
+			if not text.startswith(":", pos):
+				raise JunkSyntaxError(text, pos, "':'")
+
+			pos = _IGNORE.match(text, pos + 1).end()
+			char = text[pos:pos + 1]
+			field_node = keys.get(key)
+
+			if char == "," or char == "}":
+				if field_node is not None:
+					try:
+						values[key] = field_node.convert(None, pos)
+
+					except _JunkSchemaError as e:
+						e.path.append(key)
+						raise
+
+			else:
+				if field_node is None:
+					pos = self._skip_value(text, pos, True)
+
+				else:
+					try:
+						# Values without nested annotations are scanned inline, as they make up most of the data
+						if type(field_node) is _JunkSchemaNode and char != "(":
+							value, end = self._scan_value(text, pos, False)
+							values[key] = value if(type(value) is field_node.exact_type) else field_node.convert(value, pos)
+							pos = end
+
+						else:
+							values[key], pos = self._scan_node(text, pos, True, field_node)
+
+					except _JunkSchemaError as e:
+						e.path.append(key)
+						raise
+
+				pos = _IGNORE.match(text, pos).end()
+				char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("}", pos):
+					return node.build(values, start), pos + 1
+
+			elif char == "}":
+				return node.build(values, start), pos + 1
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or '}'")
+
+
+	def _scan_list_node(self, text: str, pos: int, node: _JunkListSchema) -> Tuple[list, int]:
+		pos = _IGNORE.match(text, pos + 1).end()
+
+		if text.startswith("]", pos):
+			return [], pos + 1
+
+		item = node.item
+		inline = type(item) is _JunkSchemaNode
+		result = []
+		append = result.append
+		while True:
+			try:
+				if inline and not text.startswith("(", pos):
+					value, end = self._scan_value(text, pos, False)
+					if type(value) is not item.exact_type:
+						value = item.convert(value, pos)
+
+					pos = end
+
+				else:
+					value, pos = self._scan_node(text, pos, True, item)
+
+			except _JunkSchemaError as e:
+				e.path.append(len(result))
+				raise
+
+			append(value)
+			pos = _IGNORE.match(text, pos).end()
+			char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("]", pos):
+					return result, pos + 1
+
+			elif char == "]":
+				return result, pos + 1
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or ']'")
+
+
+	def _scan_dict_node(self, text: str, pos: int, node: _JunkDictSchema) -> Tuple[dict, int]:
+		pos = _IGNORE.match(text, pos + 1).end()
+
+		if text.startswith("}", pos):
+			return {}, pos + 1
+
+		value_node = node.value
+		result = {}
+		while True:
+			key, pos = self._scan_name(text, pos)
+			pos = _IGNORE.match(text, pos).end()
+
+			if not text.startswith(":", pos):
+				raise JunkSyntaxError(text, pos, "':'")
+
+			pos = _IGNORE.match(text, pos + 1).end()
+			char = text[pos:pos + 1]
+
+			if char == "," or char == "}":
+				try:
+					result[key] = value_node.convert(None, pos)
+
+				except _JunkSchemaError as e:
+					e.path.append(key)
+					raise
+
+			else:
+				try:
+					result[key], pos = self._scan_node(text, pos, True, value_node)
+
+				except _JunkSchemaError as e:
+					e.path.append(key)
+					raise
+
+				pos = _IGNORE.match(text, pos).end()
+				char = text[pos:pos + 1]
+
+			if char == ",":
+				pos = _IGNORE.match(text, pos + 1).end()
+				if text.startswith("}", pos):
+					return result, pos + 1
+
+			elif char == "}":
+				return result, pos + 1
+
+			else:
+				raise JunkSyntaxError(text, pos, "',' or '}'")
+
+
+	def _skip_value(self, text: str, pos: int, allow_typed: bool) -> int:
+		# Checks the syntax of a value without building it, returning its end position
+		char = text[pos:pos + 1]
+
+		if char == '"':
+			match = _ESCAPED_STRING.match(text, pos)
+			if match is None:
+				raise JunkSyntaxError(text, pos, "a value")
+
+			return match.end()
+
+		elif char == "{":
+			pos = _IGNORE.match(text, pos + 1).end()
+			if text.startswith("}", pos):
+				return pos + 1
+
+			while True:
+				pos = _SKIPPED_PAIRS.match(text, pos).end()
+				if text.startswith("}", pos):
+					return pos + 1
+
+				_, pos = self._scan_name(text, pos)
+				pos = _IGNORE.match(text, pos).end()
+
+				if not text.startswith(":", pos):
+					raise JunkSyntaxError(text, pos, "':'")
+
+				pos = _IGNORE.match(text, pos + 1).end()
+				char = text[pos:pos + 1]
+
+				if char != "," and char != "}":
+					pos = _IGNORE.match(text, self._skip_value(text, pos, True)).end()
+					char = text[pos:pos + 1]
+
+				if char == ",":
+					pos = _IGNORE.match(text, pos + 1).end()
+					if text.startswith("}", pos):
+						return pos + 1
+
+				elif char == "}":
+					return pos + 1
+
+				else:
+					raise JunkSyntaxError(text, pos, "',' or '}'")
+
+		elif char == "[":
+			pos = _IGNORE.match(text, pos + 1).end()
+			if text.startswith("]", pos):
+				return pos + 1
+
+			while True:
+				pos = _SKIPPED_ITEMS.match(text, pos).end()
+				if text.startswith("]", pos):
+					return pos + 1
+
+				pos = _IGNORE.match(text, self._skip_value(text, pos, True)).end()
+				char = text[pos:pos + 1]
+
+				if char == ",":
+					pos = _IGNORE.match(text, pos + 1).end()
+					if text.startswith("]", pos):
+						return pos + 1
+
+				elif char == "]":
+					return pos + 1
+
+				else:
+					raise JunkSyntaxError(text, pos, "',' or ']'")
+
+		elif char == "(" and allow_typed:
+			_, pos = self._scan_name(text, _IGNORE.match(text, pos + 1).end())
+			pos = _IGNORE.match(text, pos).end()
+
+			while not text.startswith(")", pos):
+				if not text.startswith(",", pos):
+					raise JunkSyntaxError(text, pos, "',' or ')'")
+
+				_, pos = self._scan_name(text, _IGNORE.match(text, pos + 1).end())
+				pos = _IGNORE.match(text, pos).end()
+
+				if not text.startswith("=", pos):
+					raise JunkSyntaxError(text, pos, "'='")
+
+				pos = _IGNORE.match(text, self._skip_value(text, _IGNORE.match(text, pos + 1).end(), True)).end()
+
+			end = pos + 1
+			pos = _IGNORE.match(text, end).end()
+
+			if pos == len(text):
+				raise JunkSyntaxError(text, pos, "a value")
+
+			if text[pos] in _VALUE_END_CHARS:
+				return end
+
+			return self._skip_value(text, pos, True)
+
+		elif char == "t" and text.startswith("true", pos):
+			return pos + 4
+
+		elif char == "f" and text.startswith("false", pos):
+			return pos + 5
+
+		elif char == "n" and text.startswith("null", pos):
+			return pos + 4
+
+		match = _SIGNED_NUMBER.match(text, pos)
+		if match is None:
+			raise JunkSyntaxError(text, pos, "a value")
+
+		return match.end()
@@ -0,0 +1,366 @@
+from typing import IO, Any, Dict, Iterator, Optional, Tuple, Union
+from .type_processors import JunkTypeProcessor
+import json
+import math
+import re
+
+
+
+# Junk strings are never unescaped, so a quote must follow an odd number of backslashes and no newline is allowed
+_REPRESENTABLE_STRING = re.compile(r'(?:[^"\\\n]|\\[^\n])*')
+
+_WRITE_BUFFER_SIZE = 65536
+
+# Subtrees of JSON types only are encoded at once up to this number of values, larger ones being streamed
+_JSON_SUBTREE_SIZE = 1024
+_JSON_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+_JSON_CONTAINER_TYPES = frozenset((dict, list, tuple))
+_CHUNK_PARTS = 1024
+
+
+
+class _NotJSON(Exception):
+	pass
+
+
+
+def _reject_non_json(obj: Any):
+	raise _NotJSON()
+
+
+
+def dump_type_processors(type_processors_keyword_dict: Dict[str, JunkTypeProcessor]) -> Dict[type, Tuple[str, JunkTypeProcessor]]:
+	"""
+	Maps output classes to the type processors able to dump them, the first registered type processor winning for classes shared by several of them.
+
+	Args:
+		type_processors_keyword_dict (Dict[str, JunkTypeProcessor]): The type processors of a parser, by keyword.
+
+	Returns:
+		Dict[type, Tuple[str, JunkTypeProcessor]]: The keyword and type processor dumping every class.
+	"""
+	dump_processors = {}
+	for keyword, type_processor in type_processors_keyword_dict.items():
+		if type(type_processor).dump is not JunkTypeProcessor.dump and isinstance(type_processor.CLASS, type):
+			dump_processors.setdefault(type_processor.CLASS, (keyword, type_processor))
+
+	return dump_processors
+
+
+
+class JunkEncoder:
+	"""
+	Serializes Python objects to Junk text, chunk by chunk.
+
+	Objects matching the CLASS of a type processor defining dump are written as typed values. Since JSON without escape sequences is valid Junk, the standard library JSON encoder writes whole documents made of JSON types only at once,
+	and otherwise small subtrees made of JSON types only, other containers being written element by element.
+	"""
+
+	def __init__(self, dump_processors: Dict[type, Tuple[str, JunkTypeProcessor]], indent: Optional[Union[int, str]] = None):
+		"""
+		Initializes the encoder.
+
+		Args:
+			dump_processors (Dict[type, Tuple[str, JunkTypeProcessor]]): The type processors dumping every class, see dump_type_processors.
+			indent (Optional[Union[int, str]]): Indentation of nested values, either a number of spaces or a string. Values are written on a single line if None.
+		"""
+		self._dump_processors = dump_processors
+		self._type_dump_processors = {}
+		self._indent = " " * indent if(isinstance(indent, int)) else indent
+		self._item_separator = "," if(indent is not None) else ", "
+
+		self._json_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, indent=indent, default=_reject_non_json)
+		# The JSON encoder would write subclasses of JSON types without their type processors
+		self._json_fast_path = not any(issubclass(cls, (str, int, float, dict, list, tuple)) for cls in dump_processors)
+		self._markers = set()
+
+
+	def encode(self, obj: Any) -> str:
+		"""
+		Serializes a Python object.
+
+		Args:
+			obj (Any): The object to serialize.
+
+		Returns:
+			str: The Junk text.
+		"""
+		return "".join(self.iterencode(obj, True))
+
+
+	def dump(self, obj: Any, fp: IO):
+		"""
+		Serializes a Python object to a file-like object, writing buffered chunks.
+
+		Args:
+			obj (Any): The object to serialize.
+			fp (file-like): The file-like object to write to.
+		"""
+		chunks = []
+		chunks_size = 0
+
+		for chunk in self.iterencode(obj, False):
+			chunks.append(chunk)
+			chunks_size += len(chunk)
+
+			if chunks_size >= _WRITE_BUFFER_SIZE:
+				fp.write("".join(chunks))
+				chunks.clear()
+				chunks_size = 0
+
+		fp.write("".join(chunks))
+
+
+	def iterencode(self, obj: Any, one_shot: bool = False) -> Iterator[str]:
+		"""
+		Serializes a Python object chunk by chunk.
+
+		Args:
+			obj (Any): The object to serialize.
+			one_shot (bool): Whether the top-level container may be encoded at once by the JSON encoder, keeping the whole text in memory.
+
+		Returns:
+			Iterator[str]: The chunks of Junk text.
+		"""
+		if self._get_dump_processor(type(obj)) is not None:
+			raise ValueError(f"Typed values are not allowed at the top level: {type(obj)}")
+
+		if one_shot and self._json_fast_path and isinstance(obj, (dict, list, tuple)):
+			# The JSON encoder stops at the first object of another type, so a failed attempt costs at most one pass over the data
+			text = self._encode_json(obj, 0)
+			if text is not None:
+				yield text
+				return
+
+		yield from self._iterencode(obj, 0)
+
+
+	def _get_dump_processor(self, cls: type) -> Optional[Tuple[str, JunkTypeProcessor]]:
+		try:
+			return self._type_dump_processors[cls]
+
+		except KeyError:
+			dump_processor = next((self._dump_processors[base] for base in cls.__mro__ if base in self._dump_processors), None)
+			self._type_dump_processors[cls] = dump_processor
+			return dump_processor
+
+
+	def _iterencode(self, obj: Any, level: int) -> Iterator[str]:
+		text = self._encode_scalar(obj)
+		if text is not None:
+			yield text
+			return
+
+		dump_processor = self._get_dump_processor(type(obj))
+
+		if dump_processor is not None:
+			keyword, type_processor = dump_processor
+			dumped_obj = type_processor.dump(obj)
+			text = self._encode_scalar(dumped_obj)
+
+			if text is not None:
+				yield f"({keyword}) {text}"
+
+			else:
+				yield f"({keyword}) "
+				yield from self._iterencode(dumped_obj, level)
+
+		elif isinstance(obj, (dict, list, tuple)):
+			text = self._encode_json_subtree(obj, level)
+
+			if text is not None:
+				yield text
+
+			else:
+				yield from self._iterencode_container(obj, level)
+
+		elif isinstance(obj, str):
+			yield self._encode_string(str(obj))
+
+		elif isinstance(obj, int):
+			yield int.__repr__(obj)
+
+		elif isinstance(obj, float):
+			yield self._encode_float(obj)
+
+		else:
+			raise TypeError(f"Object of type {type(obj).__name__} is not Junk serializable")
+
+
+	def _encode_scalar(self, obj: Any) -> Optional[str]:
+		# Encodes the values of JSON types other than containers, returning None for other objects
+		obj_type = type(obj)
+
+		if obj_type is str:
+			return self._encode_string(obj)
+
+		elif obj is None:
+			return "null"
+
+		elif obj is True:
+			return "true"
+
+		elif obj is False:
+			return "false"
+
+		elif obj_type is int:
+			return int.__repr__(obj)
+
+		elif obj_type is float:
+			return self._encode_float(obj)
+
+		return None
+
+
+	def _encode_json(self, obj: Union[dict, list, tuple], level: int) -> Optional[str]:
+		try:
+			text = self._json_encoder.encode(obj)
+
+		except (_NotJSON, ValueError, RecursionError):
+			return None
+
+		if "\\" in text:
+			return None
+
+		if self._indent is not None and level:
+			return text.replace("\n", "\n" + self._indent * level)
+
+		return text
+
+
+	def _encode_json_subtree(self, obj: Union[dict, list, tuple], level: int) -> Optional[str]:
+		# Encodes small subtrees made of JSON types only at once, checking their types first so that other subtrees are not encoded twice
+		if not self._json_fast_path:
+			return None
+
+		budget = _JSON_SUBTREE_SIZE
+		containers = [obj]
+
+		while containers:
+			container = containers.pop()
+			container_type = type(container)
+
+			budget -= len(container)
+			if budget < 0 or container_type not in _JSON_CONTAINER_TYPES:
+				return None
+
+			if container_type is dict:
+				if not all(type(key) is str for key in container):
+					return None
+
+				values = container.values()
+
+			else:
+				values = container
+
+			for value in values:
+				value_type = type(value)
+
+				if value_type in _JSON_CONTAINER_TYPES:
+					containers.append(value)
+
+				elif value_type not in _JSON_SCALAR_TYPES:
+					return None
+
+		return self._encode_json(obj, level)
+
+
+	def _iterencode_container(self, obj: Union[dict, list, tuple], level: int) -> Iterator[str]:
+		if not obj:
+			yield "{}" if(isinstance(obj, dict)) else "[]"
+			return
+
+		marker = id(obj)
+		if marker in self._markers:
+			raise ValueError("Circular reference detected")
+
+		self._markers.add(marker)
+
+		if self._indent is not None:
+			item_separator = self._item_separator + "\n" + self._indent * (level + 1)
+			first_separator = "\n" + self._indent * (level + 1)
+			last_separator = "\n" + self._indent * level
+
+		else:
+			item_separator = self._item_separator
+			first_separator = last_separator = ""
+
+		is_dict = isinstance(obj, dict)
+		# Values encoded at once are joined into chunks, written before nested containers and at least every _CHUNK_PARTS values
+		parts = ["{" + first_separator if(is_dict) else "[" + first_separator]
+
+		for index, item in enumerate(obj.items() if(is_dict) else obj):
+			if index:
+				parts.append(item_separator)
+
+			if is_dict:
+				key, value = item
+				parts.append(self._encode_key(key) + ": ")
+
+			else:
+				value = item
+
+			text = self._encode_scalar(value)
+			is_container = text is None and self._json_fast_path and type(value) in _JSON_CONTAINER_TYPES
+
+			if is_container:
+				text = self._encode_json_subtree(value, level + 1)
+
+			if text is not None:
+				parts.append(text)
+
+				if len(parts) >= _CHUNK_PARTS:
+					yield "".join(parts)
+					parts = []
+
+			else:
+				yield "".join(parts)
+				parts = []
+
+				if is_container:
+					yield from self._iterencode_container(value, level + 1)
+
+				else:
+					yield from self._iterencode(value, level + 1)
+
+		parts.append(last_separator + "}" if(is_dict) else last_separator + "]")
+		yield "".join(parts)
+
+		self._markers.remove(marker)
+
+
+	def _encode_key(self, key: Any) -> str:
+		# Keys are converted like the standard library JSON encoder does
+		if isinstance(key, str):
+			return self._encode_string(key)
+
+		elif key is True:
+			return '"true"'
+
+		elif key is False:
+			return '"false"'
+
+		elif key is None:
+			return '"null"'
+
+		elif isinstance(key, int):
+			return f'"{int.__repr__(key)}"'
+
+		elif isinstance(key, float):
+			return f'"{self._encode_float(key)}"'
+
+		raise TypeError(f"Keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+	def _encode_string(self, string: str) -> str:
+		if ('"' in string or "\\" in string or "\n" in string) and _REPRESENTABLE_STRING.fullmatch(string) is None:
+			raise ValueError(f"String cannot be represented in Junk, which keeps escape sequences as written: {string!r}")
+
+		return '"' + string + '"'
+
+
+	def _encode_float(self, number: float) -> str:
+		if not math.isfinite(number):
+			raise ValueError(f"Out of range float values are not Junk compliant: {number}")
+
+		return float.__repr__(number)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+if TYPE_CHECKING:
+	from .base import JunkParser
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import os
+import pickle
+import secrets
+
+
+
+SNAPSHOT_MAGIC = b"JUNKSNAP"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".junkc"
+
+# Typed values left unprocessed by the compilation running in the current context, None when not compiling
+SNAPSHOT_VALUES: ContextVar[Optional[List[JunkSnapshotValue]]] = ContextVar("junk_snapshot_values", default=None)
+
+
+
+@dataclass
+class JunkSnapshotValue:
+	"""
+	Typed value stored unprocessed in a snapshot, since its type processor is not snapshot-safe. Processed when the snapshot is loaded.
+
+	Attributes:
+		type_cls (str): The type keyword.
+		type_kwargs (dict): The type modifiers, which may contain unprocessed typed values.
+		value (Any): The parsed value, which may contain unprocessed typed values.
+	"""
+	type_cls: str
+	type_kwargs: dict
+	value: Any
+
+
+
+def is_snapshot_safe(type_processor) -> bool:
+	return type_processor.SNAPSHOT_SAFE if(type_processor.SNAPSHOT_SAFE is not None) else type_processor.PURE
+
+
+def contains_snapshot_values(data: Any) -> bool:
+	stack = [data]
+
+	while stack:
+		value = stack.pop()
+
+		if isinstance(value, JunkSnapshotValue):
+			return True
+
+		elif isinstance(value, dict):
+			stack.extend(value.values())
+
+		elif isinstance(value, list):
+			stack.extend(value)
+
+	return False
+
+
+def processors_fingerprint(parser: JunkParser) -> str:
+	"""
+	Computes a fingerprint of the type processors registered in a parser, along with their snapshot safety and the options changing the type of parsed values.
+
+	Args:
+		parser (JunkParser): The parser.
+
+	Returns:
+		str: The fingerprint.
+	"""
+	processors = sorted(
+		f"{keyword}:{type(type_processor).__module__}.{type(type_processor).__qualname__}:{is_snapshot_safe(type_processor)}"
+		for keyword, type_processor in parser._type_processors_keyword_dict.items()
+	)
+	processors.append(f"numeric_arrays:{parser._numeric_arrays}")
+	return hashlib.blake2b("\n".join(processors).encode()).hexdigest()
+
+
+def source_fingerprint(file_path: Union[str, Path]) -> Tuple[int, int]:
+	file_stat = os.stat(file_path)
+	return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def create_temporary_file(snapshot_path: Path) -> Tuple[int, Path]:
+	# Unlike mkstemp, which makes files readable by their owner only, the kernel applies the umask as for the files created by open()
+	flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+	while True:
+		temporary_path = snapshot_path.with_name(f"{snapshot_path.name}.{secrets.token_hex(8)}.tmp")
+
+		try:
+			return os.open(temporary_path, flags, 0o666), temporary_path
+
+		except FileExistsError:
+			continue
+
+
+def default_snapshot_path(file_path: Union[str, Path]) -> Path:
+	file_path = Path(file_path)
+	return file_path.with_name(file_path.name + SNAPSHOT_SUFFIX)
+
+
+def write_snapshot(parser: JunkParser, file_path: Union[str, Path], snapshot_path: Union[str, Path], fingerprint: Tuple[int, int], data: Any):
+	"""
+	Writes a snapshot atomically. The header is pickled separately so that it can be checked without loading the data.
+
+	Args:
+		parser (JunkParser): The parser that compiled the data.
+		file_path (Union[str, Path]): The path to the source Junk file.
+		snapshot_path (Union[str, Path]): The path to the snapshot.
+		fingerprint (Tuple[int, int]): The fingerprint of the source file before it was parsed.
+		data (Any): The parsed data, possibly holding unprocessed typed values.
+	"""
+	header = {
+		"source": str(Path(file_path).resolve()),
+		"source_fingerprint": fingerprint,
+		"processors_fingerprint": processors_fingerprint(parser),
+		"snapshot_values": contains_snapshot_values(data),
+	}
+
+	snapshot_path = Path(snapshot_path)
+	file_descriptor, temporary_path = create_temporary_file(snapshot_path)
+
+	try:
+		with os.fdopen(file_descriptor, "wb") as opened_fp:
+			opened_fp.write(SNAPSHOT_MAGIC + SNAPSHOT_FORMAT_VERSION.to_bytes(2, "little"))
+			pickle.dump(header, opened_fp, protocol=pickle.HIGHEST_PROTOCOL)
+			pickle.dump(data, opened_fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+		os.replace(temporary_path, snapshot_path)
+
+	except BaseException:
+		os.unlink(temporary_path)
+		raise
+
+
+def read_snapshot(parser: JunkParser, file_path: Union[str, Path], snapshot_path: Union[str, Path]) -> Tuple[bool, Any, bool]:
+	"""
+	Reads a snapshot if it was compiled from the same source file, is up to date with it and matches the type processors of the parser.
+
+	Args:
+		parser (JunkParser): The parser loading the snapshot.
+		file_path (Union[str, Path]): The path to the source Junk file.
+		snapshot_path (Union[str, Path]): The path to the snapshot.
+
+	Returns:
+		Tuple[bool, Any, bool]: Whether the snapshot is valid, its data, and whether the data holds unprocessed typed values.
+	"""
+	try:
+		with open(snapshot_path, "rb") as opened_fp:
+			if opened_fp.read(len(SNAPSHOT_MAGIC) + 2) != SNAPSHOT_MAGIC + SNAPSHOT_FORMAT_VERSION.to_bytes(2, "little"):
+				return False, None, False
+
+			header = pickle.load(opened_fp)
+			if (
+				header["source"] != str(Path(file_path).resolve())
+				or header["source_fingerprint"] != source_fingerprint(file_path)
+				or header["processors_fingerprint"] != processors_fingerprint(parser)
+			):
+				return False, None, False
+
+			return True, pickle.load(opened_fp), header["snapshot_values"]
+
+	except (OSError, EOFError, pickle.UnpicklingError, KeyError, AttributeError, ImportError):
+		return False, None, False
+
+
+def process_snapshot_values(parser: JunkParser, data: Any) -> Any:
+	"""
+	Runs the type processors of the typed values stored unprocessed in loaded snapshot data, in place for containers.
+
+	Args:
+		parser (JunkParser): The parser loading the snapshot.
+		data (Any): The snapshot data.
+
+	Returns:
+		Any: The processed data.
+	"""
+	if isinstance(data, JunkSnapshotValue):
+		type_processor = parser._type_processors_keyword_dict.get(data.type_cls, None)
+		if type_processor is None:
+			raise ValueError(f"Unsupported type <{data.type_cls}>")
+
+		return parser._load_typed_value(type_processor, data.type_cls, process_snapshot_values(parser, data.type_kwargs), process_snapshot_values(parser, data.value))
+
+	elif isinstance(data, dict):
+		for key, value in data.items():
+			if isinstance(value, (JunkSnapshotValue, dict, list)):
+				data[key] = process_snapshot_values(parser, value)
+
+	elif isinstance(data, list):
+		for index, value in enumerate(data):
+			if isinstance(value, (JunkSnapshotValue, dict, list)):
+				data[index] = process_snapshot_values(parser, value)
+
+	return data
@@ -0,0 +1,274 @@
+from typing import IO, Iterator
+from lark.exceptions import UnexpectedInput
+from dataclasses import dataclass
+from .scanner import _IGNORE
+import re
+
+
+
+_SPECIAL_CHARS = re.compile(r'["#\[\]{}(),]')
+# Commas only matter between top-level elements
+_NESTED_SPECIAL_CHARS = re.compile(r'["#\[\]{}()]')
+# Same strings as _ESCAPED_STRING, scanned from the opening quote or from the end of a previous scan
+_STRING_BODY = re.compile(r'[^"\\\n]*(?:\\[^\n][^"\\\n]*)*')
+_OPENING_CHARS = frozenset("[{(")
+_CLOSING_CHARS = frozenset("]})")
+
+
+
+@dataclass
+class JunkStreamItem:
+	"""
+	Self-contained Junk snippet holding one or more top-level items of a streamed document.
+
+	Attributes:
+		text (str): Parseable Junk text, made of a synthetic prefix followed by the original text.
+		container (str): Type of the top-level container, "list", "dict" or "value" when the document is not a container.
+		prefix_length (int): Length of the synthetic prefix of text.
+		offset (int): Absolute position in the document of the original text.
+		line (int): Line in the document where the original text starts.
+		column (int): Column in the document where the original text starts.
+	"""
+	text: str
+	container: str
+	prefix_length: int
+	offset: int
+	line: int
+	column: int
+
+
+	def relocate_error(self, error: UnexpectedInput):
+		"""
+		Moves the position of a syntax error raised while parsing the snippet to its position in the whole document.
+
+		Args:
+			error (UnexpectedInput): The syntax error to relocate.
+		"""
+		if error.pos_in_stream is not None:
+			error.pos_in_stream += self.offset - self.prefix_length
+
+		if error.line == 1:
+			error.column += self.column - 1 - self.prefix_length
+
+		error.line += self.line - 1
+
+
+
+class JunkStreamSplitter:
+	"""
+	Splits a Junk document containing a top-level list or dict into snippets of one or more consecutive elements or pairs, reading the file-like object in chunks.
+
+	Only boundaries are detected here, taking strings, comments and nesting into account; snippets are validated when parsed.
+	"""
+
+	def __init__(self, fp: IO, chunk_size: int = 65536, batch_size: int = 0):
+		"""
+		Initializes the splitter.
+
+		Args:
+			fp (file-like): The file-like object containing the Junk data.
+			chunk_size (int): Number of characters read at once.
+			batch_size (int): Minimum number of characters of each snippet, grouping consecutive elements. Every element gets its own snippet when 0.
+		"""
+		self._fp = fp
+		self._chunk_size = chunk_size
+		self._batch_size = batch_size
+
+		self._buffer = ""
+		self._eof = False
+
+		# Position in the buffer whose offset, line and column in the document are known
+		self._mark = 0
+		self._offset = 0
+		self._line = 1
+		self._column = 1
+
+
+	def _read(self) -> int:
+		"""
+		Reads the next chunk, discarding the buffer contents before the mark.
+
+		Chunks are read until they are at least as long as the kept contents, so that a long element is copied a bounded number of times.
+
+		Returns:
+			int: Number of characters discarded from the start of the buffer, or -1 at the end of the file.
+		"""
+		if self._eof:
+			return -1
+
+		kept = len(self._buffer) - self._mark
+		chunks = []
+		size = 0
+
+		while size == 0 or size < kept:
+			chunk = self._fp.read(self._chunk_size)
+			if not chunk:
+				self._eof = True
+				break
+
+			chunks.append(chunk)
+			size += len(chunk)
+
+		if not chunks:
+			return -1
+
+		discarded = self._mark
+		self._buffer = self._buffer[discarded:] + "".join(chunks)
+		self._mark = 0
+		return discarded
+
+
+	def _move_mark(self, pos: int):
+		newlines = self._buffer.count("\n", self._mark, pos)
+
+		if newlines:
+			self._line += newlines
+			self._column = pos - self._buffer.rfind("\n", self._mark, pos)
+
+		else:
+			self._column += pos - self._mark
+
+		self._offset += pos - self._mark
+		self._mark = pos
+
+
+	def _skip_ignored(self, pos: int) -> int:
+		while True:
+			pos = _IGNORE.match(self._buffer, pos).end()
+			if pos < len(self._buffer):
+				return pos
+
+			# Keep the last line only, since it may end with an incomplete comment
+			self._move_mark(max(self._buffer.rfind("\n", self._mark), self._mark))
+			pos = self._mark
+
+			discarded = self._read()
+			if discarded < 0:
+				return len(self._buffer)
+
+			pos -= discarded
+
+
+	def _item(self, start: int, end: int, prefix: str, suffix: str, container: str) -> JunkStreamItem:
+		self._move_mark(start)
+
+		return JunkStreamItem(
+			text = prefix + self._buffer[start:end] + suffix,
+			container = container,
+			prefix_length = len(prefix),
+			offset = self._offset,
+			line = self._line,
+			column = self._column,
+		)
+
+
+	def __iter__(self) -> Iterator[JunkStreamItem]:
+		# Prelude before the top-level container
+		pos = self._skip_ignored(0)
+
+		if self._buffer[pos:pos + 1] == "[":
+			container, opening = "list", "["
+
+		elif self._buffer[pos:pos + 1] == "{":
+			container, opening = "dict", "{"
+
+		else:
+			discarded = self._read()
+			while discarded >= 0:
+				pos -= discarded
+				discarded = self._read()
+
+			yield self._item(pos, len(self._buffer), "", "", "value")
+			return
+
+		# Top-level elements
+		start = element_start = pos = pos + 1
+		self._move_mark(start)
+		depth = 0
+		# Position where the scan of an incomplete string or comment at pos resumes after reading
+		resume = 0
+		while True:
+			buffer = self._buffer
+			match = (_NESTED_SPECIAL_CHARS if(depth) else _SPECIAL_CHARS).search(buffer, pos)
+
+			if match is None:
+				pos = len(buffer)
+				discarded = self._read()
+
+				if discarded < 0:
+					yield self._item(start, len(self._buffer), opening, "", container)
+					return
+
+				start -= discarded
+				element_start -= discarded
+				pos -= discarded
+				continue
+
+			pos = match.start()
+			char = buffer[pos]
+
+			if char == '"':
+				string_end = _STRING_BODY.match(buffer, max(pos + 1, resume)).end()
+				resume = 0
+
+				if buffer.startswith('"', string_end):
+					pos = string_end + 1
+					continue
+
+				# The string may go on in the next chunk unless it stops at a new line
+				if "\n" not in buffer[string_end:string_end + 2]:
+					discarded = self._read()
+
+					if discarded >= 0:
+						start -= discarded
+						element_start -= discarded
+						pos -= discarded
+						resume = string_end - discarded
+						continue
+
+				pos += 1
+
+			elif char == "#":
+				comment_end = buffer.find("\n", max(pos, resume))
+				resume = 0
+
+				if comment_end == -1:
+					discarded = self._read()
+
+					if discarded >= 0:
+						start -= discarded
+						element_start -= discarded
+						pos -= discarded
+						resume = len(buffer) - discarded
+						continue
+
+				pos = len(buffer) if(comment_end == -1) else comment_end
+
+			elif char in _OPENING_CHARS:
+				depth += 1
+				pos += 1
+
+			elif char in _CLOSING_CHARS and depth > 0:
+				depth -= 1
+				pos += 1
+
+			elif char == ",":
+				if pos - start >= self._batch_size:
+					# Empty elements are kept followed by a comma so that parsing reports them
+					closing = "}" if(container == "dict") else "]"
+					yield self._item(start, pos, opening, closing if(_IGNORE.match(buffer, element_start, pos).end() < pos) else "," + closing, container)
+					start = element_start = pos = pos + 1
+
+				else:
+					element_start = pos = pos + 1
+
+			else:
+				yield self._item(start, pos, opening, char, container)
+				pos += 1
+				break
+
+		# Only whitespaces and comments are allowed after the top-level container
+		self._move_mark(pos)
+		pos = self._skip_ignored(pos)
+		if pos < len(self._buffer):
+			yield self._item(pos, len(self._buffer), "[]", "", "list")
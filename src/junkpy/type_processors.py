@@ -1,12 +1,16 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any, Optional, Type
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Type, Union
 if TYPE_CHECKING:
 	from .base import JunkMetadata, JunkParser
 
+from . import arrays, include
+from array import array
 from decimal import Decimal
 from datetime import datetime, timedelta, date, time
+from itertools import repeat
 from pathlib import Path
 from re import Pattern
+import asyncio
 import os
 import re
 
@@ -19,13 +23,23 @@ class JunkTypeProcessor:
 	Attributes:
 		CLASS (type): The Python object type to be returned by the type processor.
 		KEYWORD (str): The keyword used to identify this type processor in Junk syntax.
+		PURE (bool): Whether load always returns the same immutable result for the same value and modifiers, allowing parsers to memoize it.
+		SNAPSHOT_SAFE (Optional[bool]): Whether results can be stored in compiled snapshots instead of running load when snapshots are loaded, same as PURE if None.
+		NUMERIC_ARRAYS (bool): Whether load accepts lists of numbers as array.array, which the scanner backend then builds without creating a Python object per number.
 
 	Methods:
 		load(self, value, file_path, **kwargs): A method that processes the parsed value and returns a python object of the type defined by CLASS attribute.
+		load_many(self, values, **kwargs): Loads every value of a list with the same modifiers, used by (each, type=...) arrays.
+		output_class(self, value, **kwargs): The type of the objects load returns for a value and its modifiers, CLASS by default.
+		aload(self, value, **kwargs): Coroutine awaited instead of load by the async methods of the parser.
+		dump(self, obj): Inverse of load, used by the serializer to write instances of CLASS as typed values.
 
 	"""
 	CLASS: type = None
 	KEYWORD: str = None 
+	PURE: bool = False
+	SNAPSHOT_SAFE: Optional[bool] = None
+	NUMERIC_ARRAYS: bool = False
 	
 
 	def __init__(self, parser):
@@ -47,6 +61,73 @@ class JunkTypeProcessor:
 		return self.CLASS(value)
 
 
+	def load_many(self, values: List[Any], **kwargs) -> List[Any]:
+		"""
+		Loads every value of a list with the same modifiers, as load does for each of them.
+		Type processors with a faster way to convert many values at once can override it, falling back to this method in subclasses changing load.
+
+		Args:
+			values (List[Any]): The parsed values to be loaded.
+			**kwargs: Modifiers included when forcing the type in a Junk file.
+
+		Returns:
+			List[Any]: The loaded values, in the same order.
+
+		"""
+		if type(self).load is JunkTypeProcessor.load:
+			return list(map(self.CLASS, values))
+
+		load = self.load
+		return [load(value, **kwargs) for value in values]
+
+
+	def output_class(self, value: Any, **kwargs) -> Union[type, Tuple[type, ...]]:
+		"""
+		Returns the type of the objects load returns for the given value and modifiers, checked by the parser unless check_output_types is disabled.
+		Type processors whose output type depends on the value or the modifiers can override it, their outputs then being checked against it instead of CLASS.
+
+		Args:
+			value: The parsed value.
+			**kwargs: Modifiers included when forcing the type in a Junk file.
+
+		Returns:
+			Union[type, Tuple[type, ...]]: The type, or a tuple of types.
+
+		"""
+		return self.CLASS
+
+
+	async def aload(self, value: Any, **kwargs) -> Any:
+		"""
+		Loads the given value asynchronously, used by the async methods of the parser instead of load when overridden.
+		Independent typed values are awaited concurrently on the event loop, while load runs in the executor parsing the data.
+
+		Args:
+			value: The parsed value to be modified or loaded.
+			**kwargs: Modifiers included when forcing the type in a Junk file.
+
+		Returns:
+			object: An instance of the modified or loaded value.
+
+		"""
+		return self.load(value, **kwargs)
+
+
+	def dump(self, obj: Any) -> Any:
+		"""
+		Converts an instance of CLASS back to a value that loads to an equal object, written as a typed value by the serializer.
+		Only type processors overriding this method are used to serialize objects.
+
+		Args:
+			obj: The object to be dumped.
+
+		Returns:
+			object: A serializable value, which may contain other typed objects.
+
+		"""
+		raise NotImplementedError(f"Type processor <{self.KEYWORD}> does not support dumping")
+
+
 	@property
 	def metadata(self) -> JunkMetadata:
 		return self.__parser._local_storage.get()
@@ -58,13 +139,31 @@ class JunkTypeProcessor:
 
 
 
+def static_output_class(type_processor: JunkTypeProcessor) -> Union[type, Tuple[type, ...]]:
+	# Type every output of a type processor is an instance of, or an empty tuple, which no object is an instance of, when it depends on the value or the modifiers
+	return type_processor.CLASS if(type(type_processor).output_class is JunkTypeProcessor.output_class) else ()
+
+
+def check_output_type(type_processor: JunkTypeProcessor, type_cls: str, loaded_value: Any, value: Any = None, type_kwargs: Optional[dict] = None):
+	if type(type_processor).output_class is JunkTypeProcessor.output_class:
+		output_class = type_processor.CLASS
+
+	else:
+		output_class = type_processor.output_class(value, **(type_kwargs or {}))
+
+	if not isinstance(loaded_value, output_class):
+		raise TypeError(f"Unexpected output type for type processor ({type_cls}). Expected {output_class}, got {type(loaded_value)}")
+
+
+
 class JunkBaseTypeProcessorMeta(type):
-	BASE_TYPE_PROCESSOR_CLASSES = []
+	# Immutable, replaced whenever a subclass is defined, so that parsers cannot change it
+	BASE_TYPE_PROCESSOR_CLASSES: Tuple[type, ...] = ()
 	
 	@classmethod
 	def __new__(metacls, cls, name, bases, dct):
 		type_processor = super().__new__(cls, name, bases, dct)
-		metacls.BASE_TYPE_PROCESSOR_CLASSES.append(type_processor)
+		metacls.BASE_TYPE_PROCESSOR_CLASSES += (type_processor,)
 		return type_processor
 
 
@@ -78,60 +177,97 @@ class JunkBaseTypeProcessor(JunkTypeProcessor, metaclass=JunkBaseTypeProcessorMe
 class JunkBoolTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = bool
 	KEYWORD = "bool"
+	PURE = True
 		
 		
 	
 class JunkIntegerTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = int
 	KEYWORD = "int"
+	PURE = True
 	
 	
 	
 class JunkHexTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = int
 	KEYWORD = "hex"
+	PURE = True
 	
 	
 	def load(self, value, **kwargs):
 		return self.CLASS(value, 16)
+
+
+	def load_many(self, values, **kwargs):
+		if type(self).load is not JunkHexTypeProcessor.load:
+			return super().load_many(values, **kwargs)
+
+		return list(map(self.CLASS, values, repeat(16)))
 		
 		
 		
 class JunkOctalTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = int
 	KEYWORD = "octal"
+	PURE = True
 	
 	
 	def load(self, value, **kwargs):
 		return self.CLASS(value, 8)
+
+
+	def load_many(self, values, **kwargs):
+		if type(self).load is not JunkOctalTypeProcessor.load:
+			return super().load_many(values, **kwargs)
+
+		return list(map(self.CLASS, values, repeat(8)))
 		
 		
 		
 class JunkBinaryTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = int
 	KEYWORD = "bin"
+	PURE = True
 	
 	
 	def load(self, value, **kwargs):
 		return self.CLASS(value, 2)
+
+
+	def load_many(self, values, **kwargs):
+		if type(self).load is not JunkBinaryTypeProcessor.load:
+			return super().load_many(values, **kwargs)
+
+		return list(map(self.CLASS, values, repeat(2)))
 	
 	
 	
 class JunkComplexTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = complex
 	KEYWORD = "complex"
+	PURE = True
+	
+	
+	def dump(self, obj):
+		return str(obj)
 	
 	
 	
 class JunkFloatTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = float
 	KEYWORD = "float"
+	PURE = True
 	
 
 
 class JunkDecimalTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = Decimal
 	KEYWORD = "decimal"
+	PURE = True
+	
+	
+	def dump(self, obj):
+		return str(obj)
 	
 	
 
@@ -139,6 +275,97 @@ class JunkDecimalTypeProcessor(JunkBaseTypeProcessor):
 class JunkSetTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = set
 	KEYWORD = "set"
+	SNAPSHOT_SAFE = True
+	
+	
+	def dump(self, obj):
+		return list(obj)
+
+
+
+class JunkArrayTypeProcessor(JunkBaseTypeProcessor):
+	"""
+	Loads a list of numbers as a compact array.array, of the type given by the dtype modifier: (array, dtype="f4") [...].
+	Without dtype, lists of integers are stored as 64-bit integers and lists with floats as 64-bit floats.
+	"""
+	CLASS = array
+	KEYWORD = "array"
+	SNAPSHOT_SAFE = True
+	NUMERIC_ARRAYS = True
+
+
+	def load(self, value, dtype=None, **kwargs):
+		if not isinstance(value, (list, array)):
+			raise ValueError(f"Unsupported value for type <{self.KEYWORD}>: {value}")
+
+		if dtype is not None:
+			typecode = arrays.dtype_typecode(dtype)
+
+		elif isinstance(value, array):
+			return value
+
+		else:
+			typecode = arrays.numeric_typecode(value) if(value) else "d"
+			if typecode is None:
+				raise ValueError(f"Unsupported value for type <{self.KEYWORD}>: {value}")
+
+		if isinstance(value, array) and value.typecode == typecode:
+			return value
+
+		return array(typecode, value)
+
+
+	def dump(self, obj):
+		return obj.tolist()
+
+
+
+class JunkEachTypeProcessor(JunkBaseTypeProcessor):
+	"""
+	Loads every element of a list with the type processor named by the type modifier, passing it the other modifiers: (each, type="datetime") [...].
+	The whole list is handed to its load_many method instead of dispatching each element separately.
+	"""
+	CLASS = list
+	KEYWORD = "each"
+
+
+	def load(self, value, **kwargs):
+		type_processor, type_cls = self._element_type_processor(value, kwargs)
+		values = type_processor.load_many(value, **kwargs)
+
+		if self.parser._check_output_types:
+			for element, loaded_value in zip(value, values):
+				check_output_type(type_processor, type_cls, loaded_value, element, kwargs)
+
+		return values
+
+
+	async def aload(self, value, **kwargs):
+		type_processor, type_cls = self._element_type_processor(value, kwargs)
+		if type(type_processor).aload is JunkTypeProcessor.aload:
+			return self.load(value, type=type_cls, **kwargs)
+
+		values = await asyncio.gather(*(type_processor.aload(element, **kwargs) for element in value))
+
+		if self.parser._check_output_types:
+			for element, loaded_value in zip(value, values):
+				check_output_type(type_processor, type_cls, loaded_value, element, kwargs)
+
+		return values
+
+
+	def _element_type_processor(self, value, kwargs):
+		# Removes the type modifier from kwargs, the others are passed to the element type processor
+		type_cls = kwargs.pop("type", None)
+		type_processor = self.parser._type_processors_keyword_dict.get(type_cls, None) if(isinstance(type_cls, str)) else None
+
+		if type_processor is None:
+			raise ValueError(f"Unsupported type <{type_cls}>")
+
+		if not isinstance(value, list):
+			raise ValueError(f"Unsupported value for type <{self.KEYWORD}>: {value}")
+
+		return type_processor, type_cls
 	
 
 
@@ -146,16 +373,25 @@ class JunkSetTypeProcessor(JunkBaseTypeProcessor):
 class JunkStringTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = str
 	KEYWORD = "string"
+	PURE = True
 	
 	
 	
 class JunkRegexTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = Pattern
 	KEYWORD = "regex"
+	PURE = True
 	
 	
 	def load(self, value, **kwargs):
 		return re.compile(str(value))
+	
+	
+	def dump(self, obj):
+		if not isinstance(obj.pattern, str) or obj.flags != re.UNICODE:
+			raise ValueError(f"Only str patterns without flags can be dumped: {obj}")
+
+		return obj.pattern
 
 	
 
@@ -163,6 +399,7 @@ class JunkRegexTypeProcessor(JunkBaseTypeProcessor):
 class JunkTimeDeltaTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = timedelta
 	KEYWORD = "timedelta"
+	PURE = True
 	
 	
 	def load(self, value, **kwargs):
@@ -174,16 +411,28 @@ class JunkTimeDeltaTypeProcessor(JunkBaseTypeProcessor):
 			
 		else:
 			return self.CLASS(seconds=float(value))
+	
+	
+	def dump(self, obj):
+		return [obj.days, obj.seconds, obj.microseconds]
 		
 		
 		
 class JunkTimestampTypeProcessor(JunkBaseTypeProcessor):
 	CLASS = datetime
 	KEYWORD = "timestamp"
+	PURE = True
 	
 	
 	def load(self, value, **kwargs):
 		return self.CLASS.fromtimestamp(float(value))
+
+
+	def load_many(self, values, **kwargs):
+		if type(self).load is not JunkTimestampTypeProcessor.load:
+			return super().load_many(values, **kwargs)
+
+		return list(map(self.CLASS.fromtimestamp, map(float, values)))
 		
 		
 
@@ -201,24 +450,43 @@ class JunkDatetimeTypeProcessorParent(JunkBaseTypeProcessor):
 			
 		else:
 			raise ValueError(f"Unsupported value for type <{self.KEYWORD}>: {value}")
+
+
+	def load_many(self, values, **kwargs):
+		if type(self).load is not JunkDatetimeTypeProcessorParent.load:
+			return super().load_many(values, **kwargs)
+
+		try:
+			return list(map(self.CLASS.fromisoformat, values))
+
+		except TypeError:
+			# Lists and dicts among the values
+			return super().load_many(values, **kwargs)
+	
+	
+	def dump(self, obj):
+		return obj.isoformat()
 			
 			
 			
 class JunkTimeTypeProcessor(JunkDatetimeTypeProcessorParent):
 	CLASS = time
 	KEYWORD = "time"
+	PURE = True
 	
 	
 	
 class JunkDateTypeProcessor(JunkDatetimeTypeProcessorParent):
 	CLASS = date
 	KEYWORD = "date"
+	PURE = True
 	
 	
 	
 class JunkDateTimeTypeProcessor(JunkDatetimeTypeProcessorParent):
 	CLASS = datetime
 	KEYWORD = "datetime"
+	PURE = True
 
 
 
@@ -240,5 +508,22 @@ class JunkPathTypeProcessor(JunkBaseTypeProcessor):
 	
 	def load(self, value, **kwargs):
 		return self.CLASS(os.path.expandvars(str(value)))
+	
+	
+	def dump(self, obj):
+		return str(obj)
 
 
+
+class JunkIncludeTypeProcessor(JunkBaseTypeProcessor):
+	CLASS = object
+	KEYWORD = "include"
+	
+	
+	def __init__(self, parser):
+		super().__init__(parser)
+		self.cache = include.JunkIncludeCache()
+	
+	
+	def load(self, value, **kwargs):
+		return include.load_include(self, self.cache, value)
@@ -0,0 +1,330 @@
+from typing import Annotated, Any, Callable, List, Literal, Optional, Union, get_args, get_origin
+from pydantic import BaseModel, TypeAdapter, ValidationError
+import functools
+import types
+
+
+
+# Returned by construct when the data does not match the annotations of the model
+MISMATCH = object()
+
+_CACHE_SIZE = 256
+
+
+
+class JunkValidatedValue:
+	# Object validated straight from JSON text while parsing, returned as it is by JunkParser._validate_to_model
+	__slots__ = ("value",)
+
+	def __init__(self, value: Any):
+		self.value = value
+
+
+
+class _JunkMismatch(Exception):
+	pass
+
+
+
+class _JunkUnsupportedAnnotation(Exception):
+	pass
+
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _cached_type_adapter(validate_to: Any) -> TypeAdapter:
+	return TypeAdapter(validate_to)
+
+
+def get_type_adapter(validate_to: Any) -> TypeAdapter:
+	"""
+	Returns the type adapter of a model, building its validator once per model.
+
+	Args:
+		validate_to (Any): The pydantic model, or any type supported by TypeAdapter.
+
+	Returns:
+		TypeAdapter: The type adapter.
+	"""
+	try:
+		return _cached_type_adapter(validate_to)
+
+	except TypeError:
+		# Unhashable types are not cached
+		return TypeAdapter(validate_to)
+
+
+def _agrees_with_python_mode(core_schema: Any) -> bool:
+	# Strict validation and base64 bytes differ between JSON and Python inputs, anywhere in the schema of a model or of its fields
+	if isinstance(core_schema, dict):
+		if core_schema.get("strict") is True or core_schema.get("val_json_bytes", "utf8") != "utf8":
+			return False
+
+		return all(_agrees_with_python_mode(value) for value in core_schema.values())
+
+	if isinstance(core_schema, (list, tuple)):
+		return all(_agrees_with_python_mode(value) for value in core_schema)
+
+	return True
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _cached_validates_json(validate_to: Any) -> bool:
+	return _agrees_with_python_mode(get_type_adapter(validate_to).core_schema)
+
+
+def validates_json(validate_to: Any) -> bool:
+	"""
+	Returns whether a model validates JSON text like the same data parsed by Junk, so that validate_json can be used for it.
+	Strict validation rejects in Python mode some strings accepted in JSON mode, like dates.
+
+	Args:
+		validate_to (Any): The pydantic model, or any type supported by TypeAdapter.
+
+	Returns:
+		bool: False if the model, or a nested one, uses strict validation or decodes bytes differently from JSON.
+	"""
+	try:
+		return _cached_validates_json(validate_to)
+
+	except TypeError:
+		return _agrees_with_python_mode(get_type_adapter(validate_to).core_schema)
+
+
+def validate(validate_to: Any, data: Any) -> Any:
+	return get_type_adapter(validate_to).validate_python(data)
+
+
+def validate_json(validate_to: Any, string: str) -> Optional[JunkValidatedValue]:
+	"""
+	Validates a Junk string straight from its text with the JSON parser of pydantic, without building the parsed data.
+
+	Args:
+		validate_to (Any): The pydantic model.
+		string (str): The Junk string, which may not be JSON.
+
+	Returns:
+		Optional[JunkValidatedValue]: The validated object, None if the string is not JSON.
+	"""
+	# Unlike Junk, the JSON parser of pydantic accepts these constants
+	if "NaN" in string or "Infinity" in string:
+		return None
+
+	try:
+		return JunkValidatedValue(get_type_adapter(validate_to).validate_json(string))
+
+	except ValidationError as e:
+		if any(error["type"] == "json_invalid" for error in e.errors()):
+			return None
+
+		raise
+
+
+def construct(validate_to: Any, data: Any) -> Any:
+	"""
+	Builds a model directly from parsed data whose values already have the types annotated by the model, without running validators, constraints or type conversions.
+
+	Args:
+		validate_to (Any): The pydantic model.
+		data (Any): The parsed data.
+
+	Returns:
+		Any: The model, or MISMATCH when the data does not match the annotations or the model is not supported, in which case it must be validated.
+	"""
+	if not (isinstance(validate_to, type) and issubclass(validate_to, BaseModel)):
+		return MISMATCH
+
+	constructor = _model_constructor(validate_to)
+	if constructor is None:
+		return MISMATCH
+
+	try:
+		return constructor(data)
+
+	except (_JunkMismatch, _JunkUnsupportedAnnotation):
+		return MISMATCH
+
+
+def _identity(value: Any) -> Any:
+	return value
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _model_constructor(model: type) -> Optional[Callable[[Any], Any]]:
+	# Returns None for models whose annotations are not supported, which are always validated
+	config = model.model_config
+	if config.get("extra", "ignore") != "ignore" or model.__pydantic_root_model__:
+		return None
+
+	fields = []
+	try:
+		for name, field_info in model.model_fields.items():
+			if field_info.validation_alias is not None and not isinstance(field_info.validation_alias, str):
+				return None
+
+			key = field_info.validation_alias or field_info.alias or name
+			fields.append((name, key, field_info.is_required(), _annotation_converter(field_info.annotation)))
+
+	except _JunkUnsupportedAnnotation:
+		return None
+
+	populate_by_name = config.get("populate_by_name", False)
+
+	def construct_model(value: Any) -> Any:
+		if not isinstance(value, dict):
+			raise _JunkMismatch()
+
+		values = {}
+		for name, key, required, convert in fields:
+			if key in value:
+				values[name] = convert(value[key])
+
+			elif populate_by_name and name in value:
+				values[name] = convert(value[name])
+
+			elif required:
+				raise _JunkMismatch()
+
+		return model.model_construct(**values)
+
+	return construct_model
+
+
+def _annotation_converter(annotation: Any) -> Callable[[Any], Any]:
+	# Returns a callable checking that a value matches the annotation, returning the value converted to nested models
+	if annotation is Any or annotation is object:
+		return _identity
+
+	if annotation is None or annotation is type(None):
+		return _exact_type_converter(type(None))
+
+	origin = get_origin(annotation)
+	args = get_args(annotation)
+
+	if origin is Annotated:
+		# Constraints are not checked
+		return _annotation_converter(args[0])
+
+	if origin is Union or origin is types.UnionType:
+		return _union_converter([_annotation_converter(arg) for arg in args])
+
+	if origin is Literal:
+		return _literal_converter(args)
+
+	if origin is list or annotation is list:
+		return _list_converter(_annotation_converter(args[0]) if(args) else _identity)
+
+	if origin is dict or annotation is dict:
+		if args and args[0] not in (str, Any):
+			raise _JunkUnsupportedAnnotation(annotation)
+
+		return _dict_converter(_annotation_converter(args[1]) if(args) else _identity)
+
+	if origin is not None or not isinstance(annotation, type):
+		raise _JunkUnsupportedAnnotation(annotation)
+
+	if issubclass(annotation, BaseModel):
+		return _nested_model_converter(annotation)
+
+	if annotation is float:
+		return _float_converter
+
+	if annotation in (int, str, bool):
+		return _exact_type_converter(annotation)
+
+	# Types returned by type processors, like datetime or Decimal
+	return _instance_converter(annotation)
+
+
+def _nested_model_converter(model: type) -> Callable[[Any], Any]:
+	# Nested models are looked up when constructed, so that recursive models are supported
+	def convert(value: Any) -> Any:
+		constructor = _model_constructor(model)
+		if constructor is None:
+			raise _JunkUnsupportedAnnotation(model)
+
+		return constructor(value)
+
+	return convert
+
+
+def _exact_type_converter(annotation: type) -> Callable[[Any], Any]:
+	def convert(value: Any) -> Any:
+		if type(value) is not annotation:
+			raise _JunkMismatch()
+
+		return value
+
+	return convert
+
+
+def _instance_converter(annotation: type) -> Callable[[Any], Any]:
+	def convert(value: Any) -> Any:
+		if not isinstance(value, annotation):
+			raise _JunkMismatch()
+
+		return value
+
+	return convert
+
+
+def _float_converter(value: Any) -> Any:
+	value_type = type(value)
+
+	if value_type is float:
+		return value
+
+	elif value_type is int:
+		return float(value)
+
+	raise _JunkMismatch()
+
+
+def _literal_converter(literals: tuple) -> Callable[[Any], Any]:
+	def convert(value: Any) -> Any:
+		if not any(type(value) is type(literal) and value == literal for literal in literals):
+			raise _JunkMismatch()
+
+		return value
+
+	return convert
+
+
+def _union_converter(converters: List[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+	def convert(value: Any) -> Any:
+		for converter in converters:
+			try:
+				return converter(value)
+
+			except _JunkMismatch:
+				pass
+
+		raise _JunkMismatch()
+
+	return convert
+
+
+def _list_converter(convert_item: Callable[[Any], Any]) -> Callable[[Any], Any]:
+	def convert(value: Any) -> Any:
+		if not isinstance(value, list):
+			raise _JunkMismatch()
+
+		if convert_item is _identity:
+			return value
+
+		return [convert_item(item) for item in value]
+
+	return convert
+
+
+def _dict_converter(convert_value: Callable[[Any], Any]) -> Callable[[Any], Any]:
+	def convert(value: Any) -> Any:
+		if not isinstance(value, dict):
+			raise _JunkMismatch()
+
+		if convert_value is _identity:
+			return value
+
+		return {key: convert_value(item) for key, item in value.items()}
+
+	return convert
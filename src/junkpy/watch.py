@@ -0,0 +1,326 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+if TYPE_CHECKING:
+	from .base import JunkParser
+	from .incremental import JunkIncrementalResult
+
+from pathlib import Path
+from pydantic import BaseModel
+import asyncio
+import ctypes
+import ctypes.util
+import hashlib
+import inspect
+import io
+import logging
+import os
+import select
+import threading
+
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# Events of the watched directories waking up the watcher, covering in-place writes as well as files replaced by a rename
+_INOTIFY_MASK = (
+	0x00000002 # IN_MODIFY
+	| 0x00000004 # IN_ATTRIB
+	| 0x00000008 # IN_CLOSE_WRITE
+	| 0x00000040 # IN_MOVED_FROM
+	| 0x00000080 # IN_MOVED_TO
+	| 0x00000100 # IN_CREATE
+	| 0x00000200 # IN_DELETE
+)
+
+
+
+def _stat_fingerprint(file_path: Path) -> Optional[Tuple[int, int, int]]:
+	try:
+		file_stat = os.stat(file_path)
+
+	except OSError:
+		return None
+
+	return (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
+
+
+def _content_fingerprint(file_path: Path) -> Optional[bytes]:
+	try:
+		with open(file_path, "rb") as opened_fp:
+			return hashlib.blake2b(opened_fp.read()).digest()
+
+	except OSError:
+		return None
+
+
+
+class _JunkInotify:
+	# Wakes the watcher up when the directories of the watched files change, only available on Linux
+	def __init__(self):
+		self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+		self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+		if self._fd < 0:
+			raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+		self._watches: Dict[Path, int] = {}
+
+
+	def update(self, directories: Set[Path]):
+		for directory in set(self._watches) - directories:
+			self._libc.inotify_rm_watch(self._fd, self._watches.pop(directory))
+
+		for directory in directories - set(self._watches):
+			watch_descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _INOTIFY_MASK)
+			if watch_descriptor >= 0:
+				self._watches[directory] = watch_descriptor
+
+
+	def wait(self, timeout: float, wake_fd: int) -> bool:
+		readable, _, _ = select.select([self._fd, wake_fd], [], [], timeout)
+		if self._fd not in readable:
+			return False
+
+		# Events are only used as a wake-up, the watched files are compared by stat afterwards
+		try:
+			while os.read(self._fd, 65536):
+				pass
+
+		except BlockingIOError:
+			pass
+
+		return True
+
+
+	def close(self):
+		os.close(self._fd)
+
+
+
+class JunkWatcher:
+	"""
+	Watches a Junk file and the files its data depends on, reloading it in a background thread when their contents change. Returned by JunkParser.watch.
+
+	Attributes:
+		file_path (Path): The watched Junk file.
+		data (Any): The last loaded data.
+		error (Optional[Exception]): The error of the last reload, None if it succeeded.
+		files (Set[Path]): The watched files, the Junk file along with its dependencies.
+		changed (Optional[List[Tuple[Union[str, int], ...]]]): Key paths of the values changed by the last reload when reloading incrementally, see JunkIncrementalResult.changed.
+	"""
+
+	def __init__(
+		self,
+		parser: JunkParser,
+		file_path: Path,
+		callback: Callable[[Any], Any],
+		validate_to: Optional[Type[BaseModel]] = None,
+		interval: float = 1.0,
+		debounce: float = 0.1,
+		error_callback: Optional[Callable[[Exception], Any]] = None,
+		loop: Optional[asyncio.AbstractEventLoop] = None,
+		use_inotify: bool = True,
+		incremental: bool = False
+	):
+		self.file_path = Path(file_path)
+		self.data = None
+		self.error: Optional[Exception] = None
+		self.files: Set[Path] = set()
+		self.changed: Optional[List[Tuple[Union[str, int], ...]]] = None
+
+		self._parser = parser
+		self._callback = callback
+		self._validate_to = validate_to
+		self._interval = interval
+		self._debounce = debounce
+		self._error_callback = error_callback
+		self._loop = loop
+		self._incremental = incremental
+		self._previous: Optional[JunkIncrementalResult] = None
+
+		self._stat_fingerprints: Dict[Path, Optional[Tuple[int, int, int]]] = {}
+		self._content_fingerprints: Dict[Path, Optional[bytes]] = {}
+		self._stop_event = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+		self._inotify: Optional[_JunkInotify] = None
+		if use_inotify:
+			try:
+				self._inotify = _JunkInotify()
+				# Written on stop to wake the watcher up
+				self._wake_fds = os.pipe()
+
+			except (OSError, AttributeError, TypeError):
+				self._inotify = None
+
+
+	def __enter__(self) -> JunkWatcher:
+		return self
+
+
+	def __exit__(self, *args):
+		self.stop()
+
+
+	@property
+	def running(self) -> bool:
+		return self._thread is not None and self._thread.is_alive()
+
+
+	def start(self):
+		"""
+		Loads the file, raising its errors, then starts watching it.
+		"""
+		try:
+			self.data = self._load(*self._read())
+
+		except BaseException:
+			self.stop()
+			raise
+
+		self._thread = threading.Thread(target=self._run, name=f"junk_watch:{self.file_path.name}", daemon=True)
+		self._thread.start()
+
+
+	def stop(self):
+		"""
+		Stops watching the file, waiting for a running reload to finish.
+		"""
+		self._stop_event.set()
+
+		if self._inotify is not None:
+			os.write(self._wake_fds[1], b"\0")
+
+		if self._thread is not None and self._thread is not threading.current_thread():
+			self._thread.join()
+
+		if self._inotify is not None:
+			self._inotify.close()
+			self._inotify = None
+			for fd in self._wake_fds:
+				os.close(fd)
+
+
+	def _read(self) -> Tuple[str, Dict[Path, Optional[bytes]]]:
+		# Hashes the contents of the watched files, returning the string of the Junk file that was hashed so that exactly that content is parsed
+		with open(self.file_path, "rb") as opened_fp:
+			content = opened_fp.read()
+
+		content_fingerprints = {self.file_path: hashlib.blake2b(content).digest()}
+		for file_path in self.files - {self.file_path}:
+			content_fingerprints[file_path] = _content_fingerprint(file_path)
+
+		with io.TextIOWrapper(io.BytesIO(content)) as text_fp:
+			return text_fp.read(), content_fingerprints
+
+
+	def _load(self, string: str, content_fingerprints: Dict[Path, Optional[bytes]]) -> Any:
+		# Fingerprints are taken before parsing, so that writes made while parsing trigger another reload
+		stat_fingerprints = {file_path: _stat_fingerprint(file_path) for file_path in content_fingerprints}
+
+		if self._incremental:
+			result, metadata = self._parser._load_file_data_incremental(self.file_path, self._previous, string)
+			return_data = result.data
+
+		else:
+			result = None
+			return_data, metadata = self._parser._load_file_data(self.file_path, string)
+
+		self.files = {self.file_path} | {Path(file_path) for file_path in metadata.dependencies}
+		self._stat_fingerprints = {file_path: stat_fingerprints[file_path] if(file_path in stat_fingerprints) else _stat_fingerprint(file_path) for file_path in self.files}
+		self._content_fingerprints = {file_path: content_fingerprints[file_path] if(file_path in content_fingerprints) else _content_fingerprint(file_path) for file_path in self.files}
+
+		if self._inotify is not None:
+			self._inotify.update({file_path.resolve().parent for file_path in self.files})
+
+		data = self._parser._validate_to_model(return_data, self._validate_to)
+
+		# Failed reloads are parsed again from the last loaded result
+		if result is not None:
+			self._previous = result
+			self.changed = result.changed
+
+		return data
+
+
+	def _changed(self) -> bool:
+		return any(_stat_fingerprint(file_path) != stat_fingerprint for file_path, stat_fingerprint in self._stat_fingerprints.items())
+
+
+	def _wait(self, timeout: float) -> bool:
+		# Returns False once stopped
+		if self._inotify is not None:
+			self._inotify.wait(timeout, self._wake_fds[0])
+			return not self._stop_event.is_set()
+
+		return not self._stop_event.wait(timeout)
+
+
+	def _run(self):
+		while self._wait(self._interval):
+			if not self._changed():
+				continue
+
+			# Debounce bursts of writes, waiting until the files stay unchanged for the debounce period
+			stat_fingerprints = {file_path: _stat_fingerprint(file_path) for file_path in self.files}
+			while not self._stop_event.wait(self._debounce):
+				current_stat_fingerprints = {file_path: _stat_fingerprint(file_path) for file_path in self.files}
+				if current_stat_fingerprints == stat_fingerprints:
+					break
+
+				stat_fingerprints = current_stat_fingerprints
+
+			if self._stop_event.is_set():
+				return
+
+			self._reload()
+
+
+	def _reload(self):
+		try:
+			string, content_fingerprints = self._read()
+
+			# Touched but unchanged files are not parsed again
+			if content_fingerprints == self._content_fingerprints:
+				self._stat_fingerprints = {file_path: _stat_fingerprint(file_path) for file_path in self.files}
+				return
+
+			data = self._load(string, content_fingerprints)
+
+		except Exception as e:
+			# Failed reloads are retried on the next change, keeping the last loaded data
+			self._stat_fingerprints = {file_path: _stat_fingerprint(file_path) for file_path in self._stat_fingerprints}
+			self.error = e
+			if self._error_callback is not None:
+				self._deliver(self._error_callback, e)
+
+			return
+
+		self.data = data
+		self.error = None
+		self._deliver(self._callback, data)
+
+
+	def _deliver(self, callback: Callable[[Any], Any], value: Any):
+		# Errors of the callbacks, or of a closed event loop, must not end the watcher thread
+		try:
+			if self._loop is None:
+				callback(value)
+
+			elif inspect.iscoroutinefunction(callback):
+				coroutine = callback(value)
+				try:
+					asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+				except BaseException:
+					coroutine.close()
+					raise
+
+			else:
+				self._loop.call_soon_threadsafe(callback, value)
+
+		except Exception as e:
+			if self._error_callback is not None and callback is not self._error_callback:
+				self._deliver(self._error_callback, e)
+
+			else:
+				_LOGGER.exception("Junk watcher callback failed for %s", self.file_path)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkResultCache, JunkTypeProcessor
+import junkpy
+from pathlib import Path
+import asyncio
+import tempfile
+import unittest
+
+
+
+class AsyncTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "async_test"
+	IN_FLIGHT = 0
+	MAX_IN_FLIGHT = 0
+
+
+	def load(self, value, **kwargs):
+		return self.CLASS(value) * kwargs.get("mul", 1)
+
+
+	async def aload(self, value, **kwargs):
+		file_name = self.metadata.file_path.name if(self.metadata.file_path is not None) else None
+
+		AsyncTestProcessor.IN_FLIGHT += 1
+		AsyncTestProcessor.MAX_IN_FLIGHT = max(AsyncTestProcessor.MAX_IN_FLIGHT, AsyncTestProcessor.IN_FLIGHT)
+		await asyncio.sleep(0.01)
+		AsyncTestProcessor.IN_FLIGHT -= 1
+
+		# The metadata must still belong to the awaiting task
+		if self.metadata.file_path is not None and self.metadata.file_path.name != file_name:
+			raise Exception("Wrong file.")
+
+		return self.CLASS(value) * kwargs.get("mul", 1)
+
+
+
+class FileNameTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "file_name"
+
+	def load(self, value, **kwargs):
+		return self.metadata.file_path.name
+
+
+
+class AsyncLoadTest(unittest.IsolatedAsyncioTestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.TMP_DIR = tempfile.TemporaryDirectory()
+		cls.FILE_PATHS = []
+
+		for i in range(8):
+			file_path = Path(cls.TMP_DIR.name) / f"file{i}.junk"
+			file_path.write_text(
+				f"{{index: {i}, name: (file_name), values: [" + ", ".join(f"(async_test, mul=2) {j}" for j in range(10)) + "], "
+				f"nested: (set) [(async_test) {i}, (int) \"1\"], kwargs: (async_test, mul=(async_test) 3) {i}}}"
+			)
+			cls.FILE_PATHS.append(file_path)
+
+		cls.SIMPLE_FILE_PATH = Path(__file__).parent / "test_files/test_file_simple.junk"
+
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.TMP_DIR.cleanup()
+
+
+	def setUp(self):
+		AsyncTestProcessor.IN_FLIGHT = 0
+		AsyncTestProcessor.MAX_IN_FLIGHT = 0
+
+
+	async def test_results(self):
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				parser = JunkParser([AsyncTestProcessor, FileNameTestProcessor], backend=backend)
+
+				for file_path in self.FILE_PATHS + [self.SIMPLE_FILE_PATH]:
+					expected = parser.load_file(file_path)
+
+					self.assertEqual(await parser.aload_file(file_path), expected)
+					self.assertEqual(await parser.aload(open(file_path, "rt")), expected)
+
+				self.assertEqual(await parser.aloads("[(async_test) 1, (async_test, mul=3) 2]"), [1, 6])
+
+
+	async def test_concurrency(self):
+		parser = JunkParser([AsyncTestProcessor, FileNameTestProcessor])
+
+		data = await parser.aload_file(self.FILE_PATHS[0])
+
+		self.assertEqual(data["values"], [2 * j for j in range(10)])
+		self.assertEqual(data["nested"], {0, 1})
+		self.assertEqual(data["kwargs"], 0)
+		self.assertGreaterEqual(AsyncTestProcessor.MAX_IN_FLIGHT, 10)
+
+
+	async def test_metadata_per_task(self):
+		parser = JunkParser([AsyncTestProcessor, FileNameTestProcessor])
+
+		results = await asyncio.gather(*(parser.aload_file(file_path) for file_path in self.FILE_PATHS * 4))
+
+		for file_path, data in zip(self.FILE_PATHS * 4, results):
+			self.assertEqual(data["name"], file_path.name)
+			self.assertEqual(data["kwargs"], data["index"] * 3)
+
+
+	async def test_result_cache(self):
+		result_cache = JunkResultCache()
+		parser = JunkParser([AsyncTestProcessor, FileNameTestProcessor], result_cache=result_cache)
+
+		first = await parser.aload_file(self.FILE_PATHS[1])
+		second = await parser.aload_file(self.FILE_PATHS[1])
+
+		self.assertEqual(first, second)
+		self.assertEqual((result_cache.hits, result_cache.misses), (1, 1))
+
+
+	async def test_errors(self):
+		parser = JunkParser([AsyncTestProcessor])
+
+		with self.assertRaises(ValueError):
+			await parser.aloads('[(async_test) "a"]')
+
+		with self.assertRaises(ValueError):
+			await parser.aloads("[(unknown_type) 1]")
+
+
+	async def test_default_parser(self):
+		self.assertEqual(await junkpy.aload_file(self.SIMPLE_FILE_PATH), junkpy.load_file(self.SIMPLE_FILE_PATH))
+		self.assertEqual(await junkpy.aloads("{a: (int) 1}"), {"a": 1})
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkResultCache, JunkTypeProcessor
+from lark.exceptions import UnexpectedInput
+from pathlib import Path
+from pydantic import BaseModel
+import pickle
+import tempfile
+import unittest
+
+
+
+class BatchTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "batch_test"
+
+	def load(self, value, **kwargs):
+		return self.CLASS(value) * kwargs.get("mul", 1)
+
+
+
+class BatchTestParser(JunkParser):
+	def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+		return {
+			"file_name": metadata.file_path.name,
+			"data": parsed_data
+		}
+
+
+
+class BatchTestModel(BaseModel):
+	file_name: str
+	data: list
+
+
+
+class BatchLoadTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.TMP_DIR = tempfile.TemporaryDirectory()
+		cls.FILE_PATHS = []
+		
+		for i in range(12):
+			file_path = Path(cls.TMP_DIR.name) / f"file{i}.junk"
+			file_path.write_text(f"[{i}, (batch_test, mul=2) {i}, # Comment\n]")
+			cls.FILE_PATHS.append(file_path)
+
+		cls.INVALID_FILE_PATH = Path(cls.TMP_DIR.name) / "invalid.junk"
+		cls.INVALID_FILE_PATH.write_text("[1,\n2 3]")
+		cls.MISSING_FILE_PATH = Path(cls.TMP_DIR.name) / "missing.junk"
+
+		cls.EXECUTORS = ["thread", "process"]
+
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.TMP_DIR.cleanup()
+
+
+	def test_pickling(self):
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				parser = BatchTestParser([BatchTestProcessor], backend=backend, result_cache=JunkResultCache(max_entries=3))
+				parser.load_file(self.FILE_PATHS[0])
+				
+				unpickled_parser = pickle.loads(pickle.dumps(parser))
+				
+				self.assertIsInstance(unpickled_parser, BatchTestParser)
+				self.assertEqual(unpickled_parser.load_file(self.FILE_PATHS[1]), parser.load_file(self.FILE_PATHS[1]))
+				self.assertEqual(unpickled_parser._result_cache.max_entries, 3)
+				self.assertIsNot(unpickled_parser._type_processors_keyword_dict["batch_test"], parser._type_processors_keyword_dict["batch_test"])
+
+
+	def test_load_files(self):
+		parser = BatchTestParser([BatchTestProcessor])
+		expected = {file_path: parser.load_file(file_path) for file_path in self.FILE_PATHS}
+
+		for executor in self.EXECUTORS:
+			with self.subTest(executor=executor):
+				results = parser.load_files(self.FILE_PATHS, workers=2, executor=executor)
+				
+				self.assertEqual(list(results), self.FILE_PATHS)
+				self.assertEqual(results, expected)
+
+
+	def test_validate_to(self):
+		parser = BatchTestParser([BatchTestProcessor])
+
+		for executor in self.EXECUTORS:
+			with self.subTest(executor=executor):
+				results = parser.load_files(self.FILE_PATHS[:4], validate_to=BatchTestModel, workers=2, executor=executor)
+				
+				for file_path, result in results.items():
+					self.assertIsInstance(result, BatchTestModel)
+					self.assertEqual(result.file_name, file_path.name)
+
+
+	def test_error_capture(self):
+		parser = JunkParser([BatchTestProcessor])
+		file_paths = [self.FILE_PATHS[0], self.INVALID_FILE_PATH, self.MISSING_FILE_PATH, self.FILE_PATHS[1]]
+
+		for executor in self.EXECUTORS:
+			with self.subTest(executor=executor):
+				results = parser.load_files(file_paths, workers=2, executor=executor)
+
+				self.assertEqual(list(results), file_paths)
+				self.assertEqual(results[self.FILE_PATHS[0]], [0, 0])
+				self.assertEqual(results[self.FILE_PATHS[1]], [1, 2])
+				self.assertIsInstance(results[self.INVALID_FILE_PATH], UnexpectedInput)
+				self.assertEqual((results[self.INVALID_FILE_PATH].line, results[self.INVALID_FILE_PATH].column), (2, 3))
+				self.assertIsInstance(results[self.MISSING_FILE_PATH], FileNotFoundError)
+
+				with self.assertRaises(UnexpectedInput):
+					parser.load_files(file_paths, workers=2, executor=executor, raise_errors=True)
+
+
+	def test_unsupported_executor(self):
+		with self.assertRaises(ValueError):
+			JunkParser().load_files(self.FILE_PATHS, executor="unknown")
+
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+from benchmarks import JunkDocumentSpec, compare, generate_document
+from benchmarks.generator import TYPED_VALUE_SAMPLES
+from benchmarks.suite import EXTENSION_TYPE_PROCESSORS, measure
+from junkpy import JunkParser
+import unittest
+
+
+
+class BenchmarksTest(unittest.TestCase):
+	def test_generated_documents(self):
+		parser = JunkParser(EXTENSION_TYPE_PROCESSORS)
+
+		for spec in [
+			JunkDocumentSpec(size=5),
+			JunkDocumentSpec(size=20, depth=4, keys=3, typed_density=1, comment_density=1, string_length=64, seed=1),
+			JunkDocumentSpec(size=1, depth=0, typed_keywords=["mass"]),
+		]:
+			with self.subTest(spec=spec):
+				document = generate_document(spec)
+				self.assertEqual(document, generate_document(spec))
+
+				data = parser.loads(document)
+				self.assertEqual(len(data), spec.size)
+				self.assertEqual(JunkParser(EXTENSION_TYPE_PROCESSORS, backend="scanner").loads(document), data)
+
+
+	def test_typed_value_samples(self):
+		parser = JunkParser(EXTENSION_TYPE_PROCESSORS)
+
+		for keyword, sample in TYPED_VALUE_SAMPLES.items():
+			with self.subTest(keyword=keyword):
+				parser.loads("[" + (sample if(sample.startswith("(")) else f"({keyword}) {sample}") + "]")
+
+
+	def test_measure(self):
+		result = measure("test", "parse", lambda: JunkParser().loads("[1, 2]"), 6, 0.01, 2)
+
+		self.assertEqual(result.ops % 2, 0)
+		self.assertGreater(result.ops_per_second, 0)
+		self.assertAlmostEqual(result.mb_per_second, result.ops / 2 * 6 / result.seconds / 1e6)
+		self.assertGreater(result.peak_memory, 0)
+
+
+	def test_compare(self):
+		baseline = {"results": [
+			{"name": "a", "ops_per_second": 100.0},
+			{"name": "b", "ops_per_second": 100.0},
+			{"name": "c", "ops_per_second": 100.0},
+		]}
+		results = {"results": [
+			{"name": "a", "ops_per_second": 95.0},
+			{"name": "b", "ops_per_second": 50.0},
+			{"name": "d", "ops_per_second": 1.0},
+		]}
+
+		regressions = compare(results, baseline, threshold=0.1)
+		self.assertEqual([regression.name for regression in regressions], ["b"])
+		self.assertAlmostEqual(regressions[0].change, -0.5)
+		self.assertEqual([regression.name for regression in compare(results, baseline, threshold=0.01)], ["a", "b"])
+
+
+
+if __name__ == "__main__":
+	unittest.main()
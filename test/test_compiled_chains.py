@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor
+import asyncio
+import unittest
+
+
+
+class CountingTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "counting"
+	CALLS = 0
+
+	def load(self, value, prefix="", **kwargs):
+		CountingTestProcessor.CALLS += 1
+		return f"{prefix}{value}"
+
+
+
+class WrongOutputTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "wrong_output"
+
+	def load(self, value, **kwargs):
+		return str(value)
+
+
+
+class CompiledChainsTest(unittest.TestCase):
+	def setUp(self):
+		CountingTestProcessor.CALLS = 0
+
+
+	def test_same_results(self):
+		string = '[(string) (int) 99.99, (counting, prefix="a") (counting) (int) "1", (counting, prefix=["x"]) 2, (counting, prefix=(string) 3) (float) "4", (string) (counting) ]'
+		expected = ["99", "a1", "['x']2", "34.0", "None"]
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				parser = JunkParser([CountingTestProcessor], backend=backend)
+				self.assertEqual(parser.loads(string), expected)
+				self.assertEqual(parser.loads(string), expected)
+
+				self.assertEqual(JunkParser([CountingTestProcessor], backend=backend, lazy=True).loads(string), expected)
+				self.assertEqual(asyncio.run(parser.aloads(string)), expected)
+
+		with self.assertRaises(ValueError):
+			JunkParser(backend="scanner").loads('[(string) (unknown) 1]')
+
+
+	def test_chains_compiled_once(self):
+		parser = JunkParser([CountingTestProcessor], backend="scanner")
+
+		parser.loads('[(string) (int) 1.5, (string) (int) 2.5, (counting, prefix="a") 1, (counting, prefix="b") 1, (counting, prefix=["c"]) 1]')
+		self.assertEqual(set(parser._compiled_chains), {("string", "int"), (("counting", ("prefix", (str, "a"))),), (("counting", ("prefix", (str, "b"))),)})
+
+		load_chain = parser._compiled_chains[("string", "int")]
+		self.assertEqual(parser.loads('{a: (string) (int) 3.5}'), {"a": "3"})
+		self.assertIs(parser._compiled_chains[("string", "int")], load_chain)
+
+		# Type processors run on every load unless memoized
+		self.assertEqual(CountingTestProcessor.CALLS, 3)
+		parser.loads('[(counting, prefix="a") 1]')
+		self.assertEqual(CountingTestProcessor.CALLS, 4)
+
+		parser = JunkParser([CountingTestProcessor], backend="scanner", type_memo_size=16, type_memo_keywords=["counting"])
+		self.assertEqual(parser.loads('[(string) (counting) 1, (string) (counting) 1]'), ["1", "1"])
+		self.assertEqual(CountingTestProcessor.CALLS, 5)
+
+		# Equal modifiers loading differently get their own chains
+		self.assertEqual(parser.loads('[(counting, prefix=0.0) 1, (counting, prefix=-0.0) 1, (counting, prefix=0) 1]'), ["0.01", "-0.01", "01"])
+
+		with parser.profile() as report:
+			parser.loads('[(string) (int) 1.5]')
+
+		self.assertEqual(set(report.processors), {"string", "int"})
+
+
+	def test_check_output_types(self):
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				for string in ('[(wrong_output) 1]', '[(string) (wrong_output) 1]', '[(wrong_output, base=2) (string) 1]'):
+					with self.assertRaises(TypeError):
+						JunkParser([WrongOutputTestProcessor], backend=backend).loads(string)
+
+				parser = JunkParser([WrongOutputTestProcessor], backend=backend, check_output_types=False)
+				self.assertEqual(parser.loads('[(wrong_output) 1, (string) (wrong_output) 2]'), ["1", "2"])
+				self.assertEqual(asyncio.run(parser.aloads('[(wrong_output) 1]')), ["1"])
+				self.assertEqual(JunkParser([WrongOutputTestProcessor], backend=backend, lazy=True, check_output_types=False).loads('[(wrong_output) 1]'), ["1"])
+
+
+
+if __name__ == "__main__":
+	unittest.main()
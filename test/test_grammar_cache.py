@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import junkpy
+from junkpy import JunkParser
+from junkpy import base
+from pathlib import Path
+import tempfile
+import unittest
+
+
+
+class GrammarCacheTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.FILE_PATH = Path(__file__).parent / "test_files/test_file_simple.junk"
+		cls.DATA_AS_STRING = """
+			{
+				key1: 1,
+				"key2": (string) 2,
+			}
+		"""
+		cls.EXPECTED_DATA = {"key1": 1, "key2": "2"}
+		cls.ITERATIONS = 256
+
+
+	def test_shared_grammar(self):
+		parsers = [JunkParser() for _ in range(self.ITERATIONS)]
+		compiled_grammars = len(base._COMPILED_GRAMMARS)
+
+		for parser in parsers:
+			self.assertEqual(parser.loads(self.DATA_AS_STRING), self.EXPECTED_DATA)
+
+		self.assertEqual(len(base._COMPILED_GRAMMARS), compiled_grammars)
+
+
+	def test_transformer_per_instance(self):
+		parser1 = JunkParser()
+		parser2 = JunkParser()
+		
+		self.assertIsNot(parser1._get_lark_parser(), parser2._get_lark_parser())
+		self.assertIs(parser1._get_lark_parser(), parser1._get_lark_parser())
+
+
+	def test_on_disk_cache(self):
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			cache_file = Path(tmp_dir) / "junk_grammar.cache"
+
+			class CachedParser(JunkParser):
+				GRAMMAR_CACHE = str(cache_file)
+
+			self.assertEqual(CachedParser().loads(self.DATA_AS_STRING), self.EXPECTED_DATA)
+			self.assertTrue(cache_file.exists())
+
+
+	def test_default_parser(self):
+		self.assertEqual(junkpy.loads(self.DATA_AS_STRING), self.EXPECTED_DATA)
+		self.assertEqual(junkpy.load_file(self.FILE_PATH), JunkParser().load_file(self.FILE_PATH))
+		self.assertEqual(junkpy.load(open(self.FILE_PATH, "rt")), JunkParser().load_file(self.FILE_PATH))
+
+
+
+if __name__ == '__main__':
+	unittest.main()
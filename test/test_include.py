@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkResultCache, JunkTypeProcessor
+from junkpy.include import JunkIncludeCache, JunkIncludeGraph
+from pathlib import Path
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+
+
+class IncludeTestParser(JunkParser):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.parsed_files = []
+		self.lock = threading.Lock()
+
+
+	def before_parsing(self, metadata: JunkMetadata):
+		with self.lock:
+			self.parsed_files.append(metadata.file_path.name if(metadata.file_path is not None) else None)
+
+
+
+class SlowIncludeTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "slow_include_test"
+
+	def load(self, value, **kwargs):
+		time.sleep(0.2)
+		return self.CLASS(value)
+
+
+
+class IncludeTest(unittest.TestCase):
+	def setUp(self):
+		self.TMP_DIR = tempfile.TemporaryDirectory()
+		self.WRITES = 0
+		self.ROOT = Path(self.TMP_DIR.name)
+		(self.ROOT / "common").mkdir()
+
+		self.write("main.junk", '{a: (include) "common/a.junk", b: (include) "common/b.junk", c: [(include) "common/shared.junk"]}')
+		self.write("common/a.junk", '{name: "a", shared: (include) "shared.junk"}')
+		self.write("common/b.junk", '{name: "b", shared: (include) "shared.junk"}')
+		self.write("common/shared.junk", '{value: (int) "1", list: [1, 2]}')
+
+		self.SHARED = {"value": 1, "list": [1, 2]}
+		self.EXPECTED = {
+			"a": {"name": "a", "shared": self.SHARED},
+			"b": {"name": "b", "shared": self.SHARED},
+			"c": [self.SHARED],
+		}
+
+
+	def tearDown(self):
+		self.TMP_DIR.cleanup()
+
+
+	def write(self, name: str, data: str):
+		file_path = self.ROOT / name
+		file_path.write_text(data)
+		# Changes must be visible to fingerprints even within the same clock tick
+		self.WRITES += 1
+		os.utime(file_path, ns=(0, self.WRITES))
+
+
+	def test_include(self):
+		parser = IncludeTestParser()
+		data = parser.load_file(self.ROOT / "main.junk")
+
+		self.assertEqual(data, self.EXPECTED)
+		self.assertEqual(sorted(parser.parsed_files), ["a.junk", "b.junk", "main.junk", "shared.junk"])
+
+		# Included data is not shared between its occurrences
+		data["a"]["shared"]["list"].append(3)
+		self.assertEqual(data["b"]["shared"]["list"], [1, 2])
+		self.assertEqual(data["c"], [self.SHARED])
+
+
+	def test_dependency_graph(self):
+		graph = {}
+
+		class GraphTestParser(JunkParser):
+			def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+				if metadata.file_path.name == "main.junk":
+					graph["includes"] = metadata.includes
+
+				return parsed_data
+
+		GraphTestParser().load_file(self.ROOT / "main.junk")
+		includes = graph["includes"]
+		common = (self.ROOT / "common").resolve()
+
+		self.assertEqual(includes.root, (self.ROOT / "main.junk").resolve())
+		self.assertEqual(includes.edges, {
+			includes.root: [common / "a.junk", common / "b.junk", common / "shared.junk"],
+			common / "a.junk": [common / "shared.junk"],
+			common / "b.junk": [common / "shared.junk"],
+		})
+		self.assertEqual(includes.files, {common / "a.junk", common / "b.junk", common / "shared.junk"})
+
+
+	def test_cache(self):
+		parser = IncludeTestParser()
+		parser.load_file(self.ROOT / "main.junk")
+
+		parser.parsed_files.clear()
+		self.assertEqual(parser.load_file(self.ROOT / "main.junk"), self.EXPECTED)
+		self.assertEqual(parser.parsed_files, ["main.junk"])
+
+		# Files including a changed file are parsed again
+		self.write("common/shared.junk", '{value: (int) "2"}')
+		parser.parsed_files.clear()
+		data = parser.load_file(self.ROOT / "main.junk")
+
+		self.assertEqual(data["a"]["shared"], {"value": 2})
+		self.assertEqual(sorted(parser.parsed_files), ["a.junk", "b.junk", "main.junk", "shared.junk"])
+
+
+	def test_result_cache(self):
+		result_cache = JunkResultCache()
+		parser = IncludeTestParser(result_cache=result_cache)
+		self.assertEqual(parser.load_file(self.ROOT / "main.junk"), self.EXPECTED)
+		self.assertEqual(parser.load_file(self.ROOT / "main.junk"), self.EXPECTED)
+		self.assertEqual(result_cache.hits, 1)
+
+		# Cached results are outdated by changes to the files they include
+		self.write("common/shared.junk", '{value: (int) "2"}')
+		data = parser.load_file(self.ROOT / "main.junk")
+		self.assertEqual(data["c"], [{"value": 2}])
+		self.assertEqual(result_cache.misses, 2)
+
+		self.write("common/a.junk", '{name: "a2"}')
+		result_cache.invalidate(self.ROOT / "common/a.junk")
+		self.assertEqual(len(result_cache), 0)
+		self.assertEqual(parser.load_file(self.ROOT / "main.junk")["a"], {"name": "a2"})
+
+
+	def test_prefetch(self):
+		graph = JunkIncludeGraph(JunkParser(), JunkIncludeCache(), None)
+		graph.prefetch(self.ROOT / "main.junk", '{a: (include) "missing/a.junk", # b: (include) "missing/b.junk"\n c: "(include) \\"missing/c.junk\\"", d: ("include") "missing/d.junk"}')
+
+		# Directives within comments and strings are not prefetched
+		self.assertEqual(set(graph._tasks), {(self.ROOT / "missing/a.junk").resolve(), (self.ROOT / "missing/d.junk").resolve()})
+
+
+	def test_bounded_cache(self):
+		parser = IncludeTestParser()
+		include_cache = parser._type_processors_keyword_dict["include"].cache
+		include_cache.max_entries = 2
+
+		self.assertEqual(parser.load_file(self.ROOT / "main.junk"), self.EXPECTED)
+		self.assertEqual(len(include_cache), 2)
+
+		# Files including evicted ones are loaded again
+		parser.parsed_files.clear()
+		self.assertEqual(parser.load_file(self.ROOT / "main.junk"), self.EXPECTED)
+		self.assertIn("shared.junk", parser.parsed_files)
+		self.assertEqual(len(include_cache), 2)
+
+
+	def test_cycles(self):
+		self.write("common/shared.junk", '{back: (include) "a.junk"}')
+		with self.assertRaisesRegex(ValueError, "Include cycle"):
+			JunkParser().load_file(self.ROOT / "main.junk")
+
+		self.write("common/shared.junk", '{self: (include) "shared.junk"}')
+		with self.assertRaisesRegex(ValueError, "Include cycle"):
+			JunkParser().load_file(self.ROOT / "common/shared.junk")
+
+		self.write("common/shared.junk", '{root: (include) "../main.junk"}')
+		with self.assertRaisesRegex(ValueError, "Include cycle"):
+			JunkParser().load_file(self.ROOT / "main.junk")
+
+
+	def test_errors(self):
+		self.write("common/b.junk", '{missing: (include) "missing.junk"}')
+		with self.assertRaises(FileNotFoundError):
+			JunkParser().load_file(self.ROOT / "main.junk")
+
+
+	def test_concurrent_includes(self):
+		for name in ("one", "two", "three", "four"):
+			self.write(f"{name}.junk", f'{{name: (slow_include_test) "{name}"}}')
+
+		self.write("main.junk", '[(include) "one.junk", (include) "two.junk", (include) "three.junk", (include) "four.junk"]')
+
+		start = time.perf_counter()
+		data = JunkParser([SlowIncludeTestProcessor]).load_file(self.ROOT / "main.junk")
+
+		self.assertEqual(data, [{"name": "one"}, {"name": "two"}, {"name": "three"}, {"name": "four"}])
+		self.assertLess(time.perf_counter() - start, 0.6)
+
+
+	def test_loads(self):
+		cwd = os.getcwd()
+		os.chdir(self.ROOT)
+
+		try:
+			self.assertEqual(JunkParser().loads('[(include) "common/shared.junk"]'), [self.SHARED])
+
+		finally:
+			os.chdir(cwd)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
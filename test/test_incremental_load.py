@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor
+from junkpy.scanner import JunkSyntaxError
+from pathlib import Path
+import os
+import tempfile
+import unittest
+
+
+
+class CountingPureTestProcessor(JunkTypeProcessor):
+	CLASS = object
+	KEYWORD = "counting_pure"
+	PURE = True
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		CountingPureTestProcessor.CALLS += 1
+		return ("pure", value)
+
+
+
+class CountingImpureTestProcessor(JunkTypeProcessor):
+	CLASS = object
+	KEYWORD = "counting_impure"
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		CountingImpureTestProcessor.CALLS += 1
+		return os.environ.get(value)
+
+
+
+DOCUMENT = """{
+	servers: [
+		{name: "a", port: 80, tags: ["x", "y"]},  # First
+		{name: "b", port: (counting_pure) 81, backup: null, empty: },
+	],
+	limits: {cpu: 1.5, memory: (counting_pure) "1G"},
+	flag: true
+}
+"""
+
+
+
+class IncrementalLoadTest(unittest.TestCase):
+	def setUp(self):
+		CountingPureTestProcessor.CALLS = 0
+		CountingImpureTestProcessor.CALLS = 0
+		os.environ["JUNK_INCREMENTAL_TEST"] = "first"
+		self.PARSER = JunkParser([CountingPureTestProcessor, CountingImpureTestProcessor], backend="scanner")
+
+
+	def tearDown(self):
+		os.environ.pop("JUNK_INCREMENTAL_TEST", None)
+
+
+	def test_first_load(self):
+		result = self.PARSER.loads_incremental(DOCUMENT)
+
+		self.assertEqual(result.data, self.PARSER.loads(DOCUMENT))
+		self.assertEqual(result.changed, [()])
+		self.assertEqual(result.reparsed, ())
+
+
+	def test_reuse_unchanged_values(self):
+		previous = self.PARSER.loads_incremental(DOCUMENT)
+		CountingPureTestProcessor.CALLS = 0
+		CountingImpureTestProcessor.CALLS = 0
+
+		string = DOCUMENT.replace("port: 80", "port: 8080")
+		result = self.PARSER.loads_incremental(string, previous)
+		self.assertEqual((CountingPureTestProcessor.CALLS, CountingImpureTestProcessor.CALLS), (0, 0))
+
+		self.assertEqual(result.data, self.PARSER.loads(string))
+		self.assertEqual(result.changed, [("servers", 0, "port")])
+		self.assertEqual(result.reparsed, ("servers", 0))
+
+		# Untouched values are shared with the previous result, which is left unchanged
+		self.assertIs(result.data["limits"], previous.data["limits"])
+		self.assertIs(result.data["servers"][1], previous.data["servers"][1])
+		self.assertIs(result.data["servers"][0]["tags"], previous.data["servers"][0]["tags"])
+		self.assertEqual(previous.data["servers"][0]["port"], 80)
+
+
+	def test_edits(self):
+		edits = [
+			("port: 80", "port: 801", [("servers", 0, "port")], ("servers", 0)),
+			('"a"', '"c"', [("servers", 0, "name")], ("servers", 0)),
+			("tags: [", "labels: [", [("servers", 0, "labels"), ("servers", 0, "tags")], ("servers", 0)),
+			('["x", "y"]', '["x", "y", "z"]', [("servers", 0, "tags")], ("servers", 0, "tags")),
+			("cpu: 1.5", "cpu: 2, gpu: 1", [("limits", "cpu"), ("limits", "gpu")], ("limits",)),
+			("(counting_pure) 81", "(counting_pure) 82", [("servers", 1, "port")], ("servers", 1)),
+			("# First", "# Comment", [], ("servers",)),
+			("backup: null", "backup: {}", [("servers", 1, "backup")], ("servers", 1)),
+			("flag: true", "flag: false, extra: [1]", [("flag",), ("extra",)], ()),
+			("}\n", "}\n# Trailing comment\n", [], None),
+			("\t],", "\t\t{name: \"c\"}\n\t],", [("servers",)], ("servers",)),
+		]
+
+		for old, new, changed, reparsed in edits:
+			with self.subTest(edit=new):
+				previous = self.PARSER.loads_incremental(DOCUMENT)
+				string = DOCUMENT.replace(old, new)
+				result = self.PARSER.loads_incremental(string, previous)
+
+				self.assertEqual(result.data, self.PARSER.loads(string))
+				self.assertEqual(result.changed, changed)
+				self.assertEqual(result.reparsed, reparsed)
+
+
+	def test_successive_edits(self):
+		string = DOCUMENT
+		result = self.PARSER.loads_incremental(string)
+
+		for old, new in [("port: 80", "port: 90"), ("port: 90", "port: 100"), ('"y"]', '"y", "z"]'), ("flag: true", "flag: 1"), ("name: \"b\"", "name: \"d\"")]:
+			string = string.replace(old, new)
+			result = self.PARSER.loads_incremental(string, result)
+			self.assertEqual(result.data, self.PARSER.loads(string))
+
+
+	def test_structural_edits(self):
+		previous = self.PARSER.loads_incremental(DOCUMENT)
+
+		# The closing bracket of the edited container moves, so the whole string is parsed again
+		string = DOCUMENT.replace('tags: ["x", "y"]}', 'tags: ["x"]}, {tags: ["y"]}')
+		result = self.PARSER.loads_incremental(string, previous)
+		self.assertEqual(result.data, self.PARSER.loads(string))
+		self.assertEqual(result.reparsed, ())
+
+		string = "[1, 2]"
+		result = self.PARSER.loads_incremental(string, previous)
+		self.assertEqual(result.data, [1, 2])
+		self.assertEqual(result.changed, [()])
+
+
+	def test_impure_type_processors(self):
+		string = DOCUMENT.replace("flag: true", 'home: (counting_impure) "JUNK_INCREMENTAL_TEST"')
+		previous = self.PARSER.loads_incremental(string)
+		os.environ["JUNK_INCREMENTAL_TEST"] = "second"
+
+		result = self.PARSER.loads_incremental(string, previous)
+		self.assertEqual(result.data["home"], "second")
+		self.assertEqual(result.changed, [("home",)])
+		self.assertEqual(CountingImpureTestProcessor.CALLS, 2)
+
+		# Impure type processors run again when other values are edited, which are still reused
+		CountingPureTestProcessor.CALLS = 0
+		string = string.replace("cpu: 1.5", "cpu: 2")
+		result = self.PARSER.loads_incremental(string, result)
+		self.assertEqual((CountingPureTestProcessor.CALLS, CountingImpureTestProcessor.CALLS), (0, 3))
+		self.assertEqual(result.data, self.PARSER.loads(string))
+		self.assertEqual(result.changed, [("limits", "cpu")])
+		self.assertEqual(result.reparsed, ())
+		self.assertIs(result.data["servers"], previous.data["servers"])
+
+		# Unchanged strings without impure type processors are not parsed again
+		previous = self.PARSER.loads_incremental(DOCUMENT)
+		result = self.PARSER.loads_incremental(DOCUMENT, previous)
+		self.assertIs(result.data, previous.data)
+		self.assertEqual((result.changed, result.reparsed), ([], None))
+
+
+	def test_syntax_errors(self):
+		previous = self.PARSER.loads_incremental(DOCUMENT)
+
+		for string in (DOCUMENT.replace("port: 80", "port: 80 81"), DOCUMENT.replace('"1G"}', '"1G"'), DOCUMENT.replace("flag: true", "flag: tru")):
+			with self.subTest(string=string):
+				with self.assertRaises(JunkSyntaxError) as context:
+					self.PARSER.loads_incremental(string, previous)
+
+				with self.assertRaises(JunkSyntaxError) as expected_context:
+					self.PARSER.loads(string)
+
+				self.assertEqual(str(context.exception), str(expected_context.exception))
+
+
+	def test_load_file_incremental(self):
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			file_path = Path(tmp_dir) / "config.junk"
+			file_path.write_text(DOCUMENT)
+			previous = self.PARSER.load_file_incremental(file_path)
+
+			file_path.write_text(DOCUMENT.replace("cpu: 1.5", "cpu: 3"))
+			result = self.PARSER.load_file_incremental(file_path, previous)
+
+		self.assertEqual(result.data["limits"]["cpu"], 3)
+		self.assertEqual(result.changed, [("limits", "cpu")])
+
+
+	def test_unsupported(self):
+		with self.assertRaises(ValueError):
+			JunkParser(lazy=True).loads_incremental("[1]")
+
+
+
+if __name__ == "__main__":
+	unittest.main()
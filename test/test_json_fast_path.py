@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser
+from lark.exceptions import UnexpectedInput
+from pathlib import Path
+import unittest
+
+
+
+class JsonFastPathTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		class PathRecordingParser(JunkParser):
+			def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+				self.last_parsing_path = metadata.parsing_path
+				return parsed_data
+
+		cls.PARSER = PathRecordingParser()
+		cls.REFERENCE_PARSER = JunkParser(json_fast_path=False)
+		cls.FILE_PATH_JSON = Path(__file__).parent / "test_files/test_file_simple.junk"
+		cls.FILE_PATH_JUNK = Path(__file__).parent / "test_files/test_file_builtin_forced_types.junk"
+		cls.JSON_DATA = [
+			'{"a": 1, "b": -2.5e3, "c": [true, false, null], "d": {"e": "f"}, "a": 2}',
+			'[1, 1.0, -0, "", "x # (not) junk", {}, []]',
+			'"string"',
+			'  12345678901234567890  ',
+		]
+		cls.JUNK_DATA = [
+			'{a: 1}',
+			'[1, 2,]',
+			'{"a": }',
+			'[1, # comment\n 2]',
+			'[(int) "1"]',
+			r'["a\nb", "\u00e9", "\""]',
+			'[+1, .5, 1., 01]',
+			'[1,\f2]',
+		]
+		cls.INVALID_DATA = ['[NaN]', '[Infinity]', '[-Infinity]', '{"a": 1', '']
+
+
+	def test_json_data(self):
+		for data in self.JSON_DATA:
+			with self.subTest(data=data):
+				self.assertEqual(self.PARSER.loads(data), self.REFERENCE_PARSER.loads(data))
+				self.assertEqual(self.PARSER.last_parsing_path, "json")
+
+
+	def test_junk_data(self):
+		for data in self.JUNK_DATA:
+			with self.subTest(data=data):
+				self.assertEqual(self.PARSER.loads(data), self.REFERENCE_PARSER.loads(data))
+				self.assertEqual(self.PARSER.last_parsing_path, "lark")
+
+
+	def test_invalid_data(self):
+		for data in self.INVALID_DATA:
+			with self.subTest(data=data):
+				with self.assertRaises(UnexpectedInput):
+					self.PARSER.loads(data)
+
+
+	def test_files(self):
+		self.assertEqual(self.PARSER.load_file(self.FILE_PATH_JSON), self.REFERENCE_PARSER.load_file(self.FILE_PATH_JSON))
+		self.assertEqual(self.PARSER.last_parsing_path, "json")
+
+		self.assertEqual(self.PARSER.load_file(self.FILE_PATH_JUNK), self.REFERENCE_PARSER.load_file(self.FILE_PATH_JUNK))
+		self.assertEqual(self.PARSER.last_parsing_path, "lark")
+
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+from junkpy import JunkLazyDict, JunkLazyList, JunkLazyValue, JunkParser, JunkResultCache, JunkTypeProcessor, resolve_all
+from pathlib import Path
+from pydantic import BaseModel
+import copy
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+
+
+
+class CountingTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "counting"
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		CountingTestProcessor.CALLS += 1
+		return self.CLASS(value) * kwargs.get("mul", 1)
+
+
+
+class FileNameTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "file_name"
+
+	def load(self, value, **kwargs):
+		return self.metadata.file_path.name
+
+
+
+class WrongTypeTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "wrong_type"
+
+	def load(self, value, **kwargs):
+		return str(value)
+
+
+
+class SlowTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "slow"
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		SlowTestProcessor.CALLS += 1
+		time.sleep(0.05)
+		return self.CLASS(value)
+
+
+
+class LazyTestModel(BaseModel):
+	a: int
+	b: list
+
+
+
+class LazyLoadTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.TMP_DIR = tempfile.TemporaryDirectory()
+		cls.FILE_PATH = Path(cls.TMP_DIR.name) / "lazy.junk"
+		cls.FILE_PATH.write_text('{a: (counting) 1, b: [(counting, mul=(counting) 2) 3, "x"], c: {d: (set) [(counting) 4]}, name: (file_name)}')
+
+		cls.SIMPLE_FILE_PATH = Path(__file__).parent / "test_files/test_file_simple.junk"
+		cls.CUSTOM_FILE_PATH = Path(__file__).parent / "test_files/test_file_builtin_forced_types.junk"
+
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.TMP_DIR.cleanup()
+
+
+	def setUp(self):
+		CountingTestProcessor.CALLS = 0
+
+
+	def test_on_access(self):
+		parser = JunkParser([CountingTestProcessor, FileNameTestProcessor], lazy=True)
+		data = parser.load_file(self.FILE_PATH)
+
+		self.assertEqual(CountingTestProcessor.CALLS, 0)
+		self.assertIsInstance(data, JunkLazyDict)
+		self.assertIsInstance(data["b"], JunkLazyList)
+
+		self.assertEqual(data["a"], 1)
+		self.assertEqual(data["a"], 1)
+		self.assertEqual(CountingTestProcessor.CALLS, 1)
+
+		self.assertEqual(data["b"][1], "x")
+		self.assertEqual(CountingTestProcessor.CALLS, 1)
+
+		self.assertEqual(data["b"][0], 6)
+		self.assertEqual(CountingTestProcessor.CALLS, 3)
+
+		self.assertEqual(data["c"]["d"], {4})
+		self.assertEqual(data["name"], self.FILE_PATH.name)
+		self.assertEqual(CountingTestProcessor.CALLS, 4)
+
+
+	def test_resolve_all(self):
+		parser = JunkParser([CountingTestProcessor, FileNameTestProcessor], lazy=True)
+		data = parser.load_file(self.FILE_PATH)
+
+		resolve_all(data)
+
+		self.assertEqual(CountingTestProcessor.CALLS, 4)
+		self.assertFalse(any(isinstance(value, JunkLazyValue) for value in dict.values(data)))
+		self.assertEqual(data, JunkParser([CountingTestProcessor, FileNameTestProcessor]).load_file(self.FILE_PATH))
+
+
+	def test_same_results(self):
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				for file_path in [self.FILE_PATH, self.SIMPLE_FILE_PATH, self.CUSTOM_FILE_PATH]:
+					expected = JunkParser([CountingTestProcessor, FileNameTestProcessor], backend=backend).load_file(file_path)
+					data = JunkParser([CountingTestProcessor, FileNameTestProcessor], backend=backend, lazy=True).load_file(file_path)
+
+					self.assertEqual(data, expected)
+					self.assertEqual(copy.deepcopy(data), expected)
+					self.assertEqual(pickle.loads(pickle.dumps(data)), expected)
+
+
+	def test_output_type_checked_on_access(self):
+		data = JunkParser([WrongTypeTestProcessor], lazy=True).loads("[1, (wrong_type) 2]")
+
+		self.assertEqual(data[0], 1)
+		with self.assertRaises(TypeError):
+			data[1]
+
+
+	def test_validation_and_cache(self):
+		result_cache = JunkResultCache()
+		parser = JunkParser([CountingTestProcessor, FileNameTestProcessor], lazy=True, result_cache=result_cache)
+
+		model = parser.load_file(self.FILE_PATH, validate_to=LazyTestModel)
+		self.assertEqual(model.a, 1)
+		self.assertEqual(model.b, [6, "x"])
+
+		self.assertEqual(parser.load_file(self.FILE_PATH)["c"], {"d": {4}})
+		self.assertEqual(result_cache.hits, 1)
+
+
+	def test_copies(self):
+		parser = JunkParser([CountingTestProcessor], lazy=True)
+		string = '{a: (counting) 1, b: [(counting) 2, 3], c: 4}'
+		expected = {"a": 1, "b": [2, 3], "c": 4}
+
+		# Plain containers built from lazy ones never hold lazy values
+		for name, build in (
+			("dict", dict),
+			("unpacking", lambda data: {**data}),
+			("update", lambda data: (lambda result: result.update(data) or result)({})),
+			("or", lambda data: data | {}),
+			("ror", lambda data: {} | data),
+		):
+			with self.subTest(name=name):
+				data = build(parser.loads(string))
+				self.assertEqual(data, expected)
+				self.assertFalse(any(isinstance(value, JunkLazyValue) for value in dict.values(data)))
+
+		for name, build in (("add", lambda data: data + [5]), ("radd", lambda data: [5] + data), ("mul", lambda data: data * 2), ("rmul", lambda data: 2 * data)):
+			with self.subTest(name=name):
+				data = build(parser.loads(string)["b"])
+				self.assertIsInstance(data, JunkLazyList)
+				self.assertFalse(any(isinstance(value, JunkLazyValue) for value in list(data)))
+
+		# Copies stay lazy
+		CountingTestProcessor.CALLS = 0
+		data = parser.loads(string)
+		copied = data.copy()
+		self.assertIsInstance(copied, JunkLazyDict)
+		self.assertEqual(CountingTestProcessor.CALLS, 0)
+		self.assertEqual(copied["a"], 1)
+		self.assertEqual(data["a"], 1)
+		self.assertEqual(CountingTestProcessor.CALLS, 1)
+
+
+	def test_shared_between_threads(self):
+		SlowTestProcessor.CALLS = 0
+		data = JunkParser([SlowTestProcessor], lazy=True).loads('{a: (slow) 1}')
+		results = []
+		barrier = threading.Barrier(4)
+
+		def access():
+			barrier.wait()
+			results.append(data["a"])
+
+		threads = [threading.Thread(target=access) for _ in range(4)]
+		for thread in threads:
+			thread.start()
+
+		for thread in threads:
+			thread.join()
+
+		self.assertEqual(results, [1] * 4)
+		self.assertEqual(SlowTestProcessor.CALLS, 1)
+
+
+	def test_cache_shared_with_eager_parser(self):
+		for immutable in (False, True):
+			with self.subTest(immutable=immutable):
+				CountingTestProcessor.CALLS = 0
+				result_cache = JunkResultCache(immutable=immutable)
+				lazy_parser = JunkParser([CountingTestProcessor, FileNameTestProcessor], lazy=True, result_cache=result_cache)
+				parser = JunkParser([CountingTestProcessor, FileNameTestProcessor], result_cache=result_cache)
+
+				# Caching lazy results does not run their type processors
+				data = lazy_parser.load_file(self.FILE_PATH)
+				self.assertIsInstance(data, JunkLazyDict)
+				self.assertEqual(CountingTestProcessor.CALLS, 0)
+
+				self.assertIs(lazy_parser.load_file(self.FILE_PATH), data)
+				self.assertEqual(CountingTestProcessor.CALLS, 0)
+
+				eager_data = parser.load_file(self.FILE_PATH)
+				self.assertNotIsInstance(eager_data, JunkLazyDict)
+				self.assertEqual(CountingTestProcessor.CALLS, 4)
+				self.assertEqual((data["a"], data["name"]), (eager_data["a"], eager_data["name"]))
+				self.assertEqual((result_cache.hits, result_cache.misses), (1, 2))
+
+
+
+if __name__ == "__main__":
+	unittest.main()
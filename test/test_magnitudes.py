@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser
+from junkpy.extensions import JunkDataSizeTypeProcessor, JunkDistanceTypeProcessor, JunkDurationTypeProcessor, JunkMassTypeProcessor, JunkPressureTypeProcessor, JunkTemperatureTypeProcessor, magnitude_type_processor
+from decimal import Decimal
+import asyncio
+import pickle
+import unittest
+
+
+
+MAGNITUDE_TYPE_PROCESSORS = [JunkMassTypeProcessor, JunkDistanceTypeProcessor, JunkDurationTypeProcessor, JunkDataSizeTypeProcessor, JunkPressureTypeProcessor, JunkTemperatureTypeProcessor]
+
+
+
+class UnitDecimal(Decimal):
+	def __mul__(self, other):
+		return UnitDecimal(Decimal.__mul__(self, other))
+
+	def __truediv__(self, other):
+		return UnitDecimal(Decimal.__truediv__(self, other))
+
+
+
+class UnitDistanceTestProcessor(JunkDistanceTypeProcessor):
+	CLASS = UnitDecimal
+	KEYWORD = "unit_distance"
+
+
+
+class DecimalOnlyDistanceTestProcessor(JunkDistanceTypeProcessor):
+	KEYWORD = "decimal_only_distance"
+
+	def load(self, value, **kwargs):
+		return super().load(value, **{**kwargs, "mode": "decimal"})
+
+
+
+class ScalarOnlyDistanceTestProcessor(JunkDistanceTypeProcessor):
+	KEYWORD = "scalar_only_distance"
+
+	def load(self, value, **kwargs):
+		return super().load([value], **kwargs)
+
+
+
+class MagnitudesTest(unittest.TestCase):
+	def test_decimal_mode(self):
+		string = '[(distance, input="ft") 10, (mass, input="kg", output="LB") 10, (distance, input="unknown", output="km") 1500, (distance) "2.5", (data_size, input="KiB") 2]'
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				data = JunkParser(MAGNITUDE_TYPE_PROCESSORS, backend=backend).loads(string)
+
+				# Same arithmetic as the ratios of UNITS applied one after the other
+				self.assertEqual(data, [
+					Decimal(10) * Decimal("0.3048") / Decimal(1),
+					Decimal(10) * Decimal(1000) / Decimal("453.59237"),
+					Decimal(1500) * Decimal(1) / Decimal(1000),
+					Decimal("2.5"),
+					Decimal(2048),
+				])
+				self.assertTrue(all(type(value) is Decimal for value in data))
+
+
+	def test_float_mode(self):
+		parser = JunkParser(MAGNITUDE_TYPE_PROCESSORS)
+
+		data = parser.loads('[(distance, input="ft", mode="float") 10, (duration, input="h", output="min", mode="float") 1.5, (pressure, input="bar", output="psi", mode="float") 1]')
+		self.assertIs(type(data[0]), float)
+		self.assertAlmostEqual(data[0], 3.048)
+		self.assertEqual(data[1], 90.0)
+		self.assertAlmostEqual(data[2], 14.503773773, places=6)
+
+		for string in ('[(distance, mode="int") 10]', '[(distance, mode="int") [10]]'):
+			with self.assertRaises(ValueError):
+				parser.loads(string)
+
+
+	def test_lists(self):
+		string = '[(distance, input="ft", output="m") [1, 2, 3], (distance, input="ft", mode="float") [1, 2], (each, type="distance", input="km") [1, 2], (distance) []]'
+		expected = [
+			[Decimal("0.3048"), Decimal("0.6096"), Decimal("0.9144")],
+			[0.3048, 0.6096],
+			[Decimal(1000), Decimal(2000)],
+			[],
+		]
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				self.assertEqual(JunkParser(MAGNITUDE_TYPE_PROCESSORS, backend=backend).loads(string), expected)
+				self.assertEqual(JunkParser(MAGNITUDE_TYPE_PROCESSORS, backend=backend, numeric_arrays=1).loads(string), expected)
+
+
+	def test_offsets(self):
+		parser = JunkParser(MAGNITUDE_TYPE_PROCESSORS)
+
+		self.assertEqual(parser.loads('[(temperature, input="c") 25]')[0], Decimal("298.15"))
+		self.assertEqual(parser.loads('[(temperature, input="c", output="c") 25]')[0], Decimal(25))
+
+		# Degrees Fahrenheit are ninths of Decimal precision
+		for string, expected in (
+			('[(temperature, input="c", output="f") [-40, 0, 100]]', [-40, 32, 212]),
+			('[(temperature, input="F", output="C") [32, 212]]', [0, 100]),
+			('[(temperature, input="k", output="r") [10]]', [18]),
+			('[(temperature, input="c", output="f", mode="float") [-40, 0, 100]]', [-40, 32, 212]),
+		):
+			with self.subTest(string=string):
+				data = parser.loads(string)[0]
+				self.assertEqual(len(data), len(expected))
+
+				for value, expected_value in zip(data, expected):
+					self.assertAlmostEqual(value, expected_value)
+
+
+	def test_new_magnitude(self):
+		JunkAngleTypeProcessor = magnitude_type_processor("angle", "rad", {
+			"rad": Decimal(1),
+			"deg": Decimal("0.017453292519943295"),
+			"turn": Decimal("6.28318530717958648"),
+		})
+		self.assertEqual(JunkAngleTypeProcessor.__name__, "JunkAngleTypeProcessor")
+
+		parser = JunkParser([JunkAngleTypeProcessor])
+		self.assertEqual(parser.loads('[(angle, input="turn", output="deg", mode="float") [0.5, 1]]'), [[180.0, 360.0]])
+		self.assertEqual(parser.loads('[(angle, input="rad") 2]')[0], Decimal(2))
+
+		# Subclasses of the built-in magnitudes get conversions to their new units as well
+		class JunkNauticalDistanceTypeProcessor(JunkDistanceTypeProcessor):
+			KEYWORD = "nautical_distance"
+			UNITS = {**JunkDistanceTypeProcessor.UNITS, "nmi": Decimal(1852)}
+
+		self.assertEqual(JunkParser([JunkNauticalDistanceTypeProcessor]).loads('[(nautical_distance, input="nmi", output="km") 2]')[0], Decimal("3.704"))
+
+
+	def test_output_class(self):
+		parser = JunkParser([UnitDistanceTestProcessor])
+		data = parser.loads('[(unit_distance, input="ft") 10, (unit_distance, input="ft") [10], (each, type="unit_distance") [1], (unit_distance, mode="float") 1]')
+
+		# The CLASS of subclasses is used in decimal mode
+		self.assertEqual(data, [Decimal("3.048"), [Decimal("3.048")], [Decimal(1)], 1.0])
+		self.assertEqual([type(data[0]), type(data[1][0]), type(data[2][0]), type(data[3])], [UnitDecimal, UnitDecimal, UnitDecimal, float])
+
+		# Output types depend on the mode and on whether the value is a list
+		for string in ('[(decimal_only_distance, mode="float") 1]', '[(each, type="decimal_only_distance", mode="float") [1]]', '[(scalar_only_distance) 1]', '[(string) (scalar_only_distance) 1]'):
+			for backend in JunkParser.BACKENDS:
+				with self.subTest(string=string, backend=backend):
+					parser = JunkParser([DecimalOnlyDistanceTestProcessor, ScalarOnlyDistanceTestProcessor], backend=backend)
+					with self.assertRaises(TypeError):
+						parser.loads(string)
+
+					with self.assertRaises(TypeError):
+						asyncio.run(parser.aloads(string))
+
+					with self.assertRaises(TypeError):
+						JunkParser([DecimalOnlyDistanceTestProcessor, ScalarOnlyDistanceTestProcessor], backend=backend, type_memo_size=16).loads(string)
+
+		self.assertEqual(JunkParser([DecimalOnlyDistanceTestProcessor]).loads('[(decimal_only_distance) 1, (decimal_only_distance) [1]]'), [Decimal(1), [Decimal(1)]])
+
+
+	def test_pickle(self):
+		parser = pickle.loads(pickle.dumps(JunkParser(MAGNITUDE_TYPE_PROCESSORS)))
+		self.assertEqual(parser.loads('[(temperature, input="c", output="k", mode="float") [0]]')[0], [273.15])
+
+
+
+if __name__ == "__main__":
+	unittest.main()
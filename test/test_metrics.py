@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetrics, JunkParser, JunkResultCache
+from junkpy.metrics import DEFAULT_METRICS
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+
+
+
+class MetricsTest(unittest.TestCase):
+	def setUp(self):
+		self.TMP_DIR = tempfile.TemporaryDirectory()
+		self.FILE_PATH = Path(self.TMP_DIR.name) / "config.junk"
+		self.FILE_PATH.write_text('{a: (int) "1", b: [(int) "2", (float) "3.5"]}')
+
+		self.METRICS = JunkMetrics(load_buckets=[0.001, 10], type_processor_buckets=[10])
+		self.PARSER = JunkParser(metrics=self.METRICS, result_cache=JunkResultCache(), type_memo_size=16)
+
+
+	def tearDown(self):
+		self.TMP_DIR.cleanup()
+
+
+	def test_snapshot(self):
+		self.PARSER.loads('{"a": 1}')
+		self.PARSER.load_file(self.FILE_PATH)
+		self.PARSER.load_file(self.FILE_PATH)
+		with open(self.FILE_PATH) as opened_fp:
+			self.PARSER.load(opened_fp)
+
+		os.environ["JUNK_METRICS_TEST_FILE"] = str(self.FILE_PATH)
+		try:
+			self.PARSER.load_file_from_env("JUNK_METRICS_TEST_FILE")
+
+		finally:
+			del os.environ["JUNK_METRICS_TEST_FILE"]
+
+		with self.assertRaises(ValueError):
+			self.PARSER.loads('[(unknown) 1]')
+
+		with self.assertRaises(ValueError):
+			self.PARSER.load_file_from_env("JUNK_METRICS_TEST_MISSING")
+
+		snapshot = self.METRICS.snapshot()
+
+		# load_file_from_env does not count the nested load_file
+		self.assertEqual(snapshot["loads"], {"loads": 2, "load_file": 2, "load": 1, "load_file_from_env": 2})
+		self.assertEqual(snapshot["load_failures"], {"loads": {"ValueError": 1}, "load_file_from_env": {"ValueError": 1}})
+		self.assertEqual(snapshot["parsed_bytes"], len('{"a": 1}') + 2 * self.FILE_PATH.stat().st_size + len('[(unknown) 1]'))
+
+		load_duration = snapshot["load_duration"]["load_file"]
+		self.assertEqual(list(load_duration["buckets"]), [0.001, 10, float("inf")])
+		self.assertEqual(load_duration["buckets"][float("inf")], 2)
+		self.assertEqual(load_duration["count"], 2)
+		self.assertGreater(load_duration["sum"], 0)
+
+		# Memoized results do not call the type processors
+		self.assertEqual(snapshot["type_processor_duration"]["int"]["count"], 2)
+		self.assertEqual(snapshot["type_processor_duration"]["float"]["count"], 1)
+		self.assertEqual(snapshot["caches"], {
+			"result": {"hits": 2, "misses": 1},
+			"type_memo": {"hits": 3, "misses": 3},
+		})
+
+
+	def test_threads(self):
+		with ThreadPoolExecutor(4) as executor:
+			for future in [executor.submit(self.PARSER.loads, '[(int) "1", (int) "2"]') for _ in range(64)]:
+				future.result()
+
+		snapshot = self.METRICS.snapshot()
+		self.assertEqual(snapshot["loads"], {"loads": 64})
+		self.assertEqual(snapshot["load_duration"]["loads"]["count"], 64)
+
+
+	def test_ended_threads(self):
+		for index in range(16):
+			thread = threading.Thread(target=self.PARSER.loads, args=(f'[(int) "{index}"]',))
+			thread.start()
+			thread.join()
+
+		self.assertEqual(self.METRICS.snapshot()["type_processor_duration"]["int"]["count"], 16)
+		# The shards of the ended threads are merged into a single one
+		self.assertEqual(len(self.METRICS._shards), 0)
+
+		self.PARSER.loads('[(int) "16"]')
+		self.assertEqual(len(self.METRICS._shards), 1)
+		self.assertEqual(self.METRICS.snapshot()["loads"], {"loads": 17})
+
+
+	def test_prometheus(self):
+		self.PARSER.load_file(self.FILE_PATH)
+		with self.assertRaises(ValueError):
+			self.PARSER.loads('[(unknown) 1]')
+
+		lines = self.METRICS.render_prometheus().splitlines()
+
+		self.assertIn("# TYPE junkpy_loads_total counter", lines)
+		self.assertIn('junkpy_loads_total{entry_point="load_file"} 1', lines)
+		self.assertIn('junkpy_load_failures_total{entry_point="loads",exception="ValueError"} 1', lines)
+		self.assertIn("# TYPE junkpy_load_duration_seconds histogram", lines)
+		self.assertIn('junkpy_load_duration_seconds_bucket{entry_point="load_file",le="+Inf"} 1', lines)
+		self.assertIn('junkpy_load_duration_seconds_count{entry_point="load_file"} 1', lines)
+		self.assertIn(f"junkpy_parsed_bytes_total {self.FILE_PATH.stat().st_size + len('[(unknown) 1]')}", lines)
+		self.assertIn('junkpy_type_processor_duration_seconds_count{keyword="int"} 2', lines)
+		self.assertIn('junkpy_cache_misses_total{cache="result"} 1', lines)
+		self.assertTrue(all(line.startswith("#") or line.startswith("junkpy_") for line in lines))
+		self.assertTrue(self.METRICS.render_prometheus(prefix="config").startswith("# HELP config_loads_total"))
+
+
+	def test_options(self):
+		self.assertIsNone(JunkParser().metrics)
+		self.assertIs(JunkParser(metrics=True).metrics, DEFAULT_METRICS)
+
+		# Unpickled metrics start empty
+		self.PARSER.loads("[1]")
+		metrics = pickle.loads(pickle.dumps(self.METRICS))
+		self.assertEqual(metrics.load_buckets, (0.001, 10))
+		self.assertEqual(metrics.snapshot()["loads"], {})
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkResultCache
+from junkpy.extensions import JunkNdarrayTypeProcessor
+from array import array
+from datetime import datetime, timedelta
+from lark.exceptions import UnexpectedInput
+from pathlib import Path
+import importlib.util
+import pickle
+import sys
+import tempfile
+import unittest
+
+
+
+class NumericArraysTest(unittest.TestCase):
+	def test_array_type_processor(self):
+		string = """{
+			doubles: (array) [1, 2.5, -3e2, .5,],
+			ints: (array) [1, -2, 3],
+			floats: (array, dtype="f4") [0.5, 1 # Comment
+				, 2],
+			bytes: (array, dtype="u1") [1, 255],
+			empty: (array) [],
+			chained: (set) (array) [1, 1, 2],
+			big: (array) [1, 100000000000000000000, 1.5],
+		}"""
+		expected = {
+			"doubles": array("d", [1, 2.5, -300, 0.5]),
+			"ints": array("q", [1, -2, 3]),
+			"floats": array("f", [0.5, 1, 2]),
+			"bytes": array("B", [1, 255]),
+			"empty": array("d"),
+			"chained": {1, 2},
+			"big": array("d", [1, 1e20, 1.5]),
+		}
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				data = JunkParser(backend=backend).loads(string)
+				self.assertEqual(data, expected)
+				self.assertEqual({key: value.typecode for key, value in data.items() if isinstance(value, array)}, {key: value.typecode for key, value in expected.items() if isinstance(value, array)})
+
+				for invalid in ('[(array) [1, "2"]]', '[(array) [true]]', '[(array, dtype="c16") [1]]', '[(array) 1]'):
+					with self.assertRaises(ValueError):
+						JunkParser(backend=backend).loads(invalid)
+
+				with self.assertRaises(OverflowError):
+					JunkParser(backend=backend).loads('[(array, dtype="u1") [256]]')
+
+				with self.assertRaises(OverflowError):
+					JunkParser(backend=backend).loads('[(array) [100000000000000000000]]')
+
+		# Syntax errors are reported as for lists
+		for invalid in ('[(array) [1 2]]', '[(array) [1,, 2]]', '[(array) [1.5e]]'):
+			with self.subTest(invalid=invalid):
+				with self.assertRaises(UnexpectedInput) as context:
+					JunkParser(backend="scanner").loads(invalid)
+
+				with self.assertRaises(UnexpectedInput) as expected_context:
+					JunkParser(backend="scanner").loads(invalid.replace("array", "float"))
+
+				self.assertEqual(str(context.exception), str(expected_context.exception))
+
+		parser = JunkParser()
+		self.assertEqual(parser.loads(parser.dumps({"a": array("q", [1, 2])})), {"a": array("q", [1, 2])})
+
+
+	def test_numeric_arrays_mode(self):
+		string = """{
+			ints: [1, 2, 3],
+			floats: [1.5, 2.5],
+			mixed: [1, 2.5],
+			short: [1],
+			other: [1, "a"],
+			nested: [[1, 2], [3.5, 4.5]],
+			typed: [(datetime) [2024, 1, 2], (set) [1, 2], (array, dtype="i2") [1, 2]],
+			kwargs: (each, type="int", unused=[1, 2]) ["1", "2"],
+			big: [100000000000000000000, 1],
+		}"""
+		expected = {
+			"ints": array("q", [1, 2, 3]),
+			"floats": array("d", [1.5, 2.5]),
+			"mixed": [1, 2.5],
+			"short": [1],
+			"other": [1, "a"],
+			"nested": [array("q", [1, 2]), array("d", [3.5, 4.5])],
+			"typed": [datetime(2024, 1, 2), {1, 2}, array("h", [1, 2])],
+			"kwargs": [1, 2],
+			"big": [100000000000000000000, 1],
+		}
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				parser = JunkParser(backend=backend, numeric_arrays=2)
+				data = parser.loads(string)
+
+				self.assertEqual(data, expected)
+				self.assertEqual([type(value) for value in data.values()], [type(value) for value in expected.values()])
+				self.assertEqual(data["mixed"], [1, 2.5])
+				self.assertIs(type(data["mixed"][0]), int)
+
+				self.assertEqual(pickle.loads(pickle.dumps(parser)).loads(string), expected)
+
+		# Plain JSON data is converted as well
+		self.assertEqual(JunkParser(numeric_arrays=2).loads('{"a": [1, 2], "b": [[0.5, 1.5]], "c": [1, 2.5]}'), {"a": array("q", [1, 2]), "b": [array("d", [0.5, 1.5])], "c": [1, 2.5]})
+
+		with self.assertRaises(ValueError):
+			JunkParser(numeric_arrays=2).loads_incremental("[1, 2]")
+
+
+	def test_chains(self):
+		string = '[(timedelta) (array) [1, 2], (each, type="int") (array) [1, 2], (array, dtype="f4") (array) [1, 2], (string) (timedelta) (array) [1, 2], (timedelta, unused=[1]) (array) [1, 2]]'
+		expected = [timedelta(days=1, seconds=2), [1, 2], array("f", [1, 2]), str(timedelta(days=1, seconds=2)), timedelta(days=1, seconds=2)]
+
+		# Arrays loaded by inner annotations reach other type processors as lists with every backend
+		for backend in JunkParser.BACKENDS:
+			for numeric_arrays in (0, 2):
+				for type_memo_size in (0, 16):
+					with self.subTest(backend=backend, numeric_arrays=numeric_arrays, type_memo_size=type_memo_size):
+						data = JunkParser(backend=backend, numeric_arrays=numeric_arrays, type_memo_size=type_memo_size).loads(string)
+						self.assertEqual(data, expected)
+						self.assertEqual(type(data[1]), list)
+						self.assertEqual(data[2].typecode, "f")
+
+
+	def test_cache_and_snapshot(self):
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			file_path = Path(tmp_dir) / "numbers.junk"
+			file_path.write_text("{a: [1, 2, 3]}")
+
+			result_cache = JunkResultCache()
+			for numeric_arrays, expected_type in ((0, list), (2, array), (0, list)):
+				with self.subTest(numeric_arrays=numeric_arrays):
+					parser = JunkParser(result_cache=result_cache, numeric_arrays=numeric_arrays)
+					self.assertIs(type(parser.load_file(file_path)["a"]), expected_type)
+
+					# Snapshots compiled with other options are not reused
+					self.assertIs(type(parser.load_snapshot(file_path, update=True)["a"]), expected_type)
+
+			self.assertEqual((result_cache.hits, result_cache.misses), (1, 2))
+
+
+	def test_memory(self):
+		numbers = ", ".join(str(index * 0.5) for index in range(10000))
+		data = JunkParser(backend="scanner", numeric_arrays=1).loads(f"[[{numbers}]]")[0]
+		values = JunkParser(backend="scanner").loads(f"[[{numbers}]]")[0]
+
+		self.assertEqual(list(data), values)
+		self.assertLess(sys.getsizeof(data) * 3, sys.getsizeof(values) + sum(map(sys.getsizeof, values)))
+
+
+	@unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+	def test_ndarray_type_processor(self):
+		import numpy
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				data = JunkParser([JunkNdarrayTypeProcessor], backend=backend).loads('[(ndarray, dtype="f4") [1, 2.5], (ndarray) [1, 2]]')
+
+				self.assertEqual(data[0].dtype, numpy.float32)
+				self.assertEqual(data[0].tolist(), [1.0, 2.5])
+				self.assertEqual(data[1].dtype, numpy.int64)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParallelStats, JunkParser, JunkTypeProcessor
+from lark.exceptions import UnexpectedInput
+from array import array
+from pathlib import Path
+import tempfile
+import unittest
+
+
+
+class ParallelTestProcessor(JunkTypeProcessor):
+	CLASS = tuple
+	KEYWORD = "parallel_test"
+
+	def load(self, value, **kwargs):
+		return (int(value) * kwargs.get("mul", 1), self.parser._local_storage.get().file_path.name)
+
+
+
+class ParallelTestParser(JunkParser):
+	def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+		return {
+			"batches": metadata.parallel_stats.batches,
+			"data": parsed_data
+		}
+
+
+
+class ParallelLoadTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.TMP_DIR = tempfile.TemporaryDirectory()
+
+		cls.LIST_FILE_PATH = Path(cls.TMP_DIR.name) / "list.junk"
+		cls.LIST_FILE_PATH.write_text("# Records\n[\n" + "".join(
+			f'\t{{id: {i}, name: "record, [{i}]", value: (parallel_test, mul=2) {i}}}, # Comment, ]\n'
+			for i in range(300)
+		) + "]\n")
+
+		cls.DICT_FILE_PATH = Path(cls.TMP_DIR.name) / "dict.junk"
+		cls.DICT_FILE_PATH.write_text("{\n" + "".join(
+			f'\tkey{i}: [{i}, "{{{i}}}", (parallel_test) {i}],\n'
+			for i in range(300)
+		) + "}\n")
+
+		cls.INVALID_FILE_PATH = Path(cls.TMP_DIR.name) / "invalid.junk"
+		cls.INVALID_FILE_PATH.write_text("[\n" + "".join(f"\t{i},\n" for i in range(100)) + "\t1 2,\n\t3\n]")
+
+		cls.NUMBERS_FILE_PATH = Path(cls.TMP_DIR.name) / "numbers.junk"
+		cls.NUMBERS_FILE_PATH.write_text("[" + "".join(f"{i}, " for i in range(50)) + "".join(f"{i}.5, " for i in range(50)) + "{a: [1, 2]}]")
+
+		cls.VALUE_FILE_PATH = Path(cls.TMP_DIR.name) / "value.junk"
+		cls.VALUE_FILE_PATH.write_text('"value"')
+
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.TMP_DIR.cleanup()
+
+
+	def test_results(self):
+		parser = JunkParser([ParallelTestProcessor])
+
+		for file_path in [self.LIST_FILE_PATH, self.DICT_FILE_PATH]:
+			for batch_size in [0, 100, 1 << 20]:
+				with self.subTest(file_path=file_path.name, batch_size=batch_size):
+					expected = parser.load_file(file_path)
+					result = parser.load_file_parallel(file_path, workers=2, batch_size=batch_size)
+
+					self.assertEqual(result, expected)
+					self.assertEqual(list(result), list(expected))
+
+
+	def test_stats(self):
+		parser = ParallelTestParser([ParallelTestProcessor])
+
+		stats = JunkParallelStats()
+		result = parser.load_file_parallel(self.LIST_FILE_PATH, workers=2, batch_size=1000, stats=stats)
+
+		self.assertEqual(result["data"], JunkParser([ParallelTestProcessor]).load_file(self.LIST_FILE_PATH))
+		self.assertEqual(result["batches"], stats.batches)
+		self.assertGreater(stats.batches, 1)
+		self.assertLess(stats.batches, 300)
+		self.assertGreater(stats.characters, 0)
+		self.assertGreater(stats.worker_time, 0)
+		self.assertGreaterEqual(stats.total_time, stats.split_time + stats.merge_time)
+
+
+	def test_errors(self):
+		parser = JunkParser()
+
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				parser = JunkParser(backend=backend)
+
+				with self.assertRaises(UnexpectedInput) as expected:
+					parser.load_file(self.INVALID_FILE_PATH)
+
+				for batch_size in [0, 20]:
+					with self.assertRaises(UnexpectedInput) as context:
+						parser.load_file_parallel(self.INVALID_FILE_PATH, workers=2, batch_size=batch_size)
+
+					self.assertEqual(context.exception.line, expected.exception.line)
+					self.assertEqual(context.exception.column, expected.exception.column)
+
+		with self.assertRaises(ValueError):
+			parser.load_file_parallel(self.VALUE_FILE_PATH, workers=2)
+
+
+	def test_numeric_arrays(self):
+		parser = JunkParser(numeric_arrays=2)
+		expected = parser.load_file(self.NUMBERS_FILE_PATH)
+		self.assertEqual(type(expected), list)
+		self.assertEqual(type(expected[-1]["a"]), array)
+
+		# Batches of ints and of floats are merged into the same list as when loaded at once
+		for batch_size in (1, 150, 250, 1 << 20):
+			with self.subTest(batch_size=batch_size):
+				data = parser.load_file_parallel(self.NUMBERS_FILE_PATH, workers=2, batch_size=batch_size)
+				self.assertEqual(data, expected)
+				self.assertEqual([type(value) for value in data], [type(value) for value in expected])
+				self.assertEqual(type(data[-1]["a"]), array)
+
+				self.assertEqual(list(parser.iter_load_file(self.NUMBERS_FILE_PATH)), expected)
+
+		ints_file_path = Path(self.TMP_DIR.name) / "ints.junk"
+		ints_file_path.write_text("[" + ", ".join(map(str, range(100))) + "]")
+
+		for batch_size in (1, 150, 1 << 20):
+			with self.subTest(batch_size=batch_size):
+				self.assertEqual(parser.load_file_parallel(ints_file_path, workers=2, batch_size=batch_size), array("q", range(100)))
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkTypeProcessor
+from junkpy.profiling import PHASES
+from pathlib import Path
+from pydantic import BaseModel
+import tempfile
+import time
+import unittest
+
+
+
+class SlowTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "slow_test"
+
+	def load(self, value, **kwargs):
+		time.sleep(0.01)
+		return self.CLASS(value)
+
+
+
+class HookTestParser(JunkParser):
+	def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+		time.sleep(0.01)
+		return parsed_data
+
+
+
+class ProfileTestModel(BaseModel):
+	a: int
+	b: list
+
+
+
+class ProfilingTest(unittest.TestCase):
+	DATA = '{a: (slow_test) "1", # Comment\n b: [(int) "2", (int) "3", 4.5, "x"]}'
+
+
+	def test_report(self):
+		parser = HookTestParser([SlowTestProcessor])
+
+		with parser.profile() as report:
+			self.assertEqual(parser.loads(self.DATA, validate_to=ProfileTestModel), ProfileTestModel(a=1, b=[2, 3, 4.5, "x"]))
+
+		self.assertEqual(report.loads, 1)
+		self.assertEqual(report.bytes_read, len(self.DATA))
+		self.assertEqual(report.parsing_paths, {"lark": 1})
+		self.assertEqual(report.tokens, 26)
+		self.assertEqual(report.nodes, {"dict": 1, "pair": 2, "list": 1, "typed_value": 3, "var_name": 5, "string": 4, "float_n": 1})
+
+		self.assertEqual(set(report.processors), {"slow_test", "int"})
+		self.assertEqual(report.processors["slow_test"].calls, 1)
+		self.assertEqual(report.processors["int"].calls, 2)
+		self.assertGreaterEqual(report.processors["slow_test"].time, 0.01)
+
+		self.assertEqual(set(report.phases), set(PHASES))
+		self.assertGreaterEqual(report.phases["type_processors"], 0.01)
+		self.assertGreaterEqual(report.phases["after_parsing"], 0.01)
+		self.assertGreater(report.phases["validation"], 0)
+		# Nested phases are not counted in the enclosing ones
+		self.assertLess(report.phases["parse"], 0.01)
+		self.assertLess(report.phases["transform"], 0.01)
+		self.assertAlmostEqual(report.total_time, sum(report.phases.values()))
+		self.assertEqual(report.as_dict()["processors"]["int"]["calls"], 2)
+
+
+	def test_load_file(self):
+		parser = JunkParser()
+		data = '{"a": 1, "b": [2, 3]}'
+
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			file_path = Path(tmp_dir) / "config.junk"
+			file_path.write_text(data)
+
+			with parser.profile() as report:
+				parser.load_file(file_path)
+				with open(file_path) as opened_fp:
+					parser.load(opened_fp)
+
+		self.assertEqual(report.loads, 2)
+		self.assertEqual(report.bytes_read, 2 * len(data))
+		self.assertEqual(report.parsing_paths, {"json": 2})
+		self.assertEqual((report.tokens, report.nodes), (0, {}))
+		self.assertGreater(report.phases["read"], 0)
+
+
+	def test_scanner_backend(self):
+		parser = JunkParser(backend="scanner")
+
+		with parser.profile() as report:
+			parser.loads(self.DATA.replace("slow_test", "int"))
+
+		self.assertEqual(report.parsing_paths, {"scanner": 1})
+		self.assertEqual(report.processors["int"].calls, 3)
+
+
+	def test_disabled(self):
+		parser = JunkParser()
+
+		with parser.profile() as report:
+			parser.loads('[(int) "1"]')
+
+		parser.loads('[(int) "1"]')
+		self.assertEqual(report.loads, 1)
+		self.assertEqual(report.processors["int"].calls, 1)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
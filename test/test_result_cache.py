@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkResultCache, JunkTypeProcessor
+from pathlib import Path
+from pydantic import BaseModel
+from types import MappingProxyType
+import os
+import tempfile
+import time
+import unittest
+
+
+
+class ResultCacheTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.DATA_AS_STRING = """
+			{
+				key1: 1,
+				"key2": "2",
+				key3: [1, 2, {nested: true}],
+			}
+		"""
+
+		class TestModel(BaseModel):
+			key1: int
+			key2: str
+
+		cls.TEST_MODEL = TestModel
+
+		class CountingParser(JunkParser):
+			def before_parsing(self, metadata: JunkMetadata):
+				self.parse_count = getattr(self, "parse_count", 0) + 1
+
+
+			def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+				parsed_data["after_parsing"] = True
+				return parsed_data
+
+		cls.COUNTING_PARSER_CLASS = CountingParser
+
+
+	def setUp(self):
+		self.tmp_dir = tempfile.TemporaryDirectory()
+		self.file_path = Path(self.tmp_dir.name) / "cached.junk"
+		self.file_path.write_text(self.DATA_AS_STRING)
+
+
+	def tearDown(self):
+		self.tmp_dir.cleanup()
+
+
+	def rewrite_file(self, file_path: Path, string: str):
+		file_stat = os.stat(file_path)
+		file_path.write_text(string)
+		os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000))
+
+
+	def test_cache_hit(self):
+		parser = self.COUNTING_PARSER_CLASS(result_cache=JunkResultCache())
+		data1 = parser.load_file(self.file_path)
+		data2 = parser.load_file(self.file_path)
+
+		self.assertEqual(data1, data2)
+		self.assertEqual(data1, JunkParser().loads(self.DATA_AS_STRING) | {"after_parsing": True})
+		self.assertEqual(parser.parse_count, 1)
+		self.assertEqual((parser._result_cache.hits, parser._result_cache.misses), (1, 1))
+
+
+	def test_results_are_copied(self):
+		parser = JunkParser(result_cache=JunkResultCache())
+		data = parser.load_file(self.file_path)
+		data["key3"][2]["nested"] = False
+		data["key4"] = 4
+
+		self.assertEqual(parser.load_file(self.file_path), JunkParser().load_file(self.file_path))
+
+
+	def test_immutable_results(self):
+		parser = JunkParser(result_cache=JunkResultCache(immutable=True))
+		data1 = parser.load_file(self.file_path)
+		data2 = parser.load_file(self.file_path)
+
+		self.assertIs(data1, data2)
+		self.assertIsInstance(data1, MappingProxyType)
+		self.assertIsInstance(data1["key3"], tuple)
+
+		with self.assertRaises(TypeError):
+			data1["key1"] = 2
+
+		self.assertIsInstance(parser.load_file(self.file_path, validate_to=self.TEST_MODEL), self.TEST_MODEL)
+
+
+	def test_file_change(self):
+		for hash_content in (False, True):
+			with self.subTest(hash_content=hash_content):
+				parser = JunkParser(result_cache=JunkResultCache(hash_content=hash_content))
+				self.file_path.write_text(self.DATA_AS_STRING)
+				parser.load_file(self.file_path)
+
+				self.rewrite_file(self.file_path, "[1, 2, 3]")
+				self.assertEqual(parser.load_file(self.file_path), [1, 2, 3])
+				self.assertEqual(parser._result_cache.misses, 2)
+
+
+	def test_content_hash_reuse(self):
+		parser = JunkParser(result_cache=JunkResultCache(hash_content=True))
+		parser.load_file(self.file_path)
+
+		self.rewrite_file(self.file_path, self.DATA_AS_STRING)
+		parser.load_file(self.file_path)
+		self.assertEqual((parser._result_cache.hits, parser._result_cache.misses), (1, 1))
+
+
+	def test_invalidation(self):
+		cache = JunkResultCache()
+		parser = JunkParser(result_cache=cache)
+		parser.load_file(self.file_path)
+
+		cache.invalidate(self.file_path)
+		self.assertEqual(len(cache), 0)
+		parser.load_file(self.file_path)
+
+		cache.invalidate()
+		self.assertEqual(len(cache), 0)
+		self.assertEqual(cache.misses, 2)
+
+
+	def test_ttl(self):
+		parser = JunkParser(result_cache=JunkResultCache(ttl=0.01))
+		parser.load_file(self.file_path)
+		time.sleep(0.02)
+		parser.load_file(self.file_path)
+
+		self.assertEqual(parser._result_cache.misses, 2)
+
+
+	def test_limits(self):
+		file_paths = [Path(self.tmp_dir.name) / f"file{i}.junk" for i in range(4)]
+		for file_path in file_paths:
+			file_path.write_text(self.DATA_AS_STRING)
+
+		for cache, expected_entries in [
+			(JunkResultCache(max_entries=2), 2),
+			(JunkResultCache(max_bytes=len(self.DATA_AS_STRING) * 3), 3),
+		]:
+			with self.subTest(expected_entries=expected_entries):
+				parser = JunkParser(result_cache=cache)
+				for file_path in file_paths:
+					parser.load_file(file_path)
+
+				self.assertEqual(len(cache), expected_entries)
+				parser.load_file(file_paths[-1])
+				self.assertEqual(cache.hits, 1)
+
+
+	def test_shared_cache_keys(self):
+		class CustomProcessor(JunkTypeProcessor):
+			CLASS = int
+			KEYWORD = "custom_cached"
+
+		cache = JunkResultCache()
+		JunkParser(result_cache=cache).load_file(self.file_path)
+		JunkParser(result_cache=cache).load_file(self.file_path)
+		self.COUNTING_PARSER_CLASS(result_cache=cache).load_file(self.file_path)
+		JunkParser([CustomProcessor], result_cache=cache).load_file(self.file_path)
+
+		self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+	def test_validate_to(self):
+		parser = JunkParser(result_cache=JunkResultCache())
+		data1 = parser.load_file(self.file_path, validate_to=self.TEST_MODEL)
+		data2 = parser.load_file(self.file_path, validate_to=self.TEST_MODEL)
+
+		self.assertIsInstance(data2, self.TEST_MODEL)
+		self.assertEqual(data1, data2)
+		self.assertIsNot(data1, data2)
+
+
+	def test_uncacheable_results(self):
+		class UncacheableParser(JunkParser):
+			def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+				metadata.cacheable = False
+				return parsed_data
+
+		parser = UncacheableParser(result_cache=JunkResultCache())
+		parser.load_file(self.file_path)
+		parser.load_file(self.file_path)
+
+		self.assertEqual((parser._result_cache.hits, parser._result_cache.misses), (0, 2))
+
+
+
+if __name__ == '__main__':
+	unittest.main()
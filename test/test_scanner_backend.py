@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser
+from lark.exceptions import UnexpectedInput
+from pathlib import Path
+import unittest
+
+
+
+class ScannerBackendTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.LARK_PARSER = JunkParser()
+		cls.SCANNER_PARSER = JunkParser(backend="scanner")
+		cls.FILE_PATHS = [
+			Path(__file__).parent / "test_files/test_file_simple.junk",
+			Path(__file__).parent / "test_files/test_file_autodetected_types.junk",
+			Path(__file__).parent / "test_files/test_file_builtin_forced_types.junk",
+		]
+		cls.VALID_DATA = [
+			'{true: 1, null: 2, truex: 3, -1: 4, a-b: 5, "quoted": 6}',
+			'[true, false, null, 1, -1, +1, 01, 1., .5, -.5, 1e5, 1.e5, 1e+5, -1.5E-3]',
+			r'["a\"b", "a\\", "", "x # not a comment", "\u00e9"]',
+			'{a: , "b": , c: (string), d: (string)}',
+			'[(string), (string) (int) 1.5, (int)(float) "2", ("int") "3"]',
+			'[(string, a = 1, "b" = [1, {c: 2}], d = (int) 5.5, e = (string)) 6]',
+			'[1, [2, [3, [], {}]], {a: {b: {}}},]',
+			'# Comment\n[ # Comment\n\t1,\n\t# Comment\n\t2 # Comment\n]\n# Comment',
+			'{}',
+			'[]',
+			'"string"',
+			'123',
+			'  null  ',
+		]
+		cls.INVALID_DATA = [
+			'', '  ', '[truex]', '{a:truex}', '[-a]', '{1: 2}', '{"a" : 1 2}', '(int) 1', '[1 2]', '[,]',
+			'{a:1,,}', '[1.5e]', '[1,\n 2,\n x]', '{"a":1}\n\n}', '[(int, a=1, ) 1]', '[(int,) 1]',
+			'["a\nb"]', '[nul]', '{a}', '{,}', '[1.2.3]', '[--1]', '[(a b) 1]', '[(int) "1" (int)]',
+			'"abc', '[-]', '[- 1]', '[1,', '{a:1', '[', '[1 ', '[1 # x', '{a', '{a:', '[(int', '[(int,',
+			'[(int, a', '[(int, a=', '[(int, a=1', '[(int) ', '{\n"a"\n', '[1]  x', '[1] [2]', '[\n1,\n2\n',
+			'x', '@', '[@]', '{a:1, b:2 c:3}', '[1, (int) 2 3]', '[1,2\t@]', '{"a\n":1}', '[1abc]', '{a = 1}',
+		]
+
+
+	def test_files(self):
+		for file_path in self.FILE_PATHS:
+			with self.subTest(file_path=file_path):
+				self.assertEqual(
+					self.SCANNER_PARSER.load_file(file_path),
+					self.LARK_PARSER.load_file(file_path)
+				)
+
+
+	def test_valid_data(self):
+		for data in self.VALID_DATA:
+			with self.subTest(data=data):
+				self.assertEqual(self.SCANNER_PARSER.loads(data), self.LARK_PARSER.loads(data))
+
+
+	def test_error_positions(self):
+		for data in self.INVALID_DATA:
+			with self.subTest(data=data):
+				with self.assertRaises(UnexpectedInput) as lark_error:
+					self.LARK_PARSER.loads(data)
+
+				with self.assertRaises(UnexpectedInput) as scanner_error:
+					self.SCANNER_PARSER.loads(data)
+
+				self.assertEqual(
+					(scanner_error.exception.line, scanner_error.exception.column),
+					(lark_error.exception.line, lark_error.exception.column)
+				)
+
+
+	def test_typed_value_errors(self):
+		for data in ['[(unknown) 1]', '[(int) "x"]', '[(string) (int)]']:
+			with self.subTest(data=data):
+				with self.assertRaises(Exception) as lark_error:
+					self.LARK_PARSER.loads(data)
+
+				with self.assertRaises(type(lark_error.exception)):
+					self.SCANNER_PARSER.loads(data)
+
+
+	def test_typed_value_errors_after_syntax_errors(self):
+		for data in [
+			'[(unknown) 1 2]', '[(unknown) 1', '[(unknown) 1 # x', '{a: (unknown) 1 b: 2}', '[(int, a=(unknown) 1 2) 1]',
+			'[(string) (unknown) 1 x]', '[(int) "x" @]', '[(unknown) [1, 2] 3]', '[(unknown) 1 (int) 2]',
+		]:
+			with self.subTest(data=data):
+				with self.assertRaises(UnexpectedInput) as lark_error:
+					self.LARK_PARSER.loads(data)
+
+				with self.assertRaises(UnexpectedInput) as scanner_error:
+					self.SCANNER_PARSER.loads(data)
+
+				self.assertEqual(
+					(scanner_error.exception.line, scanner_error.exception.column),
+					(lark_error.exception.line, lark_error.exception.column)
+				)
+
+		for data in ['[(unknown) ]', '[(unknown) 1] x', '{a: (unknown) 1 }}']:
+			with self.subTest(data=data):
+				with self.assertRaises(ValueError):
+					self.LARK_PARSER.loads(data)
+
+				with self.assertRaises(ValueError):
+					self.SCANNER_PARSER.loads(data)
+
+
+	def test_unsupported_backend(self):
+		with self.assertRaises(ValueError):
+			JunkParser(backend="unknown")
+
+
+
+if __name__ == '__main__':
+	unittest.main()
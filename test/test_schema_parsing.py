@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkTypeProcessor
+from datetime import datetime
+from lark.exceptions import UnexpectedInput
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from typing import Dict, List, Literal, Optional, Union
+import unittest
+
+
+
+class CountingTestProcessor(JunkTypeProcessor):
+	CLASS = object
+	KEYWORD = "counting"
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		CountingTestProcessor.CALLS += 1
+		return value
+
+
+
+class SchemaTestServer(BaseModel):
+	model_config = ConfigDict(populate_by_name=True)
+
+	host: str = Field(alias="hostname")
+	port: int = 80
+	weight: float = 1.0
+	tags: List[str] = []
+
+
+
+class SchemaTestCheckedModel(BaseModel):
+	value: int
+
+	@field_validator("value", mode="before")
+	@classmethod
+	def double(cls, value):
+		# Sees the parsed value, before it is converted
+		return value * 2
+
+
+
+class SchemaTestConfig(BaseModel):
+	name: str
+	created: Optional[datetime] = None
+	servers: List[SchemaTestServer]
+	by_name: Dict[str, SchemaTestServer] = {}
+	limits: Dict[str, Union[int, str]] = {}
+	mode: Literal["fast", "safe"] = "safe"
+	retries: int = Field(default=1, ge=0)
+	checked: Optional[SchemaTestCheckedModel] = None
+	parent: Optional["SchemaTestConfig"] = None
+
+
+
+class AfterParsingTestParser(JunkParser):
+	def after_parsing(self, metadata: JunkMetadata, parsed_data):
+		parsed_data["name"] = "changed"
+		return parsed_data
+
+
+
+CONFIG = """{
+	name: "main",
+	created: (datetime) "2024-01-01T12:00:00",
+	servers: [
+		{hostname: "a", port: "81", weight: 2, tags: ["x"], unknown: {nested: [1, (counting) 2]}},
+		{host: "b"},
+	],
+	by_name: {c: {hostname: "c", host: "ignored"}},
+	limits: {cpu: 2, memory: "1G"},
+	mode: "fast",
+	retries: ,
+	checked: {value: "2"},
+	parent: {name: "base", servers: [], retries: (int) "3"},
+	unknown: (counting) "value"
+}"""
+
+
+
+class SchemaParsingTest(unittest.TestCase):
+	def setUp(self):
+		CountingTestProcessor.CALLS = 0
+		self.PARSER = JunkParser([CountingTestProcessor], schema_parsing=True)
+		self.VALIDATING_PARSER = JunkParser([CountingTestProcessor])
+
+
+	def test_same_results(self):
+		strings = (
+			CONFIG.replace("retries: ,", ""),
+			'{name: "x", servers: [{hostname: "a", port: 1.0, tags: []}], parent: null, checked: (counting) {value: 1}}',
+			'{"name": "x", "servers": []}'
+		)
+
+		for string in strings:
+			with self.subTest(string=string):
+				config = self.PARSER.loads(string, validate_to=SchemaTestConfig)
+				expected = self.VALIDATING_PARSER.loads(string, validate_to=SchemaTestConfig)
+
+				self.assertEqual(config, expected)
+				self.assertEqual(repr(config), repr(expected))
+				self.assertEqual(config.model_dump(exclude_unset=True), expected.model_dump(exclude_unset=True))
+
+		string = '[{hostname: "a"}, {hostname: "b", port: "2"}]'
+		self.assertEqual(self.PARSER.loads(string, validate_to=List[SchemaTestServer]), self.VALIDATING_PARSER.loads(string, validate_to=List[SchemaTestServer]))
+
+
+	def test_models_built_while_parsing(self):
+		with self.PARSER.profile() as report:
+			config = self.PARSER.loads(CONFIG.replace("retries: ,", ""), validate_to=SchemaTestConfig)
+
+		self.assertEqual(report.parsing_paths, {"schema": 1})
+		self.assertEqual(config.servers[0], SchemaTestServer(host="a", port=81, weight=2.0, tags=["x"]))
+		self.assertEqual(config.by_name["c"].host, "c")
+		self.assertEqual(config.checked.value, 22)
+		self.assertEqual(config.parent.retries, 3)
+
+		# Typed values of unknown keys are skipped
+		self.assertEqual(CountingTestProcessor.CALLS, 0)
+
+		# JSON strings are still validated straight from their text
+		with self.PARSER.profile() as report:
+			self.PARSER.loads('{"name": "x", "servers": []}', validate_to=SchemaTestConfig)
+
+		self.assertEqual(report.parsing_paths, {"json": 1})
+
+		# The parsed data is validated afterwards when after_parsing may change it
+		self.assertEqual(AfterParsingTestParser(schema_parsing=True).loads('{name: "x", servers: []}', validate_to=SchemaTestConfig).name, "changed")
+
+
+	def test_validation_errors(self):
+		with self.assertRaises(ValidationError) as context:
+			self.PARSER.loads(CONFIG, validate_to=SchemaTestConfig)
+
+		self.assertEqual(context.exception.errors()[0]["loc"], ("retries",))
+		self.assertIn("at line 11, column 11", str(context.exception))
+
+		with self.assertRaises(ValidationError) as context:
+			self.PARSER.loads(CONFIG.replace('port: "81"', 'port: "x"'), validate_to=SchemaTestConfig)
+
+		self.assertEqual(context.exception.errors()[0]["loc"], ("servers", 0, "port"))
+		self.assertEqual(context.exception.errors()[0]["type"], "int_parsing")
+		self.assertIn("at line 5, column 25", str(context.exception))
+
+		with self.assertRaises(ValidationError) as context:
+			self.PARSER.loads('{name: "x", servers: [{port: 1}]}', validate_to=SchemaTestConfig)
+
+		self.assertEqual(context.exception.errors()[0]["loc"], ("servers", 0, "hostname"))
+		self.assertEqual(context.exception.errors()[0]["type"], "missing")
+
+
+	def test_syntax_errors(self):
+		strings = (
+			'{name: "x", servers: [], unknown: [1 2]}',
+			'{name: "x", servers: [], unknown: {a: (counting) ]}}',
+			# Syntax errors take precedence over invalid values, as when validating the parsed data
+			'{name: 1, servers: "x", unknown: [1 2]}'
+		)
+
+		for string in strings:
+			with self.subTest(string=string):
+				with self.assertRaises(UnexpectedInput) as context:
+					self.PARSER.loads(string, validate_to=SchemaTestConfig)
+
+				with self.assertRaises(UnexpectedInput) as expected_context:
+					JunkParser([CountingTestProcessor], backend="scanner").loads(string, validate_to=SchemaTestConfig)
+
+				self.assertEqual(str(context.exception), str(expected_context.exception))
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+import io
+import junkpy
+import re
+import unittest
+
+
+
+class Point:
+	def __init__(self, x, y):
+		self.x = x
+		self.y = y
+
+	def __eq__(self, other):
+		return isinstance(other, Point) and (self.x, self.y) == (other.x, other.y)
+
+
+
+class PointTestProcessor(JunkTypeProcessor):
+	CLASS = Point
+	KEYWORD = "point"
+
+	def load(self, value, **kwargs):
+		return self.CLASS(**value)
+
+	def dump(self, obj):
+		return {"x": obj.x, "y": obj.y}
+
+
+
+class SerializerTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.PARSER = JunkParser([PointTestProcessor])
+		cls.DATA = {
+			"string": "text with unicode é and a \\\"quoted\\\" part",
+			"integer": -12,
+			"float": 1.5e-07,
+			"booleans": [True, False, None],
+			"empty": [{}, []],
+			"decimal": Decimal("1.10"),
+			"complex": complex(1, -2),
+			"set": {1, 2, 3},
+			"regex": re.compile(r"^a+\d$"),
+			"timedelta": timedelta(days=1, seconds=2, microseconds=3),
+			"time": time(1, 2, 3),
+			"date": date(2024, 1, 2),
+			"datetime": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+			"path": Path("/tmp/file.junk"),
+			"nested": {"points": [Point(1, 2), Point(3, [Decimal("4")])], "plain": {"a": [1, 2, {"b": "c"}]}},
+			"tab\tkey": "tab\tvalue",
+		}
+
+
+	def test_round_trip(self):
+		for indent in [None, 2, "\t"]:
+			for backend in JunkParser.BACKENDS:
+				with self.subTest(indent=indent, backend=backend):
+					parser = JunkParser([PointTestProcessor], backend=backend)
+					self.assertEqual(parser.loads(self.PARSER.dumps(self.DATA, indent=indent)), self.DATA)
+
+
+	def test_dump_streaming(self):
+		records = [{"id": i, "value": Decimal(i), "name": f"record {i}"} for i in range(5000)]
+
+		fp = io.StringIO()
+		self.PARSER.dump(records, fp, indent=1)
+
+		self.assertEqual(fp.getvalue(), self.PARSER.dumps(records, indent=1))
+		self.assertEqual(self.PARSER.loads(fp.getvalue()), records)
+
+
+	def test_dump_streaming_nested(self):
+		class WritesTestFile(io.StringIO):
+			def write(self, text):
+				self.sizes.append(len(text))
+				return super().write(text)
+
+		deep = [Decimal(1)]
+		for _ in range(300):
+			deep = [deep, {"a": [1, 2]}]
+
+		for data in [{"records": [{"id": i, "tags": ["a", "b"], "nested": {"x": i * 0.5}} for i in range(20000)]}, {"deep": deep}, [deep, [deep]]]:
+			for indent in [None, 2]:
+				with self.subTest(indent=indent):
+					fp = WritesTestFile()
+					fp.sizes = []
+					self.PARSER.dump(data, fp, indent=indent)
+
+					self.assertEqual(fp.getvalue(), self.PARSER.dumps(data, indent=indent))
+					self.assertLess(max(fp.sizes), 2 * 65536)
+
+		self.assertGreater(len(fp.sizes), 1)
+		self.assertEqual(self.PARSER.loads(self.PARSER.dumps({"deep": deep})), {"deep": deep})
+
+
+	def test_plain_json_output(self):
+		data = {"a": [1, 2.5, "x", None, True], "b": {"c": {}}}
+
+		self.assertEqual(self.PARSER.dumps(data), '{"a": [1, 2.5, "x", null, true], "b": {"c": {}}}')
+		self.assertEqual(self.PARSER.dumps({"a": Decimal("1")}), '{"a": (decimal) "1"}')
+		self.assertEqual(self.PARSER.dumps([{"a": [1]}], indent=2), '[\n  {\n    "a": [\n      1\n    ]\n  }\n]')
+
+
+	def test_keys(self):
+		self.assertEqual(self.PARSER.loads(self.PARSER.dumps({1: "a", 2.5: "b", False: "c", None: "d"})), {"1": "a", "2.5": "b", "false": "c", "null": "d"})
+
+		with self.assertRaises(TypeError):
+			self.PARSER.dumps({(1, 2): "a"})
+
+
+	def test_errors(self):
+		for obj in [["a\"b"], ["a\nb"], ["a\\"], [float("nan")], Decimal("1")]:
+			with self.subTest(obj=obj):
+				with self.assertRaises(ValueError):
+					self.PARSER.dumps(obj)
+
+		with self.assertRaises(TypeError):
+			self.PARSER.dumps([object()])
+
+		circular = []
+		circular.append([circular, Decimal(1)])
+		with self.assertRaises(ValueError):
+			self.PARSER.dumps(circular)
+
+
+	def test_default_parser(self):
+		data = {"a": {1, 2}}
+		self.assertEqual(junkpy.loads(junkpy.dumps(data)), data)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser, JunkTypeProcessor
+from junkpy.__main__ import main
+from pathlib import Path
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+
+
+class SafeTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "safe_test"
+	SNAPSHOT_SAFE = True
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		SafeTestProcessor.CALLS += 1
+		return self.CLASS(value)
+
+
+
+class UnsafeTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "unsafe_test"
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		UnsafeTestProcessor.CALLS += 1
+		return f"{value}@{self.metadata.file_path.name}"
+
+
+
+class OtherUnsafeTestProcessor(UnsafeTestProcessor):
+	pass
+
+
+
+class SnapshotTestParser(JunkParser):
+	def after_parsing(self, metadata: JunkMetadata, parsed_data: object):
+		return {
+			"parsing_path": metadata.parsing_path,
+			"data": parsed_data
+		}
+
+
+
+class SnapshotTest(unittest.TestCase):
+	def setUp(self):
+		self.TMP_DIR = tempfile.TemporaryDirectory()
+		self.FILE_PATH = Path(self.TMP_DIR.name) / "config.junk"
+		self.FILE_PATH.write_text('{a: (safe_test) "1", b: [(unsafe_test) "x", (safe_test, label=(unsafe_test) 2) "3"], c: (set) [1, 2], d: (env) "$HOME", e: (regex) "a+"}')
+
+		self.PARSER = JunkParser([SafeTestProcessor, UnsafeTestProcessor])
+		SafeTestProcessor.CALLS = 0
+		UnsafeTestProcessor.CALLS = 0
+
+
+	def tearDown(self):
+		self.TMP_DIR.cleanup()
+
+
+	def test_round_trip(self):
+		expected = self.PARSER.load_file(self.FILE_PATH)
+		SafeTestProcessor.CALLS = 0
+
+		snapshot_path = self.PARSER.compile_file(self.FILE_PATH)
+		self.assertEqual(snapshot_path, Path(self.TMP_DIR.name) / "config.junk.junkc")
+		self.assertEqual((SafeTestProcessor.CALLS, UnsafeTestProcessor.CALLS), (1, 2))
+
+		self.assertEqual(self.PARSER.load_snapshot(self.FILE_PATH), expected)
+		# Only the unsafe type processors run again, along with the safe ones wrapping them
+		self.assertEqual((SafeTestProcessor.CALLS, UnsafeTestProcessor.CALLS), (2, 4))
+
+
+	def test_hooks_and_parsing_path(self):
+		parser = SnapshotTestParser([SafeTestProcessor, UnsafeTestProcessor])
+		expected = parser.load_file(self.FILE_PATH)
+
+		parser.compile_file(self.FILE_PATH)
+		data = parser.load_snapshot(self.FILE_PATH)
+
+		self.assertEqual(data["parsing_path"], "snapshot")
+		self.assertEqual(data["data"], expected["data"])
+
+
+	def test_fallbacks(self):
+		parser = SnapshotTestParser([SafeTestProcessor, UnsafeTestProcessor])
+
+		# Missing snapshot
+		self.assertNotEqual(parser.load_snapshot(self.FILE_PATH)["parsing_path"], "snapshot")
+
+		# Outdated source
+		parser.compile_file(self.FILE_PATH)
+		self.FILE_PATH.write_text('{a: (safe_test) "2"}')
+		os.utime(self.FILE_PATH, ns=(0, 0))
+		self.assertEqual(parser.load_snapshot(self.FILE_PATH)["data"], {"a": 2})
+
+		# Different type processors
+		parser.compile_file(self.FILE_PATH)
+		self.assertEqual(parser.load_snapshot(self.FILE_PATH)["parsing_path"], "snapshot")
+		self.assertNotEqual(SnapshotTestParser([SafeTestProcessor, OtherUnsafeTestProcessor]).load_snapshot(self.FILE_PATH)["parsing_path"], "snapshot")
+
+		# Snapshot of another file with the same size and modification time
+		other_file_path = Path(self.TMP_DIR.name) / "other.junk"
+		other_file_path.write_text('{a: (safe_test) "3"}')
+		file_stat = os.stat(self.FILE_PATH)
+		os.utime(other_file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+		data = parser.load_snapshot(other_file_path, snapshot_path=Path(self.TMP_DIR.name) / "config.junk.junkc")
+		self.assertNotEqual(data["parsing_path"], "snapshot")
+		self.assertEqual(data["data"], {"a": 3})
+
+		# Corrupted snapshot
+		(Path(self.TMP_DIR.name) / "config.junk.junkc").write_bytes(b"JUNKSNAP\x01\x00garbage")
+		self.assertNotEqual(parser.load_snapshot(self.FILE_PATH)["parsing_path"], "snapshot")
+
+
+	def test_update(self):
+		parser = SnapshotTestParser([SafeTestProcessor, UnsafeTestProcessor])
+		snapshot_path = Path(self.TMP_DIR.name) / "custom.snapshot"
+
+		self.assertEqual(parser.load_snapshot(self.FILE_PATH, snapshot_path=snapshot_path, update=True)["parsing_path"], "snapshot")
+		self.assertTrue(snapshot_path.exists())
+		self.assertEqual(parser.load_snapshot(self.FILE_PATH, snapshot_path=snapshot_path)["parsing_path"], "snapshot")
+
+
+	@unittest.skipUnless(os.name == "posix", "File modes are not supported")
+	def test_file_mode(self):
+		def umask(mask):
+			raise AssertionError("The process umask is shared by all threads")
+
+		set_umask = os.umask
+		previous_umask = set_umask(0o022)
+		os.umask = umask
+
+		try:
+			snapshot_path = self.PARSER.compile_file(self.FILE_PATH)
+
+		finally:
+			os.umask = set_umask
+			set_umask(previous_umask)
+
+		# Same mode as the files written with open()
+		self.assertEqual(snapshot_path.stat().st_mode & 0o777, 0o644)
+
+
+	def test_command_line(self):
+		self.FILE_PATH.write_text('{a: [1, (int) "2"], b: (decimal) "1.5"}')
+
+		with contextlib.redirect_stdout(io.StringIO()):
+			self.assertEqual(main(["compile", str(self.FILE_PATH)]), 0)
+
+		self.assertTrue((Path(self.TMP_DIR.name) / "config.junk.junkc").exists())
+		self.assertEqual(JunkParser().load_snapshot(self.FILE_PATH), JunkParser().load_file(self.FILE_PATH))
+
+
+
+if __name__ == "__main__":
+	unittest.main()
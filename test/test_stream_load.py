@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor
+from junkpy.stream import JunkStreamSplitter
+from lark.exceptions import UnexpectedInput
+from pathlib import Path
+from pydantic import BaseModel
+import io
+import unittest
+
+
+
+class StreamLoadTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.FILE_PATH_LIST = Path(__file__).parent / "test_files/test_file_threads1.junk"
+		cls.FILE_PATH_DICT = Path(__file__).parent / "test_files/test_file_builtin_forced_types.junk"
+		cls.CHUNK_SIZES = [1, 3, 7, 65536]
+		cls.VALID_DATA = [
+			'[]',
+			'{}',
+			'  # Comment\n[1, 2, 3]\n# Comment',
+			'[1, "a, b", "c # d", "e]f", "g\\"h", [1, [2, {a: 3}]], {b: [4, 5]}, (string, a=[1, 2], b=3) 6, (string), ]',
+			'[\n\t{id: 1, tags: ["x", "y"]},  # First\n\t{id: 2, tags: []},  # Second,]\n]',
+			'{a: 1, "b": [1, 2,], c: , d: (string), e: {f: (int) "2"},}',
+			'[1,\n2\n,\n3]   ',
+		]
+		cls.INVALID_DATA = [
+			'[1 2]', '[1,,2]', '[,]', '{a: 1 b: 2}', '[1, 2', '[1, 2,\n', '[\n  1,\n  {a: }x,\n]', '[1] x',
+			'[1]\n\n # Comment\n  [2]', '{a}', '[1, 2}', '{"a": 1, 2: 3}', '["abc\n"]',
+		]
+
+		class TestModel(BaseModel):
+			id: int
+			tags: list
+
+		cls.TEST_MODEL = TestModel
+
+
+	def iter_loads(self, parser, string, chunk_size):
+		return list(parser.iter_load(io.StringIO(string), chunk_size=chunk_size))
+
+
+	def test_valid_data(self):
+		parser = JunkParser()
+
+		for data in self.VALID_DATA:
+			expected = parser.loads(data)
+			expected = list(expected.items()) if(isinstance(expected, dict)) else expected
+
+			for chunk_size in self.CHUNK_SIZES:
+				with self.subTest(data=data, chunk_size=chunk_size):
+					self.assertEqual(self.iter_loads(parser, data, chunk_size), expected)
+
+
+	def test_error_positions(self):
+		parser = JunkParser()
+
+		for data in self.INVALID_DATA:
+			with self.assertRaises(UnexpectedInput) as expected_error:
+				parser.loads(data)
+
+			for chunk_size in self.CHUNK_SIZES:
+				with self.subTest(data=data, chunk_size=chunk_size):
+					with self.assertRaises(UnexpectedInput) as error:
+						self.iter_loads(parser, data, chunk_size)
+
+					self.assertEqual(
+						(error.exception.line, error.exception.column, error.exception.pos_in_stream),
+						(expected_error.exception.line, expected_error.exception.column, expected_error.exception.pos_in_stream)
+					)
+
+
+	def test_top_level_value(self):
+		with self.assertRaises(ValueError):
+			self.iter_loads(JunkParser(), '"string"', 4)
+
+
+	def test_files(self):
+		parser = JunkParser()
+		self.assertEqual(list(parser.iter_load_file(self.FILE_PATH_DICT)), list(parser.load_file(self.FILE_PATH_DICT).items()))
+
+
+	def test_type_processors_metadata(self):
+		file_path = self.FILE_PATH_LIST
+
+		class MetadataChecker(JunkTypeProcessor):
+			CLASS = int
+			KEYWORD = "thread_checker1"
+			
+			def load(self, value, **kwargs):
+				if(self.metadata.file_path != file_path):
+					raise Exception("Wrong file.")
+
+				return self.CLASS(value)
+
+		parser = JunkParser([MetadataChecker])
+		self.assertEqual(list(parser.iter_load_file(file_path)), parser.load_file(file_path))
+
+
+	def test_validate_to(self):
+		data = self.iter_loads(JunkParser(), self.VALID_DATA[4], 5)
+		validated_data = list(JunkParser().iter_load(io.StringIO(self.VALID_DATA[4]), validate_to=self.TEST_MODEL))
+
+		self.assertEqual(len(validated_data), len(data))
+		for element, validated_element in zip(data, validated_data):
+			self.assertIsInstance(validated_element, self.TEST_MODEL)
+			self.assertEqual(validated_element.model_dump(), element)
+
+
+	def test_incremental_reading(self):
+		class TrackedStringIO(io.StringIO):
+			def read(self, size=-1):
+				data = super().read(size)
+				self.max_read = max(getattr(self, "max_read", 0), len(data))
+				return data
+
+		elements = 1000
+		fp = TrackedStringIO("[" + ",".join(f'{{id: {i}, name: "element {i}"}}' for i in range(elements)) + "]")
+		iterator = JunkParser().iter_load(fp, chunk_size=64)
+
+		self.assertEqual(next(iterator), {"id": 0, "name": "element 0"})
+		self.assertLess(fp.tell(), 128)
+		self.assertEqual(len(list(iterator)), elements - 1)
+		self.assertLessEqual(fp.max_read, 64)
+
+
+	def test_long_elements(self):
+		class CountingSplitter(JunkStreamSplitter):
+			buffer_reads = 0
+
+			def _read(self):
+				self.buffer_reads += 1
+				return super()._read()
+
+		size = 1 << 20
+		elements = ['"' + 'a\\"b\\\\' * (size // 8) + '"', " # " + "c" * size + "\n[" + ",".join(["1"] * (size // 2)) + "]", " 2"]
+		string = "[" + ",".join(elements) + "]"
+
+		for chunk_size in (3, 4096):
+			with self.subTest(chunk_size=chunk_size):
+				splitter = CountingSplitter(io.StringIO(string), chunk_size)
+				self.assertEqual([item.text for item in splitter], ["[" + element + "]" for element in elements])
+
+				# Elements spanning many chunks are read with a few growing buffers, and strings and comments are not scanned again after each read
+				self.assertLess(splitter.buffer_reads, 64)
+
+
+
+if __name__ == '__main__':
+	unittest.main()
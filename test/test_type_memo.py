@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor
+from junkpy.extensions import JunkDistanceTypeProcessor
+import unittest
+
+
+
+class PureTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "pure_test"
+	PURE = True
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		PureTestProcessor.CALLS += 1
+		return f"{type(value).__name__}:{value}:{kwargs.get('suffix', '')}"
+
+
+
+class ImpureTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "impure_test"
+	CALLS = 0
+
+	def load(self, value, **kwargs):
+		ImpureTestProcessor.CALLS += 1
+		return ImpureTestProcessor.CALLS
+
+
+
+class TypeMemoTest(unittest.TestCase):
+	def setUp(self):
+		PureTestProcessor.CALLS = 0
+		ImpureTestProcessor.CALLS = 0
+
+
+	def test_memoized_across_occurrences_and_parses(self):
+		parser = JunkParser([PureTestProcessor], type_memo_size=16)
+		string = '[(pure_test) "a", (pure_test) "a", (pure_test, suffix="x") "a", (pure_test) "b"]'
+
+		expected = ["str:a:", "str:a:", "str:a:x", "str:b:"]
+		self.assertEqual(parser.loads(string), expected)
+		self.assertEqual(parser.loads(string), expected)
+
+		self.assertEqual(PureTestProcessor.CALLS, 3)
+		self.assertEqual((parser.type_memo.hits, parser.type_memo.misses), (5, 3))
+		self.assertEqual(len(parser.type_memo), 3)
+
+
+	def test_value_types_in_key(self):
+		parser = JunkParser([PureTestProcessor], type_memo_size=16)
+
+		self.assertEqual(parser.loads("[(pure_test) 1, (pure_test) 1.0, (pure_test) true]"), ["int:1:", "float:1.0:", "bool:True:"])
+		self.assertEqual(parser.loads("[(pure_test) 0.0, (pure_test) -0.0, (pure_test, suffix=0.0) 1, (pure_test, suffix=-0.0) 1]"), ["float:0.0:", "float:-0.0:", "int:1:0.0", "int:1:-0.0"])
+
+		data = JunkParser(type_memo_size=100).loads("[(string) 0.0, (string) -0.0, (decimal) 0.0, (decimal) -0.0]")
+		self.assertEqual([str(value) for value in data], ["0.0", "-0.0", "0", "-0"])
+
+
+	def test_unhashable_values(self):
+		parser = JunkParser([PureTestProcessor], type_memo_size=16)
+
+		self.assertEqual(parser.loads("[(pure_test) [1], (pure_test) [1], (pure_test, suffix=[2]) 1]"), ["list:[1]:", "list:[1]:", "int:1:[2]"])
+		self.assertEqual(PureTestProcessor.CALLS, 3)
+		self.assertEqual(len(parser.type_memo), 0)
+
+
+	def test_impure_processors(self):
+		parser = JunkParser([ImpureTestProcessor], type_memo_size=16)
+		self.assertEqual(parser.loads("[(impure_test) 1, (impure_test) 1]"), [1, 2])
+
+		parser = JunkParser([ImpureTestProcessor], type_memo_size=16, type_memo_keywords=["impure_test"])
+		self.assertEqual(parser.loads("[(impure_test) 1, (impure_test) 1]"), [3, 3])
+
+		self.assertNotIn("env", JunkParser(type_memo_size=16)._memoized_type_processors_keywords)
+		self.assertNotIn("path", JunkParser(type_memo_size=16)._memoized_type_processors_keywords)
+
+
+	def test_bounded(self):
+		parser = JunkParser([PureTestProcessor], type_memo_size=2)
+
+		parser.loads('[(pure_test) "a", (pure_test) "b", (pure_test) "c", (pure_test) "a"]')
+
+		self.assertEqual(len(parser.type_memo), 2)
+		self.assertEqual(PureTestProcessor.CALLS, 4)
+
+
+	def test_builtins_and_extensions(self):
+		string = '[(regex) "a+", (regex) "a+", (distance, input="ft") 10, (distance, input="ft") 10, (datetime) "2024-01-01", (set) [1], (set) [1]]'
+		expected = JunkParser([JunkDistanceTypeProcessor]).loads(string)
+
+		parser = JunkParser([JunkDistanceTypeProcessor], type_memo_size=16)
+		data = parser.loads(string)
+
+		self.assertEqual(data, expected)
+		self.assertIs(data[0], data[1])
+		self.assertIsNot(data[5], data[6])
+		self.assertEqual(parser.type_memo.hits, 2)
+
+
+	def test_disabled(self):
+		parser = JunkParser([PureTestProcessor])
+
+		self.assertIsNone(parser.type_memo)
+		self.assertEqual(parser.loads('[(pure_test) "a", (pure_test) "a"]'), ["str:a:", "str:a:"])
+		self.assertEqual(PureTestProcessor.CALLS, 2)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor, JunkTypeProcessorRegistry
+from junkpy.type_processors import JunkBaseTypeProcessorMeta
+import pickle
+import time
+import unittest
+
+
+
+class RegistryTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "registry_test"
+	PURE = True
+
+	def load(self, value, **kwargs):
+		return f"<{value}>"
+
+
+
+class RegistryReplacingTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "int"
+
+	def load(self, value, **kwargs):
+		return int(value) + 1
+
+
+
+class RegistryNestedTestProcessor(JunkTypeProcessor):
+	CLASS = object
+	KEYWORD = "nested"
+
+	def load(self, value, **kwargs):
+		# Parses nested strings with an additional type
+		return self.parser.overlay([RegistryTestProcessor]).loads(value)
+
+
+
+class TypeProcessorRegistryTest(unittest.TestCase):
+	def test_base_registry_unchanged(self):
+		base_classes = JunkBaseTypeProcessorMeta.BASE_TYPE_PROCESSOR_CLASSES
+		base_count = len(JunkParser().registry)
+
+		parser = JunkParser([RegistryTestProcessor])
+		self.assertEqual(parser.loads('[(registry_test) "a"]'), ["<a>"])
+
+		self.assertIs(JunkBaseTypeProcessorMeta.BASE_TYPE_PROCESSOR_CLASSES, base_classes)
+		self.assertEqual(len(JunkParser().registry), base_count)
+
+		with self.assertRaises(ValueError):
+			JunkParser().loads('[(registry_test) "a"]')
+
+
+	def test_overlays(self):
+		parser = JunkParser([RegistryTestProcessor, RegistryReplacingTestProcessor])
+
+		self.assertEqual(parser.loads('[(int) "1", (registry_test) 2]'), [2, "<2>"])
+		self.assertEqual(JunkParser().loads('[(int) "1"]'), [1])
+
+		# Registries are shared by the parsers created with the same type processors
+		self.assertIs(parser.registry, JunkParser([RegistryTestProcessor, RegistryReplacingTestProcessor]).registry)
+		self.assertIs(JunkParser(parser.registry).registry, parser.registry)
+		self.assertIn("registry_test", parser.registry.pure_keywords)
+		self.assertNotIn("int", parser.registry.pure_keywords)
+
+		registry = JunkTypeProcessorRegistry([RegistryTestProcessor])
+		self.assertEqual(list(registry.classes), ["registry_test"])
+		self.assertEqual(JunkParser(registry).loads('[(registry_test) 1]'), ["<1>"])
+
+		with self.assertRaises(ValueError):
+			JunkParser(registry).loads('[(int) "1"]')
+
+		with self.assertRaises(TypeError):
+			JunkParser([int])
+
+
+	def test_parser_overlay(self):
+		parser = JunkParser([RegistryNestedTestProcessor], backend="scanner", type_memo_size=16)
+
+		self.assertEqual(parser.loads('{a: (nested) "[(registry_test) 1]"}'), {"a": ["<1>"]})
+		self.assertNotIn("registry_test", parser.registry)
+
+		overlay = parser.overlay([RegistryTestProcessor])
+		self.assertIs(type(overlay), JunkParser)
+		self.assertEqual(overlay._backend, "scanner")
+		self.assertEqual(overlay.loads('[(registry_test) 1, (nested) "2"]'), ["<1>", 2])
+		self.assertIs(parser.overlay([RegistryTestProcessor]).registry, overlay.registry)
+
+
+	def test_pickling(self):
+		parser = JunkParser([RegistryTestProcessor])
+		unpickled_parser = pickle.loads(pickle.dumps(parser))
+
+		self.assertEqual(unpickled_parser.loads('[(registry_test) 1]'), ["<1>"])
+		self.assertEqual(unpickled_parser.registry.fingerprint, parser.registry.fingerprint)
+
+
+	def test_flat_construction_cost(self):
+		def construct(count: int) -> float:
+			start = time.perf_counter()
+			for _ in range(count):
+				parser = JunkParser([RegistryTestProcessor])
+
+			self.assertEqual(len(parser._type_processors_keyword_dict), processors_count)
+			return time.perf_counter() - start
+
+		base_classes = JunkBaseTypeProcessorMeta.BASE_TYPE_PROCESSOR_CLASSES
+		processors_count = len(JunkParser([RegistryTestProcessor])._type_processors_keyword_dict)
+		first_duration = min(construct(200) for _ in range(3))
+
+		for _ in range(10):
+			construct(200)
+
+		self.assertIs(JunkBaseTypeProcessorMeta.BASE_TYPE_PROCESSOR_CLASSES, base_classes)
+		self.assertLess(min(construct(200) for _ in range(3)), first_duration * 3)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+from junkpy import JunkParser, JunkTypeProcessor
+from junkpy.type_processors import JunkDateTypeProcessor, JunkHexTypeProcessor, JunkTimestampTypeProcessor
+from benchmarks.generator import TYPED_VALUE_SAMPLES
+import asyncio
+import unittest
+
+
+
+class ScaledTestProcessor(JunkTypeProcessor):
+	CLASS = float
+	KEYWORD = "scaled"
+
+	def load(self, value, factor=1, **kwargs):
+		return float(value) * factor
+
+
+
+class BatchTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "batch"
+	BATCHES = 0
+
+	def load(self, value, **kwargs):
+		return str(value)
+
+	def load_many(self, values, **kwargs):
+		BatchTestProcessor.BATCHES += 1
+		return list(map(str, values))
+
+
+
+class ColorTestProcessor(JunkHexTypeProcessor):
+	KEYWORD = "color"
+
+	def load(self, value, **kwargs):
+		return super().load(str(value).lstrip("#"), **kwargs)
+
+
+
+class OffsetTimestampTestProcessor(JunkTimestampTypeProcessor):
+	KEYWORD = "offset_timestamp"
+
+	def load(self, value, **kwargs):
+		return super().load(float(value) + 3600, **kwargs)
+
+
+
+class DottedDateTestProcessor(JunkDateTypeProcessor):
+	KEYWORD = "dotted_date"
+
+	def load(self, value, **kwargs):
+		return super().load(value.replace(".", "-"), **kwargs)
+
+
+
+class AsyncTestProcessor(JunkTypeProcessor):
+	CLASS = str
+	KEYWORD = "async_test"
+
+	async def aload(self, value, **kwargs):
+		await asyncio.sleep(0)
+		return f"<{value}>"
+
+
+
+class WrongOutputTestProcessor(JunkTypeProcessor):
+	CLASS = int
+	KEYWORD = "wrong_output"
+
+	def load(self, value, **kwargs):
+		return str(value)
+
+
+
+class TypedArraysTest(unittest.TestCase):
+	def test_same_results(self):
+		keywords = ("int", "float", "decimal", "hex", "bin", "octal", "date", "time", "datetime", "timestamp", "bool", "complex", "string", "set", "timedelta")
+
+		for backend in JunkParser.BACKENDS:
+			parser = JunkParser([ScaledTestProcessor], backend=backend)
+
+			for keyword in keywords:
+				with self.subTest(backend=backend, keyword=keyword):
+					sample = TYPED_VALUE_SAMPLES[keyword]
+					expected = parser.loads(f"[({keyword}) {sample}, ({keyword}) {sample}]")
+					self.assertEqual(parser.loads(f'[(each, type="{keyword}") [{sample}, {sample}]]'), [expected])
+
+			# Lists and dicts among the values of date/time processors
+			self.assertEqual(
+				parser.loads('[(each, type="date") ["2024-01-01", [2024, 1, 2], {year: 2024, month: 1, day: 3}]]'),
+				parser.loads('[[(date) "2024-01-01", (date) [2024, 1, 2], (date) {year: 2024, month: 1, day: 3}]]')
+			)
+			self.assertEqual(parser.loads('{a: (each, type="scaled", factor=2) [1, "2.5"], b: (each, type="int") []}'), {"a": [2.0, 5.0], "b": []})
+
+
+	def test_load_many(self):
+		BatchTestProcessor.BATCHES = 0
+		parser = JunkParser([BatchTestProcessor])
+
+		self.assertEqual(parser.loads('[(each, type="batch") [1, 2, 3], (batch) 4]'), [["1", "2", "3"], "4"])
+		self.assertEqual(BatchTestProcessor.BATCHES, 1)
+
+		self.assertEqual(asyncio.run(JunkParser([AsyncTestProcessor]).aloads('[(each, type="async_test") [1, 2], (each, type="int") ["3"]]')), [["<1>", "<2>"], [3]])
+
+
+	def test_overridden_load(self):
+		# Subclasses changing load get the same results from lists as from single values, instead of the fast paths of their parents
+		parser = JunkParser([ColorTestProcessor, OffsetTimestampTestProcessor, DottedDateTestProcessor])
+
+		for keyword, sample in (("color", '"#ff"'), ("offset_timestamp", "1700000000"), ("dotted_date", '"2024.01.02"')):
+			with self.subTest(keyword=keyword):
+				expected = parser.loads(f"[({keyword}) {sample}]")
+				self.assertEqual(parser.loads(f'[(each, type="{keyword}") [{sample}]]'), [expected])
+
+
+	def test_errors(self):
+		parser = JunkParser()
+
+		for string in ('[(each, type="unknown") [1]]', '[(each) [1]]', '[(each, type="int") "1"]', '[(each, type="date") ["2024-01-01", 1]]'):
+			with self.subTest(string=string):
+				with self.assertRaises(ValueError):
+					parser.loads(string)
+
+		with self.assertRaises(TypeError):
+			JunkParser([WrongOutputTestProcessor]).loads('[(each, type="wrong_output") [1]]')
+
+		self.assertEqual(JunkParser([WrongOutputTestProcessor], check_output_types=False).loads('[(each, type="wrong_output") [1]]'), [["1"]])
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser
+from junkpy.validation import get_type_adapter, validates_json
+from datetime import datetime
+from lark.exceptions import UnexpectedInput
+from pathlib import Path
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from typing import Dict, List, Literal, Optional, Union
+import tempfile
+import unittest
+
+
+
+class ValidationTestServer(BaseModel):
+	host: str
+	port: int = 80
+	weight: float = 1.0
+	tags: List[str] = []
+
+
+
+class ValidationTestConfig(BaseModel):
+	name: str = Field(alias="title")
+	created: Optional[datetime] = None
+	servers: List[ValidationTestServer]
+	limits: Dict[str, Union[int, str]] = {}
+	mode: Literal["fast", "safe"] = "safe"
+	parent: Optional["ValidationTestConfig"] = None
+
+
+
+class ValidationTestPositiveModel(BaseModel):
+	value: int
+
+	@field_validator("value")
+	@classmethod
+	def check_positive(cls, value):
+		if value <= 0:
+			raise ValueError("value must be positive")
+
+		return value
+
+
+
+class ValidationTestStrictModel(BaseModel):
+	model_config = ConfigDict(strict=True)
+
+	created: datetime
+
+
+
+class ValidationTestStrictFieldModel(BaseModel):
+	created: datetime = Field(strict=True)
+
+
+
+class AfterParsingTestParser(JunkParser):
+	def after_parsing(self, metadata: JunkMetadata, parsed_data):
+		parsed_data["port"] = 8080
+		return parsed_data
+
+
+
+CONFIG = """{
+	title: "main",  # Junk-only syntax
+	created: (datetime) "2024-01-01T12:00:00",
+	servers: [{host: "a", port: 81, weight: 2, tags: ["x"]}, {host: "b"}],
+	limits: {cpu: 2, memory: "1G"},
+	mode: "fast",
+	parent: {title: "base", servers: []}
+}"""
+
+
+
+class ValidationTest(unittest.TestCase):
+	def test_type_adapter_cache(self):
+		self.assertIs(get_type_adapter(ValidationTestConfig), get_type_adapter(ValidationTestConfig))
+		self.assertIs(get_type_adapter(List[ValidationTestServer]), get_type_adapter(List[ValidationTestServer]))
+
+
+	def test_json_validation(self):
+		parser = JunkParser()
+		string = '{"host": "a", "port": "81", "tags": ["x", "y"]}'
+
+		with parser.profile() as report:
+			server = parser.loads(string, validate_to=ValidationTestServer)
+
+		self.assertEqual(server, ValidationTestServer(host="a", port=81, tags=["x", "y"]))
+		self.assertEqual(report.parsing_paths, {"json": 1})
+
+		# Only strings that are not JSON are parsed
+		with parser.profile() as report:
+			self.assertEqual(parser.loads('{host: "a", port: 81}', validate_to=ValidationTestServer), ValidationTestServer(host="a", port=81))
+
+		self.assertEqual(report.parsing_paths, {"lark": 1})
+
+		with self.assertRaises(ValidationError):
+			parser.loads('{"host": "a", "port": "x"}', validate_to=ValidationTestServer)
+
+		with self.assertRaises(UnexpectedInput):
+			parser.loads('{"host": "a", "weight": NaN}', validate_to=ValidationTestServer)
+
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			file_path = Path(tmp_dir) / "server.json"
+			file_path.write_text(string)
+
+			self.assertEqual(parser.load_file(file_path, validate_to=ValidationTestServer), server)
+			self.assertEqual(parser.load(open(file_path, "rt"), validate_to=ValidationTestServer), server)
+
+
+	def test_json_validation_strict(self):
+		self.assertTrue(validates_json(ValidationTestServer))
+		self.assertFalse(validates_json(ValidationTestStrictModel))
+		self.assertFalse(validates_json(List[ValidationTestStrictFieldModel]))
+
+		# Strict models reject strings as datetimes whichever way the data is parsed
+		for validate_to, string in ((ValidationTestStrictModel, '{"created": "2020-01-01T00:00:00"}'), (List[ValidationTestStrictFieldModel], '[{"created": "2020-01-01T00:00:00"}]')):
+			for parser in (JunkParser(), JunkParser(json_fast_path=False)):
+				for data in (string, string + " # Comment"):
+					with self.subTest(validate_to=validate_to, data=data):
+						with self.assertRaises(ValidationError):
+							parser.loads(data, validate_to=validate_to)
+
+		parser = JunkParser()
+		with parser.profile() as report:
+			model = parser.loads('{"created": (datetime) "2020-01-01T00:00:00"}', validate_to=ValidationTestStrictModel)
+			parser.loads('{"created": 1}', validate_to=Dict[str, int])
+
+		self.assertEqual(model.created, datetime(2020, 1, 1))
+		self.assertEqual(report.parsing_paths, {"lark": 1, "json": 1})
+
+
+	def test_json_validation_after_parsing(self):
+		# Data changed by after_parsing is validated as usual
+		server = AfterParsingTestParser().loads('{"host": "a", "port": 81}', validate_to=ValidationTestServer)
+		self.assertEqual(server.port, 8080)
+
+
+	def test_trusted_validation(self):
+		for backend in JunkParser.BACKENDS:
+			with self.subTest(backend=backend):
+				trusted_parser = JunkParser(backend=backend, trusted_validation=True)
+				parser = JunkParser(backend=backend)
+
+				config = trusted_parser.loads(CONFIG, validate_to=ValidationTestConfig)
+				self.assertEqual(config, parser.loads(CONFIG, validate_to=ValidationTestConfig))
+
+				self.assertEqual(config.servers[0].weight, 2.0)
+				self.assertIsInstance(config.servers[0].weight, float)
+				self.assertIsInstance(config.parent, ValidationTestConfig)
+				self.assertEqual(config.servers[1].model_fields_set, {"host"})
+
+
+	def test_trusted_validation_mismatch(self):
+		parser = JunkParser(trusted_validation=True)
+
+		# Values of other types are validated, so they are converted or rejected as usual
+		self.assertEqual(parser.loads('{host: "a", port: "81"}', validate_to=ValidationTestServer).port, 81)
+
+		with self.assertRaises(ValidationError):
+			parser.loads('{host: 1}', validate_to=ValidationTestServer)
+
+		with self.assertRaises(ValidationError):
+			parser.loads('{port: 1}', validate_to=ValidationTestServer)
+
+		with self.assertRaises(ValidationError):
+			parser.loads('{title: "main", servers: [], mode: "other"}', validate_to=ValidationTestConfig)
+
+
+	def test_trusted_validation_skips_validators(self):
+		string = "{value: -1}"
+
+		with self.assertRaises(ValidationError):
+			JunkParser().loads(string, validate_to=ValidationTestPositiveModel)
+
+		self.assertEqual(JunkParser(trusted_validation=True).loads(string, validate_to=ValidationTestPositiveModel).value, -1)
+
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+from junkpy import JunkMetadata, JunkParser
+from pathlib import Path
+from pydantic import BaseModel
+import asyncio
+import contextlib
+import os
+import queue
+import tempfile
+import time
+import unittest
+
+
+
+class CountingTestParser(JunkParser):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.loads_count = 0
+
+
+	def before_parsing(self, metadata: JunkMetadata):
+		self.loads_count += 1
+
+
+
+class WatchTestModel(BaseModel):
+	value: int
+
+
+
+class WatchTest(unittest.TestCase):
+	TIMEOUT = 5
+
+
+	def setUp(self):
+		self.TMP_DIR = tempfile.TemporaryDirectory()
+		self.ROOT = Path(self.TMP_DIR.name)
+		self.FILE_PATH = self.ROOT / "config.junk"
+		self.WRITES = 0
+		self.write(self.FILE_PATH, '{value: (int) "1"}')
+
+
+	def tearDown(self):
+		self.TMP_DIR.cleanup()
+
+
+	def write(self, file_path: Path, data: str):
+		file_path.write_text(data)
+		# Changes must be visible to stat even within the same clock tick
+		self.WRITES += 1
+		os.utime(file_path, ns=(0, self.WRITES))
+
+
+	def watch(self, parser: JunkParser, **kwargs):
+		updates = queue.Queue()
+		watcher = parser.watch(self.FILE_PATH, updates.put, interval=0.02, debounce=0.02, error_callback=updates.put, **kwargs)
+		self.addCleanup(watcher.stop)
+		return watcher, updates
+
+
+	def test_reload(self):
+		for use_inotify in (True, False):
+			with self.subTest(use_inotify=use_inotify):
+				self.write(self.FILE_PATH, '{value: (int) "1"}')
+				parser = CountingTestParser()
+				watcher, updates = self.watch(parser, use_inotify=use_inotify)
+
+				self.assertEqual(watcher.data, {"value": 1})
+				self.assertTrue(watcher.running)
+
+				self.write(self.FILE_PATH, '{value: (int) "2"}')
+				self.assertEqual(updates.get(timeout=self.TIMEOUT), {"value": 2})
+				self.assertEqual(watcher.data, {"value": 2})
+
+				watcher.stop()
+				self.assertFalse(watcher.running)
+				self.assertEqual(parser.loads_count, 2)
+
+
+	def test_unchanged_contents(self):
+		parser = CountingTestParser()
+		watcher, updates = self.watch(parser)
+
+		# Touching the file does not parse it again
+		self.write(self.FILE_PATH, '{value: (int) "1"}')
+		time.sleep(0.3)
+		self.assertTrue(updates.empty())
+		self.assertEqual(parser.loads_count, 1)
+
+		self.write(self.FILE_PATH, '{value: (int) "3"}')
+		self.assertEqual(updates.get(timeout=self.TIMEOUT), {"value": 3})
+		self.assertEqual(parser.loads_count, 2)
+
+
+	def test_dependencies(self):
+		self.write(self.ROOT / "included.junk", "[1, 2]")
+		self.write(self.FILE_PATH, '{value: 1, included: (include) "included.junk"}')
+
+		watcher, updates = self.watch(JunkParser())
+		self.assertEqual(watcher.files, {self.FILE_PATH, (self.ROOT / "included.junk").resolve()})
+
+		self.write(self.ROOT / "included.junk", "[3]")
+		self.assertEqual(updates.get(timeout=self.TIMEOUT), {"value": 1, "included": [3]})
+
+
+	def test_validation_and_errors(self):
+		watcher, updates = self.watch(JunkParser(), validate_to=WatchTestModel)
+		self.assertEqual(watcher.data, WatchTestModel(value=1))
+
+		self.write(self.FILE_PATH, '{value: "invalid"}')
+		self.assertIsInstance(updates.get(timeout=self.TIMEOUT), ValueError)
+		self.assertEqual(watcher.data, WatchTestModel(value=1))
+		self.assertIsInstance(watcher.error, ValueError)
+
+		self.write(self.FILE_PATH, '{value: 4}')
+		self.assertEqual(updates.get(timeout=self.TIMEOUT), WatchTestModel(value=4))
+		self.assertIsNone(watcher.error)
+
+		# Errors of the initial load are raised
+		self.write(self.FILE_PATH, '{value: ')
+		with self.assertRaises(Exception):
+			JunkParser().watch(self.FILE_PATH, print)
+
+
+	def test_callback_errors(self):
+		for with_error_callback in (True, False):
+			with self.subTest(with_error_callback=with_error_callback):
+				self.write(self.FILE_PATH, '{value: (int) "1"}')
+				updates = queue.Queue()
+				errors = queue.Queue()
+
+				def callback(data):
+					updates.put(data)
+					raise RuntimeError("callback")
+
+				watcher = JunkParser().watch(self.FILE_PATH, callback, interval=0.02, debounce=0.02, error_callback=errors.put if(with_error_callback) else None)
+				self.addCleanup(watcher.stop)
+
+				with self.assertLogs("junkpy.watch", "ERROR") if(not with_error_callback) else contextlib.nullcontext():
+					self.write(self.FILE_PATH, '{value: (int) "2"}')
+					self.assertEqual(updates.get(timeout=self.TIMEOUT), {"value": 2})
+
+					if with_error_callback:
+						self.assertIsInstance(errors.get(timeout=self.TIMEOUT), RuntimeError)
+
+					else:
+						time.sleep(0.1)
+
+				# The watcher keeps reloading after a failed callback
+				self.write(self.FILE_PATH, '{value: (int) "3"}')
+				self.assertEqual(updates.get(timeout=self.TIMEOUT), {"value": 3})
+				self.assertEqual(watcher.data, {"value": 3})
+				self.assertTrue(watcher.running)
+				watcher.stop()
+
+
+	def test_incremental(self):
+		self.write(self.FILE_PATH, '{value: 1, other: [(int) "2"]}')
+		watcher, updates = self.watch(JunkParser(), incremental=True)
+		self.assertEqual(watcher.changed, [()])
+
+		self.write(self.FILE_PATH, '{value: 5, other: [(int) "2"]}')
+		data = updates.get(timeout=self.TIMEOUT)
+		self.assertEqual(data, {"value": 5, "other": [2]})
+		self.assertEqual(watcher.changed, [("value",)])
+
+
+	def test_loop(self):
+		async def main():
+			updates = asyncio.Queue()
+
+			async def callback(data):
+				await updates.put(data)
+
+			with JunkParser().watch(self.FILE_PATH, callback, interval=0.02, debounce=0.02, loop=asyncio.get_running_loop()):
+				self.write(self.FILE_PATH, '{value: (int) "5"}')
+				return await asyncio.wait_for(updates.get(), self.TIMEOUT)
+
+		self.assertEqual(asyncio.run(main()), {"value": 5})
+
+
+
+if __name__ == "__main__":
+	unittest.main()